@@ -0,0 +1,58 @@
+"""Time JSON extraction from model replies with unbalanced braces.
+
+Usage: python benchmarks/json_extraction.py [--sizes 250 500 1000 2000]
+
+Compares the recursive ``regex`` pattern the parser used to rely on with the
+linear brace scanner of ``extract_json_with_regex``.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import time
+
+import regex
+
+from pptlayout.llm.parser import extract_json_with_regex
+
+RECURSIVE_PATTERN = regex.compile(r"\{(?:[^{}]|(?R))*\}")
+
+LAYOUT = json.dumps({"slide_id": 1, "shapes": [{"shape_id": 2, "left": 10}]})
+
+
+def _recursive_regex(text: str) -> dict | None:
+    match = RECURSIVE_PATTERN.search(text)
+    return json.loads(match.group()) if match else None
+
+
+def _pathological_reply(size: int) -> str:
+    # Chatty prose full of unmatched braces, then the actual layout
+    return "Consider {the title " * size + LAYOUT
+
+
+def _time(extract, text: str) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        extract(text)
+    return time.perf_counter() - start
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    args = parser.parse_args(argv)
+
+    print(f"{'chars':>8} {'recursive (s)':>14} {'scanner (s)':>12} {'speedup':>8}")
+    for size in args.sizes:
+        text = _pathological_reply(size)
+        recursive = _time(_recursive_regex, text)
+        scanner = _time(extract_json_with_regex, text)
+        print(
+            f"{len(text):>8} {recursive:>14.4f} {scanner:>12.4f} "
+            f"{recursive / max(scanner, 1e-9):>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Measure how many LLM calls layout clustering saves on a templated corpus.
+
+Usage: python benchmarks/layout_clustering.py [--slides 100000] [--templates 200]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from pptlayout.clustering import cluster_layouts
+
+SLIDE_WIDTH, SLIDE_HEIGHT = 720, 540
+
+
+def _templated_slides(
+    count: int, templates: int, jitter: float, seed: int = 0
+) -> list[dict]:
+    """Slides drawn from a few templates, with text and small offsets varying."""
+    rng = np.random.default_rng(seed)
+    layouts = []
+    for _ in range(templates):
+        n = int(rng.integers(1, 12))
+        layouts.append(
+            (
+                rng.choice(["PLACEHOLDER", "TEXT_BOX", "PICTURE", "AUTO_SHAPE"], n),
+                rng.uniform(0, 500, (n, 2)),
+                rng.uniform(20, 200, (n, 2)),
+            )
+        )
+    slides = []
+    for slide_id in range(count):
+        types, origins, sizes = layouts[int(rng.integers(templates))]
+        origins = origins + rng.uniform(-jitter, jitter, origins.shape)
+        shapes = [
+            {
+                "shape_id": shape_id,
+                "shape_type": str(shape_type),
+                "left": left,
+                "top": top,
+                "width": width,
+                "height": height,
+                "text": f"slide {slide_id}",
+            }
+            for shape_id, (shape_type, (left, top), (width, height)) in enumerate(
+                zip(types, origins.tolist(), sizes.tolist())
+            )
+        ]
+        slides.append({"slide_id": slide_id, "shapes": shapes})
+    return slides
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slides", type=int, default=100_000)
+    parser.add_argument("--templates", type=int, default=200)
+    parser.add_argument(
+        "--jitter", type=float, default=2.0, help="offset noise in points"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    slides = _templated_slides(args.slides, args.templates, args.jitter)
+    for tolerance in (0.0, args.tolerance):
+        start = time.perf_counter()
+        clusters = cluster_layouts(slides, SLIDE_WIDTH, SLIDE_HEIGHT, tolerance)
+        elapsed = time.perf_counter() - start
+        print(
+            f"tolerance {tolerance:g}: {len(clusters)} LLM calls instead of "
+            f"{len(slides)} ({1 - len(clusters) / len(slides):.1%} fewer), "
+            f"clustered in {elapsed:.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Time scoring a large dataset of synthetic slides with pptlayout.metrics.
+
+Usage: python benchmarks/metrics_throughput.py [--slides 100000] [--max-shapes 30]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from pptlayout.metrics import score_layout, score_slides
+
+SLIDE_WIDTH, SLIDE_HEIGHT = 720, 540
+
+
+def _synthetic_slides(count: int, max_shapes: int, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    slides = []
+    for slide_id in range(count):
+        n = int(rng.integers(1, max_shapes + 1))
+        sizes = rng.uniform(20, 300, (n, 2))
+        origins = rng.uniform(-20, 600, (n, 2))
+        shapes = [
+            {
+                "shape_id": shape_id,
+                "left": left,
+                "top": top,
+                "width": width,
+                "height": height,
+            }
+            for shape_id, ((left, top), (width, height)) in enumerate(
+                zip(origins.tolist(), sizes.tolist())
+            )
+        ]
+        slides.append({"slide_id": slide_id, "shapes": shapes})
+    return slides
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--slides", type=int, default=100_000)
+    parser.add_argument("--max-shapes", type=int, default=30)
+    parser.add_argument("--chunk-size", type=int, default=1024)
+    args = parser.parse_args(argv)
+
+    slides = _synthetic_slides(args.slides, args.max_shapes)
+    start = time.perf_counter()
+    score_slides(slides, SLIDE_WIDTH, SLIDE_HEIGHT, chunk_size=args.chunk_size)
+    batched = time.perf_counter() - start
+    print(f"score_slides: {args.slides} slides in {batched:.2f} s")
+
+    sample = slides[: min(len(slides), 2000)]
+    start = time.perf_counter()
+    for slide in sample:
+        score_layout(slide, SLIDE_WIDTH, SLIDE_HEIGHT)
+    per_slide = (time.perf_counter() - start) / len(sample)
+    print(
+        f"score_layout: {per_slide * 1e3:.3f} ms per slide, "
+        f"{per_slide * args.slides:.2f} s extrapolated"
+    )
+
+
+if __name__ == "__main__":
+    main()
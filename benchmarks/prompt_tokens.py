@@ -0,0 +1,48 @@
+"""Count prompt tokens per deck for the JSON and the compact layout encodings.
+
+Usage: python benchmarks/prompt_tokens.py DECK.pptx [DECK.pptx ...]
+"""
+
+import argparse
+
+import tiktoken
+
+from pptlayout.extractors.run_extractors import run_extractors
+from pptlayout.llm.prompts import build_slide_layout_suggestion_prompts
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pptx_paths", nargs="+")
+    parser.add_argument("--encoding", default="cl100k_base")
+    parser.add_argument("--measurement-unit", default="pt")
+    args = parser.parse_args(argv)
+
+    encoding = tiktoken.get_encoding(args.encoding)
+    print(f"{'deck':40} {'slides':>6} {'json':>9} {'compact':>9} {'ratio':>6}")
+    totals = [0, 0]
+    for pptx_path in args.pptx_paths:
+        ppt_data = run_extractors(pptx_path, args.measurement_unit, engine="xml")
+        counts = [0, 0]
+        for slide in ppt_data["slides"]:
+            for i, compact in enumerate((False, True)):
+                prompt = build_slide_layout_suggestion_prompts(
+                    slide,
+                    ppt_data["slide_width"],
+                    ppt_data["slide_height"],
+                    compact=compact,
+                )
+                counts[i] += len(encoding.encode(prompt))
+        totals = [total + count for total, count in zip(totals, counts)]
+        print(
+            f"{pptx_path[-40:]:40} {len(ppt_data['slides']):>6} "
+            f"{counts[0]:>9} {counts[1]:>9} {counts[0] / max(counts[1], 1):>6.2f}"
+        )
+    print(
+        f"{'total':40} {'':>6} {totals[0]:>9} {totals[1]:>9} "
+        f"{totals[0] / max(totals[1], 1):>6.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
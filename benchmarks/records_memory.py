@@ -0,0 +1,69 @@
+"""Compare the memory held by extracted layouts as dicts and as records.
+
+Usage: python benchmarks/records_memory.py DECK.pptx [--copies N]
+
+Each deck is extracted once and its slides replicated N times, so the numbers
+approximate a dataset build holding many decks in memory.
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from pptlayout.extractors.records import presentation_record
+from pptlayout.extractors.run_extractors import run_extractors
+
+
+def _measure(build) -> tuple[int, object]:
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, value
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pptx_path")
+    parser.add_argument("--copies", type=int, default=1000)
+    parser.add_argument("--measurement-unit", default="pt")
+    args = parser.parse_args(argv)
+
+    ppt_data = run_extractors(args.pptx_path, args.measurement_unit, engine="xml")
+    shape_count = sum(len(slide["shapes"]) for slide in ppt_data["slides"])
+    payload = ppt_data
+
+    def build_dicts():
+        return [
+            {
+                **payload,
+                "slides": [
+                    {**slide, "shapes": [dict(shape) for shape in slide["shapes"]]}
+                    for slide in payload["slides"]
+                ],
+            }
+            for _ in range(args.copies)
+        ]
+
+    def build_records():
+        return [
+            presentation_record(payload, args.measurement_unit)
+            for _ in range(args.copies)
+        ]
+
+    dict_bytes, _ = _measure(build_dicts)
+    record_bytes, _ = _measure(build_records)
+    shapes = shape_count * args.copies
+    print(f"shapes:  {shapes}")
+    print(
+        f"dicts:   {dict_bytes / 2**20:8.1f} MiB ({dict_bytes / shapes:6.0f} B/shape)"
+    )
+    print(
+        f"records: {record_bytes / 2**20:8.1f} MiB ({record_bytes / shapes:6.0f} B/shape)"
+    )
+    print(f"ratio:   {dict_bytes / record_bytes:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from functools import partial
+from itertools import islice
+from operator import itemgetter
+from typing import IO
+
+from pptlayout.extractors.batch import ChunkedProcessPool
+
+from .xml_applier import apply_layouts
+
+
+def iter_jobs(manifest: IO[str]) -> Iterator[dict]:
+    """Yield the jobs of a JSONL manifest, skipping blank lines.
+
+    Each job has a ``pptx_path``, the revised ``slides`` and optionally an
+    ``output_path`` and a ``measurement_unit``.
+    """
+    for line in manifest:
+        if line.strip():
+            yield json.loads(line)
+
+
+def apply_job(job: dict, measurement_unit: str = "pt") -> dict:
+    """Apply one job into a result row; failures become error rows."""
+    start = time.perf_counter()
+    pptx_path = job["pptx_path"]
+    output_path = job.get("output_path") or pptx_path
+    try:
+        summary = apply_layouts(
+            pptx_path,
+            job["slides"],
+            output_path,
+            job.get("measurement_unit", measurement_unit),
+        )
+    except Exception as e:
+        return {
+            "path": pptx_path,
+            "status": "error",
+            "elapsed": time.perf_counter() - start,
+            "error": f"{type(e).__name__}: {e}",
+        }
+    return {
+        "path": pptx_path,
+        "output_path": output_path,
+        "status": "ok",
+        "elapsed": time.perf_counter() - start,
+        **summary,
+    }
+
+
+def _apply_chunk(jobs: list[dict], measurement_unit: str) -> list[dict]:
+    return [apply_job(job, measurement_unit) for job in jobs]
+
+
+def run_apply_batch(
+    jobs: Iterable[dict],
+    output: IO[str],
+    workers: int | None = None,
+    chunk_size: int = 16,
+    measurement_unit: str = "pt",
+) -> dict:
+    """Apply jobs over a process pool, streaming one JSONL row per deck.
+
+    Rows are written in completion order. At most two chunks per worker are in
+    flight, so the manifest is never loaded whole. A deck that kills its worker
+    process gets an error row and the batch carries on, see
+    :class:`~pptlayout.extractors.batch.ChunkedProcessPool`. Every job should
+    write to its own output path.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    job_iter = iter(jobs)
+    chunks = iter(lambda: list(islice(job_iter, chunk_size)), [])
+    summary = {"files": 0, "errors": 0, "shapes": 0, "elapsed": 0.0}
+    start = time.perf_counter()
+    pool = ChunkedProcessPool(
+        workers,
+        partial(_apply_chunk, measurement_unit=measurement_unit),
+        partial(apply_job, measurement_unit=measurement_unit),
+        item_path=itemgetter("pptx_path"),
+    )
+    for row in pool.map(chunks):
+        output.write(json.dumps(row) + "\n")
+        output.flush()
+        summary["files"] += 1
+        summary["errors"] += row["status"] == "error"
+        summary["shapes"] += row.get("shapes", 0)
+    summary["elapsed"] = time.perf_counter() - start
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="pptlayout-apply",
+        description="Apply revised slide layouts from a JSONL manifest to .pptx files.",
+    )
+    parser.add_argument(
+        "manifest", help="JSONL file of jobs, one deck per line, or - for stdin"
+    )
+    parser.add_argument(
+        "-o", "--output", default="-", help="JSONL report path (default: stdout)"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunk-size",
+        type=int,
+        default=16,
+        help="decks sent to a worker per task (default: 16)",
+    )
+    parser.add_argument(
+        "-u",
+        "--measurement-unit",
+        default="pt",
+        choices=["emu", "pt", "cm", "inches"],
+        help="unit of jobs that do not set their own (default: pt)",
+    )
+    args = parser.parse_args(argv)
+
+    manifest_context = (
+        contextlib.nullcontext(sys.stdin)
+        if args.manifest == "-"
+        else open(args.manifest, encoding="utf-8")
+    )
+    output_context = (
+        contextlib.nullcontext(sys.stdout)
+        if args.output == "-"
+        else open(args.output, "w", encoding="utf-8")
+    )
+    with manifest_context as manifest, output_context as output:
+        summary = run_apply_batch(
+            iter_jobs(manifest),
+            output,
+            args.workers,
+            args.chunk_size,
+            args.measurement_unit,
+        )
+    print(
+        f"Applied {summary['shapes']} shapes to {summary['files']} files "
+        f"({summary['errors']} errors) in {summary['elapsed']:.1f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+import os
+import shutil
+import tempfile
+import zipfile
+from collections.abc import Callable, Iterable, Sequence
+
+from lxml import etree
+
+from pptlayout.extractors.groups import (
+    IDENTITY,
+    GroupTransform,
+    apply_transform,
+    child_transform,
+)
+from pptlayout.extractors.opc import NAMESPACES, PptxPackage, qn
+from pptlayout.extractors.xml_extractor import (
+    P_CXN_SP,
+    P_GRAPHIC_FRAME,
+    P_GRP_SP,
+    PLACEHOLDER_TAGS,
+    SHAPE_TAGS,
+    Geometry,
+    PlaceholderInheritance,
+    _find_ph,
+    _group_children,
+    _is_true,
+    _read_geometry,
+)
+from pptlayout.utils import GEOMETRY_KEYS, to_emu
+
+A_XFRM = qn("a:xfrm")
+A_OFF = qn("a:off")
+A_EXT = qn("a:ext")
+P_XFRM = qn("p:xfrm")
+P_SP_PR = qn("p:spPr")
+P_GRP_SP_PR = qn("p:grpSpPr")
+
+ENDPOINT_KEYS = ("begin_x", "begin_y", "end_x", "end_y")
+
+
+def revised_geometry(shape_data: dict, measurement_unit: str) -> dict[str, int]:
+    """Return the lengths of a revised shape dict in exact EMU.
+
+    The unit is the shape's own ``measurement_unit`` if it has one.
+    """
+    unit = shape_data.get("measurement_unit", measurement_unit)
+    return {
+        key: to_emu(shape_data[key], unit)
+        for key in GEOMETRY_KEYS
+        if shape_data.get(key) is not None
+    }
+
+
+def _inverse(value: int, scale: float, offset: float) -> int:
+    if (scale, offset) == (1.0, 0.0):
+        return value
+    return round((value - offset) / scale)
+
+
+def _child_space(geometry: dict[str, int], transform: GroupTransform) -> dict:
+    """Map slide coordinates back into the child space of the enclosing group."""
+    scale_x, offset_x, scale_y, offset_y = transform
+    child = {}
+    for key, value in geometry.items():
+        if key in ("left", "begin_x", "end_x"):
+            child[key] = _inverse(value, scale_x, offset_x)
+        elif key in ("top", "begin_y", "end_y"):
+            child[key] = _inverse(value, scale_y, offset_y)
+        elif key == "width":
+            child[key] = _inverse(value, scale_x, 0.0)
+        else:
+            child[key] = _inverse(value, scale_y, 0.0)
+    return child
+
+
+def _find_or_insert(parent: etree._Element, tag: str, index: int) -> etree._Element:
+    child = parent.find(tag)
+    if child is None:
+        child = etree.Element(tag)
+        parent.insert(index, child)
+    return child
+
+
+def _properties(shape_elm: etree._Element) -> etree._Element | None:
+    """Return the element holding the transform of a shape, if it can have one."""
+    tag = shape_elm.tag
+    if tag == P_GRAPHIC_FRAME:
+        return shape_elm
+    return shape_elm.find(P_GRP_SP_PR if tag == P_GRP_SP else P_SP_PR)
+
+
+def _xfrm(properties: etree._Element) -> etree._Element | None:
+    return properties.find(P_XFRM if properties.tag == P_GRAPHIC_FRAME else A_XFRM)
+
+
+def _complete(values: tuple, current: Sequence) -> tuple | None:
+    """Fill the missing half of a revised pair from the current geometry.
+
+    Returns None if a half is missing from both.
+    """
+    if values == (None, None):
+        return values
+    values = tuple(old if new is None else new for new, old in zip(values, current))
+    return None if None in values else values
+
+
+def _current_endpoints(
+    geometry: Geometry, xfrm: etree._Element | None, transform: GroupTransform
+) -> dict[str, int] | None:
+    """Return a connector's endpoints in slide space, as the extractors do."""
+    left, top, width, height = geometry
+    if left is None or top is None or width is None or height is None:
+        return None
+    flip_h = xfrm is not None and _is_true(xfrm.get("flipH"))
+    flip_v = xfrm is not None and _is_true(xfrm.get("flipV"))
+    endpoints = {
+        "begin_x": left + width if flip_h else left,
+        "begin_y": top + height if flip_v else top,
+        "end_x": left if flip_h else left + width,
+        "end_y": top if flip_v else top + height,
+    }
+    return apply_transform(endpoints, transform)
+
+
+def apply_shape_geometry(
+    shape_elm: etree._Element,
+    geometry: dict[str, int],
+    transform: GroupTransform,
+    inherited: Geometry | None = None,
+) -> str | None:
+    """Write slide-space EMU `geometry` to the transform of a shape element.
+
+    A connector whose revised endpoints differ from its current ones gets its
+    offset, extent and flips recomputed from them; otherwise its box is
+    applied like any other shape's. Any key missing from `geometry` is left
+    unchanged, taking the missing half of an offset or extent from the
+    `inherited` geometry of a placeholder without its own.
+
+    Returns ``"applied"``, ``"conflict"`` if the endpoints were applied but
+    the revised box disagrees with them, or None, leaving the shape untouched,
+    for a shape without a transform to write, such as a content part, or a
+    missing half that cannot be filled.
+    """
+    geometry = dict(geometry)
+    endpoints = {key: geometry.pop(key) for key in ENDPOINT_KEYS if key in geometry}
+    current = _read_geometry(shape_elm)
+    if inherited is not None:
+        current = [new if old is None else old for old, new in zip(current, inherited)]
+    properties = _properties(shape_elm)
+    if properties is None:
+        return None
+    xfrm = _xfrm(properties)
+    status = "applied"
+    flips = None
+    if (
+        shape_elm.tag == P_CXN_SP
+        and len(endpoints) == len(ENDPOINT_KEYS)
+        and endpoints != _current_endpoints(current, xfrm, transform)
+    ):
+        begin_x, begin_y = endpoints["begin_x"], endpoints["begin_y"]
+        end_x, end_y = endpoints["end_x"], endpoints["end_y"]
+        box = {
+            "left": min(begin_x, end_x),
+            "top": min(begin_y, end_y),
+            "width": abs(end_x - begin_x),
+            "height": abs(end_y - begin_y),
+        }
+        if any(geometry.get(key, value) != value for key, value in box.items()):
+            status = "conflict"
+        geometry.update(box)
+        flips = {"flipH": begin_x > end_x, "flipV": begin_y > end_y}
+
+    geometry = _child_space(geometry, transform)
+    offset = _complete((geometry.get("left"), geometry.get("top")), current[:2])
+    extent = _complete((geometry.get("width"), geometry.get("height")), current[2:])
+    if offset is None or extent is None:
+        return None
+    if offset == extent == (None, None) and flips is None:
+        return status
+    if xfrm is None:
+        if properties.tag == P_GRAPHIC_FRAME:
+            return None
+        # The transform is the first child of the shape properties
+        xfrm = _find_or_insert(properties, A_XFRM, 0)
+    for name, flipped in (flips or {}).items():
+        if flipped:
+            xfrm.set(name, "1")
+        elif name in xfrm.attrib:
+            del xfrm.attrib[name]
+    if offset != (None, None):
+        off = _find_or_insert(xfrm, A_OFF, 0)
+        off.set("x", str(offset[0]))
+        off.set("y", str(offset[1]))
+    if extent != (None, None):
+        ext = _find_or_insert(xfrm, A_EXT, 1 if xfrm.find(A_OFF) is not None else 0)
+        ext.set("cx", str(extent[0]))
+        ext.set("cy", str(extent[1]))
+    return status
+
+
+def apply_slide_geometry(
+    slide: etree._Element,
+    geometries: dict[int, dict[str, int]],
+    inherited_geometry: Callable[[int], Geometry] | None = None,
+) -> dict[int, str]:
+    """Apply EMU geometries keyed by shape id to a parsed slide part.
+
+    Shapes are visited in document order, each group before its members, so
+    members are mapped into the child space of their group as revised.
+    `inherited_geometry` maps a placeholder idx to the geometry it inherits.
+    Returns the :func:`apply_shape_geometry` status of every updated shape,
+    keyed by shape id.
+    """
+    applied = {}
+    sp_tree = slide.find("p:cSld/p:spTree", NAMESPACES)
+    stack = [(sp_tree.iterchildren(*SHAPE_TAGS), IDENTITY)]
+    while stack:
+        children, transform = stack[-1]
+        shape_elm = next(children, None)
+        if shape_elm is None:
+            stack.pop()
+            continue
+        c_nv_pr = shape_elm[0].find("p:cNvPr", NAMESPACES)
+        shape_id = int(c_nv_pr.get("id"))
+        if shape_id in geometries:
+            ph = _find_ph(shape_elm) if shape_elm.tag in PLACEHOLDER_TAGS else None
+            inherited = None
+            if ph is not None and inherited_geometry is not None:
+                inherited = inherited_geometry(int(ph.get("idx", "0")))
+            status = apply_shape_geometry(
+                shape_elm, geometries[shape_id], transform, inherited
+            )
+            if status is not None:
+                applied[shape_id] = status
+        group = _group_children(shape_elm)
+        if group is not None:
+            members, child_geometry = group
+            geometry = _read_geometry(shape_elm)
+            stack.append(
+                (members, child_transform(transform, geometry, child_geometry))
+            )
+    return applied
+
+
+def _write_package(
+    pptx_path: str, output_path: str, replaced_parts: dict[str, bytes]
+) -> None:
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    # Write next to the output and rename, so the input can be overwritten
+    fd, temp_path = tempfile.mkstemp(suffix=".pptx", dir=output_dir)
+    os.close(fd)
+    try:
+        with (
+            zipfile.ZipFile(pptx_path) as source,
+            zipfile.ZipFile(temp_path, "w") as target,
+        ):
+            for info in source.infolist():
+                if info.filename in replaced_parts:
+                    target.writestr(info, replaced_parts[info.filename])
+                else:
+                    with source.open(info) as src, target.open(info, "w") as dst:
+                        shutil.copyfileobj(src, dst)
+        shutil.copymode(pptx_path, temp_path)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def apply_layouts(
+    pptx_path: str,
+    revised_slides: Iterable[dict],
+    output_path: str | None = None,
+    measurement_unit: str = "pt",
+) -> dict:
+    """Apply revised slide layouts to a deck and save it.
+
+    `revised_slides` are slide dicts as produced by the extractors or the LLM,
+    matched to the deck by ``slide_id`` and their shapes by ``shape_id``. Only
+    the geometry of the matched shapes is written, straight into the slide
+    XML; every other part is copied unchanged. The deck is saved to
+    `output_path`, or over itself when it is None.
+
+    Returns the number of updated slides and shapes, the ``[slide_id,
+    shape_id]`` pairs that could not be applied because they are not in the
+    deck, with a ``None`` shape id for a missing slide, or have no transform,
+    and the pairs of connectors whose revised box disagreed with their revised
+    endpoints, which were applied instead.
+    """
+    revisions: dict[int, dict[int, dict[str, int]]] = {}
+    for slide in revised_slides:
+        geometries = revisions.setdefault(slide["slide_id"], {})
+        for shape in slide["shapes"]:
+            geometries[shape["shape_id"]] = revised_geometry(shape, measurement_unit)
+
+    summary: dict = {"slides": 0, "shapes": 0, "missing": [], "conflicts": []}
+    replaced_parts = {}
+    with PptxPackage(pptx_path) as package:
+        slide_partnames = dict(package.slide_refs())
+        placeholder_inheritance = PlaceholderInheritance(package)
+        for slide_id, geometries in revisions.items():
+            partname = slide_partnames.get(slide_id)
+            if partname is None:
+                summary["missing"].append([slide_id, None])
+                continue
+            slide = package.parse_part(partname)
+            layout_partname = placeholder_inheritance.layout_partname(partname)
+            applied = apply_slide_geometry(
+                slide,
+                geometries,
+                lambda idx: placeholder_inheritance.inherited_geometry(
+                    layout_partname, idx
+                ),
+            )
+            summary["missing"].extend(
+                [slide_id, shape_id]
+                for shape_id in geometries
+                if shape_id not in applied
+            )
+            summary["conflicts"].extend(
+                [slide_id, shape_id]
+                for shape_id, status in applied.items()
+                if status == "conflict"
+            )
+            if applied:
+                summary["slides"] += 1
+                summary["shapes"] += len(applied)
+                replaced_parts[partname] = etree.tostring(
+                    slide, xml_declaration=True, encoding="UTF-8", standalone=True
+                )
+    _write_package(pptx_path, output_path or pptx_path, replaced_parts)
+    return summary
@@ -0,0 +1,101 @@
+import argparse
+import sys
+from collections.abc import Callable
+
+from pptlayout.extractors.batch import iter_pptx_paths
+from pptlayout.extractors.run_extractors import EXTRACTOR_ENGINES
+
+from .harness import STAGES, compare_reports, load_report, run_benchmark, save_report
+from .mock import MockLLM
+
+
+def format_report(report: dict) -> str:
+    lines = [
+        f"{report['decks']} decks, {report['slides']} slides "
+        f"in {report['elapsed_s']:.2f}s",
+        f"{'stage':8} {'count':>6} {'errors':>6} {'items/s':>10} {'p50 ms':>9} "
+        f"{'p95 ms':>9} {'p99 ms':>9} {'rss MB':>8}",
+    ]
+    for stage in STAGES:
+        stats = report["stages"][stage]
+        lines.append(
+            f"{stage:8} {stats['count']:>6} {stats['errors']:>6} "
+            f"{stats['throughput']:>10.1f} {stats['p50_ms']:>9.2f} "
+            f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+            f"{stats['peak_rss_mb']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="pptlayout-bench",
+        description="Time extraction, prompting, inference and parsing over a corpus.",
+    )
+    parser.add_argument(
+        "corpus", help="directory to scan for .pptx files, or a manifest file"
+    )
+    parser.add_argument("-m", "--model", default="llama3.1:8b")
+    parser.add_argument(
+        "--mock",
+        action="store_true",
+        help="answer with an offline mock instead of calling the model",
+    )
+    parser.add_argument(
+        "--mock-latency",
+        type=float,
+        default=0.0,
+        help="seconds the mock sleeps per request (default: 0)",
+    )
+    parser.add_argument(
+        "-u",
+        "--measurement-unit",
+        default="pt",
+        choices=["emu", "pt", "cm", "inches"],
+    )
+    parser.add_argument("-e", "--engine", default="xml", choices=EXTRACTOR_ENGINES)
+    parser.add_argument(
+        "--max-slides", type=int, default=None, help="slides benchmarked per deck"
+    )
+    parser.add_argument("--compact", action="store_true", help="use compact prompts")
+    parser.add_argument("-o", "--output", default=None, help="write the report JSON")
+    parser.add_argument(
+        "--baseline", default=None, help="report JSON to compare against"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="relative change tolerated before a regression (default: 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    llm: Callable[..., str]
+    if args.mock:
+        llm = MockLLM(args.mock_latency)
+    else:
+        from pptlayout.llm.llm import call_llm
+
+        llm = call_llm
+
+    report = run_benchmark(
+        iter_pptx_paths(args.corpus),
+        llm,
+        args.model,
+        args.measurement_unit,
+        args.engine,
+        args.max_slides,
+        args.compact,
+    )
+    print(format_report(report))
+    if args.output is not None:
+        save_report(report, args.output)
+    if args.baseline is not None:
+        regressions = compare_reports(
+            report, load_report(args.baseline), args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
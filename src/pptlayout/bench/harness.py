@@ -0,0 +1,177 @@
+import json
+import platform
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from pptlayout.extractors.run_extractors import run_extractors
+from pptlayout.llm.llm import call_llm
+from pptlayout.llm.parser import extract_compact_layout, extract_json
+from pptlayout.llm.prompts import build_slide_layout_suggestion_prompts
+
+STAGES = ("extract", "prompt", "llm", "parse")
+
+# Statistics where a larger value is a regression, and where a smaller one is
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "peak_rss_mb")
+HIGHER_IS_BETTER = ("throughput",)
+
+
+def peak_rss() -> int:
+    """Return the peak resident set size of this process so far, in bytes.
+
+    Returns 0 where the peak is not available (Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+@dataclass
+class StageStats:
+    """Timings of every item that went through one stage of the pipeline.
+
+    ``peak_rss`` is the peak resident set size of the process when the last
+    item of the stage finished, allocations freed since included.
+    """
+
+    name: str
+    durations: list[float] = field(default_factory=list)
+    errors: int = 0
+    peak_rss: int = 0
+
+    def record(self, duration: float) -> None:
+        self.durations.append(duration)
+        self.peak_rss = peak_rss()
+
+    def summary(self) -> dict:
+        durations = np.array(self.durations)
+        total = float(durations.sum())
+        p50, p95, p99 = (
+            np.percentile(durations, [50, 95, 99]) * 1e3
+            if len(durations)
+            else (0.0, 0.0, 0.0)
+        )
+        return {
+            "count": len(durations),
+            "errors": self.errors,
+            "total_s": total,
+            "throughput": len(durations) / total if total else 0.0,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+            "peak_rss_mb": self.peak_rss / (1 << 20),
+        }
+
+
+class _Timer:
+    def __init__(self, stats: StageStats):
+        self._stats = stats
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        self._stats.record(time.perf_counter() - self._start)
+        if exc_type is not None and issubclass(exc_type, Exception):
+            self._stats.errors += 1
+            return True
+        return False
+
+
+def run_benchmark(
+    pptx_paths: Iterable[str],
+    llm: Callable[..., str] = call_llm,
+    model_name: str = "llama3.1:8b",
+    measurement_unit: str = "pt",
+    engine: str = "xml",
+    max_slides: int | None = None,
+    compact: bool = False,
+) -> dict:
+    """Run every slide of a corpus through the layout suggestion pipeline.
+
+    Each deck is extracted with :func:`run_extractors`, and each of its first
+    `max_slides` slides is turned into a prompt, sent to `llm` and parsed with
+    :func:`extract_json`, or :func:`extract_compact_layout` for the CSV replies
+    asked for with ``compact=True``. Each stage is timed per item; an item that raises is
+    counted as an error of its stage and the slide goes no further.
+    Returns a report with the summary of every stage.
+    """
+    stages = {name: StageStats(name) for name in STAGES}
+    start = time.perf_counter()
+    decks = slides = 0
+    for pptx_path in pptx_paths:
+        ppt_data = None
+        with _Timer(stages["extract"]):
+            ppt_data = run_extractors(pptx_path, measurement_unit, engine=engine)
+        if ppt_data is None:
+            continue
+        decks += 1
+        for slide in ppt_data["slides"][:max_slides]:
+            slides += 1
+            prompt = response = None
+            with _Timer(stages["prompt"]):
+                prompt = build_slide_layout_suggestion_prompts(
+                    slide,
+                    ppt_data["slide_width"],
+                    ppt_data["slide_height"],
+                    compact=compact,
+                    measurement_unit=measurement_unit,
+                )
+            if prompt is None:
+                continue
+            with _Timer(stages["llm"]):
+                response = llm(model_name=model_name, prompt=prompt, json=False)
+            if response is None:
+                continue
+            with _Timer(stages["parse"]):
+                if compact:
+                    extract_compact_layout(response, slide)
+                else:
+                    extract_json(response)
+    return {
+        "decks": decks,
+        "slides": slides,
+        "elapsed_s": time.perf_counter() - start,
+        "stages": {name: stats.summary() for name, stats in stages.items()},
+    }
+
+
+def compare_reports(report: dict, baseline: dict, tolerance: float = 0.1) -> list[str]:
+    """Return a message for every statistic worse than `baseline` by over `tolerance`.
+
+    Latencies and memory regress when they grow, throughput when it drops,
+    relative to the baseline value.
+    """
+    regressions = []
+    for stage, baseline_stats in baseline["stages"].items():
+        stats = report["stages"].get(stage)
+        if stats is None or not stats["count"] or not baseline_stats["count"]:
+            continue
+        for key in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            old, new = baseline_stats[key], stats[key]
+            if not old:
+                continue
+            change = (new - old) / old
+            if key in HIGHER_IS_BETTER:
+                change = -change
+            if change > tolerance:
+                regressions.append(
+                    f"{stage}.{key}: {old:.4g} -> {new:.4g} ({change:+.0%} worse)"
+                )
+    return regressions
+
+
+def load_report(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_report(report: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
@@ -0,0 +1,17 @@
+from pptlayout.llm.backends import MockBackend
+
+
+class MockLLM:
+    """Offline stand-in for :func:`call_llm` that answers with the prompt's layout.
+
+    Requests are answered by a :class:`~pptlayout.llm.backends.MockBackend`
+    sleeping for `latency` seconds, and counted in ``calls``.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.backend = MockBackend(latency)
+        self.calls = 0
+
+    def __call__(self, model_name: str = "mock", prompt: str = "", **kwargs) -> str:
+        self.calls += 1
+        return self.backend.generate(model_name, prompt)
@@ -0,0 +1,122 @@
+import hashlib
+import sqlite3
+import time
+from dataclasses import dataclass
+
+
+def hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int
+    misses: int
+    entries: int
+    size_bytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SQLiteCache:
+    """Size-bounded, least-recently-used key/value store in a SQLite file.
+
+    Values are opaque bytes. Every entry is tagged with a version string and
+    entries written under another version are dropped when the cache is opened,
+    so bumping the version invalidates everything written by older code. The
+    database can be shared by several processes.
+    """
+
+    def __init__(self, path: str, version: str, max_bytes: int | None = None):
+        self._path = path
+        self._version = version
+        self._max_bytes = max_bytes
+        self._hits = 0
+        self._misses = 0
+        self._connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "version TEXT NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)"
+        )
+        self._connection.execute(
+            "DELETE FROM entries WHERE version != ?", (self._version,)
+        )
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def hits(self) -> int:
+        """Lookups answered by this connection, without querying the database."""
+        return self._hits
+
+    def get(self, key: str) -> bytes | None:
+        row = self._connection.execute(
+            "SELECT value FROM entries WHERE key = ? AND version = ?",
+            (key, self._version),
+        ).fetchone()
+        if row is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._connection.execute(
+            "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+        )
+        return row[0]
+
+    def put(self, key: str, value: bytes) -> None:
+        if self._max_bytes is not None and len(value) > self._max_bytes:
+            return
+        self._connection.execute(
+            "INSERT OR REPLACE INTO entries (key, value, size, version, last_access) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, value, len(value), self._version, time.time()),
+        )
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the size bound holds."""
+        if self._max_bytes is None:
+            return 0
+        (total,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        evicted = 0
+        if total <= self._max_bytes:
+            return evicted
+        rows = self._connection.execute(
+            "SELECT key, size FROM entries ORDER BY last_access, rowid"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self._max_bytes:
+                break
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        return evicted
+
+    def invalidate(self) -> None:
+        """Drop every entry."""
+        self._connection.execute("DELETE FROM entries")
+
+    def stats(self) -> CacheStats:
+        entries, size_bytes = self._connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        return CacheStats(self._hits, self._misses, entries, size_bytes)
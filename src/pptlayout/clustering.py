@@ -0,0 +1,225 @@
+import hashlib
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from pptlayout.metrics import shape_boxes
+from pptlayout.utils import GEOMETRY_KEYS
+
+# Default quantization step, as a fraction of the slide size
+DEFAULT_GRID = 0.01
+
+HORIZONTAL_KEYS = ("left", "width", "begin_x", "end_x")
+
+
+def _shape_kind(shape: dict) -> tuple:
+    kind: tuple = (shape["shape_type"], shape.get("placeholder_type", ""))
+    if "begin_x" in shape:
+        # The direction of a connector is part of the layout
+        kind += (shape["begin_x"] > shape["end_x"], shape["begin_y"] > shape["end_y"])
+    return kind
+
+
+def _normalized_boxes(
+    slide_layout: dict, slide_width: float, slide_height: float
+) -> np.ndarray:
+    return shape_boxes(slide_layout["shapes"]) / np.array(
+        [slide_width, slide_height, slide_width, slide_height], float
+    )
+
+
+def _signature(
+    slide_layout: dict, slide_width: float, slide_height: float, grid: float
+) -> tuple[tuple, np.ndarray, np.ndarray]:
+    """Return the sorted shape kinds, shape order and normalized boxes of a slide.
+
+    Shapes are sorted by kind, then by quantized position and size, so that
+    the shapes of two slides with the same layout line up index by index.
+    """
+    shapes = slide_layout["shapes"]
+    boxes = _normalized_boxes(slide_layout, slide_width, slide_height)
+    cells = np.round(boxes / grid).astype(np.int64)
+    kinds = [_shape_kind(shape) for shape in shapes]
+    # Top to bottom, then left to right, within each kind
+    keys = cells[:, [1, 0, 2, 3]].tolist()
+    order = sorted(range(len(shapes)), key=lambda index: (kinds[index], keys[index]))
+    return tuple(kinds[index] for index in order), np.array(order, int), boxes[order]
+
+
+def _fingerprint(kinds: tuple, boxes: np.ndarray, grid: float) -> str:
+    digest = hashlib.sha256(repr(kinds).encode())
+    digest.update(np.round(boxes / grid).astype(np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def layout_fingerprint(
+    slide_layout: dict,
+    slide_width: int | float,
+    slide_height: int | float,
+    grid: float = DEFAULT_GRID,
+) -> str:
+    """Return a digest of a slide's layout that ignores its text.
+
+    Built from the shape and placeholder types and the geometry of the shapes,
+    quantized to `grid` times the slide size, so a template slide filled with
+    other text, or a deck saved in another unit, gets the same fingerprint.
+    Names, ids and text are left out, and so is the order of the shapes.
+    """
+    kinds, _, boxes = _signature(slide_layout, slide_width, slide_height, grid)
+    return _fingerprint(kinds, boxes, grid)
+
+
+@dataclass
+class LayoutCluster:
+    """Slides sharing a layout, as indices into the clustered slides.
+
+    The first member is the representative the others are mapped from.
+    """
+
+    fingerprint: str
+    members: list[int]
+
+    @property
+    def representative(self) -> int:
+        return self.members[0]
+
+
+def cluster_layouts(
+    slide_layouts: Sequence[dict],
+    slide_width: int | float | Sequence[int | float],
+    slide_height: int | float | Sequence[int | float],
+    tolerance: float = 0.0,
+    grid: float = DEFAULT_GRID,
+) -> list[LayoutCluster]:
+    """Group the slides of a corpus whose layouts are identical or nearly so.
+
+    The slide size is shared or given per slide. Slides with the same
+    :func:`layout_fingerprint` always share a cluster. With a positive
+    `tolerance`, a slide with the same kinds of shapes as a representative,
+    each placed and sized within `tolerance` times the slide size of its
+    counterpart, joins the representative's cluster as well. Clusters are
+    returned in order of their first slide.
+    """
+    count = len(slide_layouts)
+    widths = np.broadcast_to(np.asarray(slide_width, float), (count,))
+    heights = np.broadcast_to(np.asarray(slide_height, float), (count,))
+
+    exact: dict[str, list[int]] = {}
+    structures: dict[tuple, list[str]] = {}
+    boxes: dict[str, np.ndarray] = {}
+    for index, slide_layout in enumerate(slide_layouts):
+        kinds, _, normalized = _signature(
+            slide_layout, widths[index], heights[index], grid
+        )
+        fingerprint = _fingerprint(kinds, normalized, grid)
+        if fingerprint not in exact:
+            exact[fingerprint] = []
+            structures.setdefault(kinds, []).append(fingerprint)
+            boxes[fingerprint] = normalized
+        exact[fingerprint].append(index)
+
+    clusters = {
+        fingerprint: LayoutCluster(fingerprint, members)
+        for fingerprint, members in exact.items()
+    }
+    if tolerance > 0:
+        for fingerprints in structures.values():
+            _merge_near_duplicates(fingerprints, boxes, clusters, tolerance)
+    return sorted(clusters.values(), key=lambda cluster: cluster.representative)
+
+
+def _merge_near_duplicates(
+    fingerprints: list[str],
+    boxes: dict[str, np.ndarray],
+    clusters: dict[str, LayoutCluster],
+    tolerance: float,
+) -> None:
+    """Merge the exact clusters of one structure around representatives.
+
+    Leader clustering: the earliest remaining cluster absorbs every other one
+    whose boxes are all within `tolerance` of its own, compared at once.
+    """
+    remaining = sorted(fingerprints, key=lambda fp: clusters[fp].representative)
+    while len(remaining) > 1:
+        leader, *others = remaining
+        stacked = np.stack([boxes[fingerprint] for fingerprint in others])
+        distance = np.abs(stacked - boxes[leader]).max(axis=(1, 2), initial=0.0)
+        close = distance <= tolerance
+        for fingerprint, merged in zip(others, close):
+            if merged:
+                clusters[leader].members.extend(clusters.pop(fingerprint).members)
+        clusters[leader].members.sort()
+        remaining = [fp for fp, merged in zip(others, close) if not merged]
+
+
+def map_suggestion(
+    suggestion: dict,
+    representative: dict,
+    member: dict,
+    representative_size: tuple[float, float],
+    member_size: tuple[float, float],
+    grid: float = DEFAULT_GRID,
+) -> dict:
+    """Apply the suggestion made for a cluster's representative to a member.
+
+    The sizes are the ``(width, height)`` of each slide. Shapes are paired in
+    the order :func:`cluster_layouts` compares them in, and each member shape
+    takes the suggested geometry of its counterpart, looked up by the
+    representative's ``shape_id`` and scaled by the ratio of the slide sizes.
+    Everything else, ids and text included, is the member's own.
+    """
+    _, representative_order, _ = _signature(representative, *representative_size, grid)
+    _, member_order, _ = _signature(member, *member_size, grid)
+    scale_x = member_size[0] / representative_size[0]
+    scale_y = member_size[1] / representative_size[1]
+    suggested = {shape["shape_id"]: shape for shape in suggestion["shapes"]}
+    shapes = [dict(shape) for shape in member["shapes"]]
+    for source, target in zip(representative_order, member_order):
+        revised = suggested.get(representative["shapes"][source]["shape_id"])
+        if revised is None:
+            continue
+        for key in GEOMETRY_KEYS:
+            if key in revised:
+                scale = scale_x if key in HORIZONTAL_KEYS else scale_y
+                shapes[target][key] = (
+                    revised[key] if scale == 1 else revised[key] * scale
+                )
+    return {**member, "shapes": shapes}
+
+
+def suggest_per_cluster(
+    slide_layouts: Sequence[dict],
+    slide_width: int | float | Sequence[int | float],
+    slide_height: int | float | Sequence[int | float],
+    suggest: Callable[[dict], dict | None],
+    tolerance: float = 0.0,
+    grid: float = DEFAULT_GRID,
+) -> list[dict | None]:
+    """Run `suggest` once per layout cluster and map the result to every member.
+
+    `suggest` takes a slide, typically prompting the LLM and parsing its
+    answer, and returns the revised slide or None. Returns one revised slide,
+    or None, per slide in `slide_layouts`.
+    """
+    count = len(slide_layouts)
+    widths = np.broadcast_to(np.asarray(slide_width, float), (count,))
+    heights = np.broadcast_to(np.asarray(slide_height, float), (count,))
+    revised: list[dict | None] = [None] * count
+    for cluster in cluster_layouts(
+        slide_layouts, slide_width, slide_height, tolerance=tolerance, grid=grid
+    ):
+        first = cluster.representative
+        suggestion = suggest(slide_layouts[first])
+        if suggestion is None:
+            continue
+        for index in cluster.members:
+            revised[index] = map_suggestion(
+                suggestion,
+                slide_layouts[first],
+                slide_layouts[index],
+                (float(widths[first]), float(heights[first])),
+                (float(widths[index]), float(heights[index])),
+                grid,
+            )
+    return revised
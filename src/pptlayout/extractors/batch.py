@@ -0,0 +1,304 @@
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import IO, Any, Callable, Iterable, Iterator
+
+from .cache import ExtractionCache
+from .run_extractors import EXTRACTOR_ENGINES, run_extractors
+
+# One cache connection per worker process, opened on first use
+_worker_caches: dict[str, ExtractionCache] = {}
+
+
+def iter_pptx_paths(source: str) -> Iterator[str]:
+    """Yield the decks to extract from a directory tree or a manifest file.
+
+    A manifest is a text file with one path per line; blank lines and lines
+    starting with ``#`` are skipped.
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for filename in sorted(files):
+                if filename.lower().endswith(".pptx") and not filename.startswith("~$"):
+                    yield os.path.join(root, filename)
+    elif os.path.isfile(source):
+        with open(source, encoding="utf-8") as manifest:
+            for line in manifest:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield line
+    else:
+        raise FileNotFoundError(f"File not found: {source}")
+
+
+def _worker_cache(cache_path: str | None) -> ExtractionCache | None:
+    if cache_path is None:
+        return None
+    if cache_path not in _worker_caches:
+        _worker_caches[cache_path] = ExtractionCache(cache_path)
+    return _worker_caches[cache_path]
+
+
+def extract_file(
+    pptx_path: str,
+    measurement_unit: str,
+    engine: str,
+    cache_path: str | None = None,
+) -> dict:
+    """Extract one deck into a result row; failures become error rows."""
+    start = time.perf_counter()
+    cache = _worker_cache(cache_path)
+    hits = cache.hits if cache is not None else 0
+    try:
+        result = run_extractors(pptx_path, measurement_unit, engine, cache)
+    except Exception as e:
+        return {
+            "path": pptx_path,
+            "status": "error",
+            "elapsed": time.perf_counter() - start,
+            "error": f"{type(e).__name__}: {e}",
+        }
+    return {
+        "path": pptx_path,
+        "status": "ok",
+        "elapsed": time.perf_counter() - start,
+        "cache_hit": cache is not None and cache.hits > hits,
+        "result": result,
+    }
+
+
+def _extract_chunk(
+    paths: list[str], measurement_unit: str, engine: str, cache_path: str | None
+) -> list:
+    return [extract_file(path, measurement_unit, engine, cache_path) for path in paths]
+
+
+def _chunked(paths: Iterable[str], chunk_size: int) -> Iterator[list[str]]:
+    chunk: list[str] = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ChunkedProcessPool:
+    """Run chunks of items over a process pool, isolating worker crashes.
+
+    `run_chunk` maps a chunk of items to result rows and `run_one` a single
+    item to its row; both must be picklable. At most two chunks per worker are
+    in flight. The items of chunks lost with a worker process that died are
+    retried one at a time on a separate single-worker pool, so that only an
+    item that kills a worker while running alone gets an error row, whose
+    ``path`` is given by `item_path`.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        run_chunk: Callable[[list], list[dict]],
+        run_one: Callable[[Any], dict],
+        item_path: Callable[[Any], str] = str,
+    ):
+        self._workers = workers
+        self._run_chunk = run_chunk
+        self._run_one = run_one
+        self._item_path = item_path
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._retry_executor: ProcessPoolExecutor | None = None
+        self._pending: dict[Future, list] = {}
+        self._retries: deque = deque()
+        self._retry: tuple[Future, Any] | None = None
+
+    def map(self, chunks: Iterator[list]) -> Iterator[dict]:
+        """Yield the rows of every chunk in completion order, then shut down."""
+        try:
+            while True:
+                self._submit_chunks(chunks)
+                self._submit_retry()
+                if not self._pending and self._retry is None:
+                    return
+                waiting = set(self._pending)
+                if self._retry is not None:
+                    waiting.add(self._retry[0])
+                done, _ = wait(waiting, return_when=FIRST_COMPLETED)
+                yield from self._retry_rows(done)
+                yield from self._chunk_rows(done)
+        finally:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            if self._retry_executor is not None:
+                self._retry_executor.shutdown(wait=True, cancel_futures=True)
+
+    def _submit_chunks(self, chunks: Iterator[list]) -> None:
+        while len(self._pending) < self._workers * 2:
+            chunk = next(chunks, None)
+            if chunk is None:
+                return
+            self._pending[self._executor.submit(self._run_chunk, chunk)] = chunk
+
+    def _submit_retry(self) -> None:
+        if self._retry is not None or not self._retries:
+            return
+        if self._retry_executor is None:
+            self._retry_executor = ProcessPoolExecutor(max_workers=1)
+        item = self._retries.popleft()
+        self._retry = (self._retry_executor.submit(self._run_one, item), item)
+
+    def _retry_rows(self, done: set[Future]) -> Iterator[dict]:
+        if self._retry is None or self._retry[0] not in done:
+            return
+        future, item = self._retry
+        self._retry = None
+        try:
+            yield future.result()
+        except BrokenProcessPool:
+            # The item ran alone, so it is the one killing its worker
+            yield {
+                "path": self._item_path(item),
+                "status": "error",
+                "elapsed": 0.0,
+                "error": "BrokenProcessPool: worker process died",
+            }
+            if self._retry_executor is not None:
+                self._retry_executor.shutdown(wait=False, cancel_futures=True)
+                self._retry_executor = None
+
+    def _chunk_rows(self, done: set[Future]) -> Iterator[dict]:
+        broken = False
+        for future in done:
+            chunk = self._pending.pop(future, None)
+            if chunk is None:
+                continue
+            try:
+                yield from future.result()
+            except BrokenProcessPool:
+                broken = True
+                self._retries.extend(chunk)
+        if broken:
+            self._recover()
+
+    def _recover(self) -> None:
+        # Every in-flight chunk is lost with the pool; isolate each item
+        for chunk in self._pending.values():
+            self._retries.extend(chunk)
+        self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = ProcessPoolExecutor(max_workers=self._workers)
+
+
+def run_batch(
+    paths: Iterable[str],
+    output: IO[str],
+    workers: int | None = None,
+    chunk_size: int = 16,
+    measurement_unit: str = "emu",
+    engine: str = "xml",
+    cache_path: str | None = None,
+) -> dict:
+    """Extract decks over a process pool, streaming one JSONL row per deck.
+
+    Rows are written as soon as their chunk completes, so output order follows
+    completion order. A deck that kills its worker process is recorded as an
+    error row without failing the other decks (see :class:`ChunkedProcessPool`).
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    pool = ChunkedProcessPool(
+        workers or os.cpu_count() or 1,
+        partial(
+            _extract_chunk,
+            measurement_unit=measurement_unit,
+            engine=engine,
+            cache_path=cache_path,
+        ),
+        partial(
+            extract_file,
+            measurement_unit=measurement_unit,
+            engine=engine,
+            cache_path=cache_path,
+        ),
+    )
+    summary = {"files": 0, "errors": 0, "elapsed": 0.0}
+    start = time.perf_counter()
+    for row in pool.map(_chunked(paths, chunk_size)):
+        output.write(json.dumps(row) + "\n")
+        output.flush()
+        summary["files"] += 1
+        summary["errors"] += row["status"] == "error"
+    summary["elapsed"] = time.perf_counter() - start
+    return summary
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="pptlayout-extract",
+        description="Extract slide layouts from many .pptx files into JSONL.",
+    )
+    parser.add_argument(
+        "source", help="directory to scan for .pptx files, or a manifest file"
+    )
+    parser.add_argument(
+        "-o", "--output", default="-", help="JSONL output path (default: stdout)"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunk-size",
+        type=int,
+        default=16,
+        help="decks sent to a worker per task (default: 16)",
+    )
+    parser.add_argument(
+        "-u",
+        "--measurement-unit",
+        default="emu",
+        choices=["emu", "pt", "cm", "inches"],
+    )
+    parser.add_argument("-e", "--engine", default="xml", choices=EXTRACTOR_ENGINES)
+    parser.add_argument(
+        "--cache", default=None, help="SQLite extraction cache shared by the workers"
+    )
+    args = parser.parse_args(argv)
+
+    output_context = (
+        contextlib.nullcontext(sys.stdout)
+        if args.output == "-"
+        else open(args.output, "w", encoding="utf-8")
+    )
+    with output_context as output:
+        summary = run_batch(
+            iter_pptx_paths(args.source),
+            output,
+            args.workers,
+            args.chunk_size,
+            args.measurement_unit,
+            args.engine,
+            args.cache,
+        )
+    rate = summary["files"] / summary["elapsed"] if summary["elapsed"] else 0.0
+    print(
+        f"Extracted {summary['files']} files ({summary['errors']} errors) "
+        f"in {summary['elapsed']:.1f}s, {rate:.1f} files/s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
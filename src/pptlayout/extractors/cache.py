@@ -0,0 +1,67 @@
+import json
+import zlib
+
+from pptlayout.cache import (  # noqa: F401 (hash_file is re-exported)
+    CacheStats,
+    SQLiteCache,
+    hash_file,
+)
+from pptlayout.utils import convert_ppt
+
+# Bump whenever a change to the extractors changes their output, so that
+# entries written by older code are never served.
+EXTRACTOR_SCHEMA_VERSION = "3"
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+
+def _entry_key(content_hash: str, engine: str) -> str:
+    return f"{engine}:{content_hash}"
+
+
+class ExtractionCache:
+    """On-disk cache of :func:`run_extractors` results.
+
+    Entries are keyed by the deck's content hash and the extractor engine, and
+    versioned by :data:`EXTRACTOR_SCHEMA_VERSION`. A renamed or copied deck
+    still hits; an edited one, or one extracted with the other engine, misses. Extractions are stored in EMU and converted on the way
+    out, so one entry serves every measurement unit.
+    """
+
+    def __init__(self, path: str, max_bytes: int | None = DEFAULT_MAX_BYTES):
+        self._store = SQLiteCache(path, EXTRACTOR_SCHEMA_VERSION, max_bytes)
+
+    def close(self) -> None:
+        self._store.close()
+
+    def __enter__(self) -> "ExtractionCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def hits(self) -> int:
+        return self._store.hits
+
+    def get(
+        self, content_hash: str, engine: str, measurement_unit: str = "emu"
+    ) -> dict | None:
+        value = self._store.get(_entry_key(content_hash, engine))
+        if value is None:
+            return None
+        data = json.loads(zlib.decompress(value))
+        if measurement_unit == "emu":
+            return data
+        return convert_ppt(data, measurement_unit)
+
+    def put(self, content_hash: str, engine: str, data: dict) -> None:
+        """Store an extraction made with ``measurement_unit="emu"``."""
+        value = zlib.compress(json.dumps(data, separators=(",", ":")).encode())
+        self._store.put(_entry_key(content_hash, engine), value)
+
+    def invalidate(self) -> None:
+        self._store.invalidate()
+
+    def stats(self) -> CacheStats:
+        return self._store.stats()
@@ -0,0 +1,271 @@
+import uuid
+import zlib
+from collections.abc import Iterable
+
+from pptlayout.utils import GEOMETRY_KEYS
+
+DEFAULT_NUM_BUCKETS = 16
+
+# Shape-level columns, in table order. Keys of the extracted dicts that are not
+# listed here are not exported.
+SLIDE_COLUMNS = ("deck_id", "slide_index", "slide_id", "slide_name")
+SHAPE_COLUMNS = (
+    "shape_index",
+    "shape_id",
+    "group_id",
+    "name",
+    "shape_type",
+    "placeholder_type",
+    "auto_shape_type",
+    "measurement_unit",
+    *GEOMETRY_KEYS,
+    "has_chart",
+    "has_table",
+    "text",
+    "text_length",
+)
+DECK_COLUMNS = ("slide_width", "slide_height")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as error:
+        raise ImportError(
+            "Columnar export requires pyarrow: pip install pptlayout[parquet]"
+        ) from error
+    return pa, ds
+
+
+def deck_bucket(deck_id: str, num_buckets: int = DEFAULT_NUM_BUCKETS) -> int:
+    """Return the partition a deck is written to (stable across processes)."""
+    return zlib.crc32(deck_id.encode()) % num_buckets
+
+
+def _schema(pa):
+    geometry = [(key, pa.float64()) for key in GEOMETRY_KEYS]
+    return pa.schema(
+        [
+            ("deck_id", pa.string()),
+            ("slide_index", pa.int32()),
+            ("slide_id", pa.int64()),
+            ("slide_name", pa.string()),
+            ("shape_index", pa.int32()),
+            ("shape_id", pa.int64()),
+            ("group_id", pa.int64()),
+            ("name", pa.string()),
+            ("shape_type", pa.dictionary(pa.int8(), pa.string())),
+            ("placeholder_type", pa.dictionary(pa.int8(), pa.string())),
+            ("auto_shape_type", pa.dictionary(pa.int16(), pa.string())),
+            ("measurement_unit", pa.dictionary(pa.int8(), pa.string())),
+            *geometry,
+            ("has_chart", pa.bool_()),
+            ("has_table", pa.bool_()),
+            ("text", pa.string()),
+            ("text_length", pa.int32()),
+            ("slide_width", pa.float64()),
+            ("slide_height", pa.float64()),
+            ("bucket", pa.int32()),
+        ]
+    )
+
+
+def _deck_rows(ppt_data: dict) -> int:
+    # A slide without shapes, and a deck without slides, still take a row
+    return sum(max(len(slide["shapes"]), 1) for slide in ppt_data["slides"]) or 1
+
+
+def flatten_ppt(
+    ppt_data: dict, deck_id: str, num_buckets: int = DEFAULT_NUM_BUCKETS
+) -> dict[str, list]:
+    """Flatten an ``extract_ppt`` result into one row per shape, column-wise.
+
+    A slide without shapes gets a single row with null shape columns, and a
+    deck without slides a single row with null slide columns as well, so that
+    :meth:`ParquetLayoutReader.read_deck` rebuilds them.
+    """
+    columns: dict[str, list] = {
+        key: [] for key in (*SLIDE_COLUMNS, *SHAPE_COLUMNS, *DECK_COLUMNS, "bucket")
+    }
+    bucket = deck_bucket(deck_id, num_buckets)
+
+    def add_row(slide_index, slide, shape_index, shape) -> None:
+        text = shape.get("text")
+        columns["deck_id"].append(deck_id)
+        columns["slide_index"].append(slide_index)
+        columns["slide_id"].append(slide.get("slide_id"))
+        columns["slide_name"].append(slide.get("slide_name"))
+        columns["shape_index"].append(shape_index)
+        for key in SHAPE_COLUMNS[1:-1]:
+            columns[key].append(shape.get(key))
+        columns["text_length"].append(None if text is None else len(text))
+        columns["slide_width"].append(ppt_data["slide_width"])
+        columns["slide_height"].append(ppt_data["slide_height"])
+        columns["bucket"].append(bucket)
+
+    for slide_index, slide in enumerate(ppt_data["slides"]):
+        for shape_index, shape in enumerate(slide["shapes"]):
+            add_row(slide_index, slide, shape_index, shape)
+        if not slide["shapes"]:
+            add_row(slide_index, slide, None, {})
+    if not ppt_data["slides"]:
+        add_row(None, {}, None, {})
+    return columns
+
+
+def to_arrow_table(
+    decks: Iterable[tuple[str, dict]], num_buckets: int = DEFAULT_NUM_BUCKETS
+):
+    """Build a ``pyarrow.Table`` from ``(deck_id, extract_ppt result)`` pairs."""
+    pa, _ = _require_pyarrow()
+    schema = _schema(pa)
+    columns: dict[str, list] = {name: [] for name in schema.names}
+    for deck_id, ppt_data in decks:
+        for key, values in flatten_ppt(ppt_data, deck_id, num_buckets).items():
+            columns[key].extend(values)
+    return pa.Table.from_pydict(columns, schema=schema)
+
+
+def write_parquet(
+    decks: Iterable[tuple[str, dict]],
+    root: str,
+    num_buckets: int = DEFAULT_NUM_BUCKETS,
+    max_rows_per_batch: int = 1 << 16,
+) -> int:
+    """Write decks as a Parquet dataset partitioned by ``bucket=<n>``.
+
+    Decks are hashed into `num_buckets` partitions by their id, so all rows of
+    a deck live in the same partition. Decks are buffered until
+    `max_rows_per_batch` rows are pending, so arbitrarily many decks can be
+    written from a generator. Files are named uniquely per call, so several
+    calls can add decks to the same `root`. Returns the number of rows
+    written.
+    """
+    pa, ds = _require_pyarrow()
+    partitioning = ds.partitioning(pa.schema([("bucket", pa.int32())]), flavor="hive")
+    write_id = uuid.uuid4().hex
+    rows = 0
+    part = 0
+    pending: list[tuple[str, dict]] = []
+    pending_rows = 0
+
+    def flush():
+        nonlocal part
+        table = to_arrow_table(pending, num_buckets)
+        ds.write_dataset(
+            table,
+            root,
+            format="parquet",
+            partitioning=partitioning,
+            basename_template=f"part-{write_id}-{part}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        part += 1
+        pending.clear()
+
+    for deck_id, ppt_data in decks:
+        pending.append((deck_id, ppt_data))
+        deck_rows = _deck_rows(ppt_data)
+        pending_rows += deck_rows
+        rows += deck_rows
+        if pending_rows >= max_rows_per_batch:
+            flush()
+            pending_rows = 0
+    if pending or part == 0:
+        flush()
+    return rows
+
+
+class ParquetLayoutReader:
+    """Query a dataset written by :func:`write_parquet`.
+
+    :meth:`table` exposes the flat shape table for analytics, where the rows
+    of empty slides have a null ``shape_index``; :meth:`read_deck` and
+    :meth:`read_slide` rebuild the nested ``extract_ppt`` dicts for the
+    requested deck only, reading just its partition.
+    """
+
+    def __init__(self, root: str, num_buckets: int = DEFAULT_NUM_BUCKETS):
+        pa, ds = _require_pyarrow()
+        self._ds = ds
+        self._num_buckets = num_buckets
+        self._dataset = ds.dataset(
+            root,
+            format="parquet",
+            partitioning=ds.partitioning(
+                pa.schema([("bucket", pa.int32())]), flavor="hive"
+            ),
+        )
+
+    def table(self, columns: list[str] | None = None, filter=None):
+        return self._dataset.to_table(columns=columns, filter=filter)
+
+    def deck_ids(self) -> list[str]:
+        deck_ids = self.table(columns=["deck_id"]).column("deck_id").unique()
+        return sorted(deck_ids.to_pylist())
+
+    def _deck_filter(self, deck_id: str):
+        field = self._ds.field
+        bucket = deck_bucket(deck_id, self._num_buckets)
+        return (field("bucket") == bucket) & (field("deck_id") == deck_id)
+
+    def _slides(self, rows: list[dict]) -> list[dict]:
+        rows = [row for row in rows if row["slide_index"] is not None]
+        rows.sort(key=lambda row: (row["slide_index"], row["shape_index"] or 0))
+        slides: list[dict] = []
+        for row in rows:
+            if not slides or slides[-1]["slide_id"] != row["slide_id"]:
+                slides.append(
+                    {
+                        "slide_id": row["slide_id"],
+                        "slide_name": row["slide_name"],
+                        "shapes": [],
+                    }
+                )
+            if row["shape_index"] is not None:
+                slides[-1]["shapes"].append(self._shape(row))
+        return slides
+
+    def read_deck(self, deck_id: str) -> dict:
+        rows = self.table(filter=self._deck_filter(deck_id)).to_pylist()
+        if not rows:
+            raise KeyError(deck_id)
+        slides = self._slides(rows)
+        # Rows of empty slides carry no unit
+        unit = next(
+            (row["measurement_unit"] for row in rows if row["measurement_unit"]), None
+        )
+        return {
+            "slide_width": self._length(rows[0]["slide_width"], unit),
+            "slide_height": self._length(rows[0]["slide_height"], unit),
+            "slides": slides,
+        }
+
+    def read_slide(self, deck_id: str, slide_id: int) -> dict:
+        slide_filter = self._deck_filter(deck_id) & (
+            self._ds.field("slide_id") == slide_id
+        )
+        rows = self.table(filter=slide_filter).to_pylist()
+        if not rows:
+            raise KeyError(slide_id)
+        return self._slides(rows)[0]
+
+    @staticmethod
+    def _length(
+        value: float | None, measurement_unit: str | None
+    ) -> int | float | None:
+        if value is not None and measurement_unit == "emu":
+            return int(value)
+        return value
+
+    def _shape(self, row: dict) -> dict:
+        shape = {}
+        for key in SHAPE_COLUMNS[1:-1]:
+            value = row[key]
+            if value is None:
+                continue
+            if key in GEOMETRY_KEYS:
+                value = self._length(value, row["measurement_unit"])
+            shape[key] = value
+        return shape
@@ -7,6 +7,7 @@ from pptx.shapes.connector import Connector
 from pptx.shapes.graphfrm import GraphicFrame
 from pptx.shapes.group import GroupShape
 from pptx.shapes.picture import Movie, Picture
+from pptx.shapes.shapetree import GroupShapes
 
 from .shape_extractors import (
     BaseAutoShapeExtractor,
@@ -64,10 +65,44 @@ SHAPE_EXTRACTOR_MAP = {
 DEFAULT_EXTRACTOR = BaseShapeExtractor
 
 
+def shape_extractor_class(shape: Shape) -> type[ShapeExtractor]:
+    return SHAPE_EXTRACTOR_MAP.get(shape.shape_type, DEFAULT_EXTRACTOR)
+
+
 def shape_extractor_factory(
     shape: Shape, measurement_unit: str = "pt"
 ) -> ShapeExtractor:
     """Factory function to create a shape extractor based on the shape type."""
-    shape_type = shape.shape_type
-    extractor = SHAPE_EXTRACTOR_MAP.get(shape_type, DEFAULT_EXTRACTOR)
+    extractor = shape_extractor_class(shape)
     return extractor(shape, measurement_unit)
+
+
+class ShapeExtractorPool:
+    """Hands out one extractor per extractor class, re-pointed at each shape.
+
+    Extracting a slide this way allocates a handful of extractors instead of
+    one per shape.
+    """
+
+    def __init__(self, measurement_unit: str = "pt"):
+        self._measurement_unit = measurement_unit
+        self._extractors: dict[type, ShapeExtractor] = {}
+
+    def get(self, shape: Shape) -> ShapeExtractor:
+        extractor_class = shape_extractor_class(shape)
+        extractor = self._extractors.get(extractor_class)
+        if extractor is None:
+            extractor = extractor_class(shape, self._measurement_unit)
+            self._extractors[extractor_class] = extractor
+        else:
+            extractor.set_shape(shape)
+        return extractor
+
+    def group_children(self, shape: Shape) -> tuple[GroupShapes, list] | None:
+        """Return a group's members and child space, or None for other shapes."""
+        if not isinstance(shape, GroupShape):
+            return None
+        extractor = self.get(shape)
+        if not isinstance(extractor, GroupShapeExtractor):
+            return None
+        return shape.shapes, extractor.extract_child_geometry()
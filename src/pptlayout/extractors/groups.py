@@ -0,0 +1,107 @@
+from collections.abc import Callable, Iterable
+from typing import Any
+
+# (scale_x, offset_x, scale_y, offset_y): maps a group's child coordinates to
+# slide coordinates as `offset + scale * value`
+GroupTransform = tuple[float, float, float, float]
+
+IDENTITY: GroupTransform = (1.0, 0.0, 1.0, 0.0)
+
+X_KEYS = ("left", "begin_x", "end_x")
+Y_KEYS = ("top", "begin_y", "end_y")
+
+# Returns the children of a group shape and its [chOff.x, chOff.y, chExt.cx,
+# chExt.cy], or None if the shape is not a group
+GroupChildren = Callable[[Any], tuple[Iterable, list] | None]
+
+
+def child_transform(
+    parent: GroupTransform, geometry: list, child_geometry: list
+) -> GroupTransform:
+    """Compose `parent` with the transform of a group's own child space.
+
+    `geometry` is the group's raw [left, top, width, height] and
+    `child_geometry` its [chOff.x, chOff.y, chExt.cx, chExt.cy], all in EMU.
+    A group without a child space is treated as identity.
+    """
+    left, top, width, height = geometry
+    ch_x, ch_y, ch_cx, ch_cy = child_geometry
+    if None in (left, top, ch_x, ch_y):
+        return parent
+    scale_x = width / ch_cx if ch_cx and width is not None else 1.0
+    scale_y = height / ch_cy if ch_cy and height is not None else 1.0
+    parent_scale_x, parent_offset_x, parent_scale_y, parent_offset_y = parent
+    return (
+        parent_scale_x * scale_x,
+        parent_offset_x + parent_scale_x * (left - ch_x * scale_x),
+        parent_scale_y * scale_y,
+        parent_offset_y + parent_scale_y * (top - ch_y * scale_y),
+    )
+
+
+def apply_transform(shape_data: dict, transform: GroupTransform) -> dict:
+    """Map the raw EMU lengths of `shape_data` to slide coordinates in place.
+
+    Group rotation and flips are not applied.
+    """
+    if transform == IDENTITY:
+        return shape_data
+    scale_x, offset_x, scale_y, offset_y = transform
+    for key in X_KEYS:
+        if shape_data.get(key) is not None:
+            shape_data[key] = round(offset_x + scale_x * shape_data[key])
+    for key in Y_KEYS:
+        if shape_data.get(key) is not None:
+            shape_data[key] = round(offset_y + scale_y * shape_data[key])
+    if shape_data.get("width") is not None:
+        shape_data["width"] = round(scale_x * shape_data["width"])
+    if shape_data.get("height") is not None:
+        shape_data["height"] = round(scale_y * shape_data["height"])
+    return shape_data
+
+
+def flatten_groups(
+    shapes: Iterable,
+    extract_raw_shape: Callable[[Any], dict],
+    group_children: GroupChildren,
+    transform: GroupTransform = IDENTITY,
+    group_id: int | None = None,
+) -> list[dict]:
+    """Extract `shapes` and, depth first, every shape nested in their groups.
+
+    Shapes come out in document order, each group followed by its members.
+    Members carry the ``group_id`` of their innermost group and coordinates
+    in slide space. The traversal keeps an explicit stack, so arbitrarily deep
+    nesting does not recurse.
+    """
+    flat: list[dict] = []
+    stack = [(iter(shapes), transform, group_id)]
+    while stack:
+        children, transform, group_id = stack[-1]
+        shape = next(children, None)
+        if shape is None:
+            stack.pop()
+            continue
+        shape_data = extract_raw_shape(shape)
+        geometry = [
+            shape_data.get("left"),
+            shape_data.get("top"),
+            shape_data.get("width"),
+            shape_data.get("height"),
+        ]
+        apply_transform(shape_data, transform)
+        if group_id is not None:
+            shape_data["group_id"] = group_id
+        flat.append(shape_data)
+
+        group = group_children(shape)
+        if group is not None:
+            members, child_geometry = group
+            stack.append(
+                (
+                    iter(members),
+                    child_transform(transform, geometry, child_geometry),
+                    shape_data["shape_id"],
+                )
+            )
+    return flat
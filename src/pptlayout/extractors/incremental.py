@@ -0,0 +1,261 @@
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+
+from pptlayout.utils import convert_ppt, convert_shapes
+
+from .cache import EXTRACTOR_SCHEMA_VERSION
+from .opc import RT_SLIDE_LAYOUT, RT_SLIDE_MASTER, PptxPackage
+from .run_extractors import EXTRACTOR_ENGINES
+
+
+@dataclass
+class ShapeDiff:
+    """Shapes of a slide added, removed or modified since the last extraction.
+
+    Shapes are matched by ``shape_id``; a modified shape is given as a
+    ``{"shape_id", "before", "after"}`` dict.
+    """
+
+    added: list[dict] = field(default_factory=list)
+    removed: list[dict] = field(default_factory=list)
+    modified: list[dict] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+    def to_dict(self) -> dict:
+        return {
+            "added": self.added,
+            "removed": self.removed,
+            "modified": self.modified,
+        }
+
+
+@dataclass
+class IncrementalExtraction:
+    """Result of :func:`extract_incremental`.
+
+    ``ppt_data`` is the whole deck, as :func:`run_extractors` returns it.
+    Slides are listed by id: ``added`` ones are new, ``modified`` ones extract
+    differently than before, ``unchanged`` ones extract as before and
+    ``removed`` ones are no longer in the deck. ``diffs`` holds the shape diff
+    of every added, modified or removed slide.
+    """
+
+    ppt_data: dict
+    added: list[int] = field(default_factory=list)
+    modified: list[int] = field(default_factory=list)
+    removed: list[int] = field(default_factory=list)
+    unchanged: list[int] = field(default_factory=list)
+    diffs: dict[int, ShapeDiff] = field(default_factory=dict)
+
+    @property
+    def changed_slides(self) -> list[dict]:
+        """The added and modified slides, in deck order, for downstream stages."""
+        changed = set(self.added) | set(self.modified)
+        return [
+            slide for slide in self.ppt_data["slides"] if slide["slide_id"] in changed
+        ]
+
+
+def _part_digest(package: PptxPackage, partname: str, digests: dict) -> str:
+    digest = digests.get(partname)
+    if digest is None:
+        digest = digests[partname] = hashlib.sha256(
+            package.read_part(partname)
+        ).hexdigest()
+    return digest
+
+
+def slide_fingerprints(package: PptxPackage) -> dict[int, str]:
+    """Return a digest of the XML behind each slide, keyed by slide id.
+
+    The digest covers the slide part and the layout and master it inherits
+    placeholder geometry from, so editing a layout changes the fingerprint
+    of every slide using it. Each layout and master is hashed once.
+    """
+    digests: dict[str, str] = {}
+    fingerprints = {}
+    for slide_id, slide_partname in package.slide_refs():
+        layout_partname = package.related_partname(slide_partname, RT_SLIDE_LAYOUT)
+        master_partname = layout_partname and package.related_partname(
+            layout_partname, RT_SLIDE_MASTER
+        )
+        fingerprint = hashlib.sha256()
+        for partname in (slide_partname, layout_partname, master_partname):
+            if partname is not None:
+                digest = _part_digest(package, partname, digests)
+                fingerprint.update(f"{partname}:{digest};".encode())
+        fingerprints[slide_id] = fingerprint.hexdigest()
+    return fingerprints
+
+
+def diff_shapes(before: list[dict], after: list[dict]) -> ShapeDiff:
+    """Compare two extractions of a slide shape by shape, matching ``shape_id``."""
+    old = {shape["shape_id"]: shape for shape in before}
+    new = {shape["shape_id"]: shape for shape in after}
+    return ShapeDiff(
+        added=[shape for shape_id, shape in new.items() if shape_id not in old],
+        removed=[shape for shape_id, shape in old.items() if shape_id not in new],
+        modified=[
+            {"shape_id": shape_id, "before": old[shape_id], "after": shape}
+            for shape_id, shape in new.items()
+            if shape_id in old and old[shape_id] != shape
+        ],
+    )
+
+
+def load_manifest(manifest_path: str, engine: str) -> dict:
+    """Return the slides stored in a manifest, or an empty one.
+
+    A missing manifest, or one written by another engine or extractor schema
+    version, is treated as empty so that every slide is extracted again.
+    """
+    empty = {"schema": EXTRACTOR_SCHEMA_VERSION, "engine": engine, "slides": {}}
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return empty
+    if (manifest.get("schema"), manifest.get("engine")) != (
+        EXTRACTOR_SCHEMA_VERSION,
+        engine,
+    ):
+        return empty
+    # JSON object keys are strings
+    manifest["slides"] = {
+        int(slide_id): entry for slide_id, entry in manifest["slides"].items()
+    }
+    return manifest
+
+
+def save_manifest(manifest: dict, manifest_path: str) -> None:
+    manifest_dir = os.path.dirname(os.path.abspath(manifest_path))
+    # Write next to the manifest and rename, so a crash never truncates it
+    fd, temp_path = tempfile.mkstemp(suffix=".json", dir=manifest_dir)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, separators=(",", ":"))
+        os.replace(temp_path, manifest_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _extract_slides(
+    pptx_path: str, package: PptxPackage, slide_ids: set[int], engine: str
+) -> list[dict]:
+    if not slide_ids:
+        return []
+    if engine == "xml":
+        from .xml_extractor import XmlPowerPointShapeExtractor
+
+        return XmlPowerPointShapeExtractor(package, "emu").extract_slides(
+            slide_ids=slide_ids
+        )
+    from pptx import Presentation
+
+    from .ppt_extractor import PowerPointShapeExtractor
+
+    return PowerPointShapeExtractor(Presentation(pptx_path), "emu").extract_slides(
+        slide_ids=slide_ids
+    )
+
+
+def _converted(diff: ShapeDiff, measurement_unit: str) -> ShapeDiff:
+    if measurement_unit == "emu":
+        return diff
+
+    def convert(shapes: list[dict]) -> list[dict]:
+        return convert_shapes([dict(shape) for shape in shapes], measurement_unit)
+
+    befores = convert([change["before"] for change in diff.modified])
+    afters = convert([change["after"] for change in diff.modified])
+    return ShapeDiff(
+        added=convert(diff.added),
+        removed=convert(diff.removed),
+        modified=[
+            {"shape_id": change["shape_id"], "before": before, "after": after}
+            for change, before, after in zip(diff.modified, befores, afters)
+        ],
+    )
+
+
+def extract_incremental(
+    pptx_path: str,
+    manifest_path: str,
+    measurement_unit: str = "emu",
+    engine: str = "xml",
+) -> IncrementalExtraction:
+    """Extract a deck again, re-reading only the slides whose XML changed.
+
+    Each slide is fingerprinted with :func:`slide_fingerprints` and compared
+    with the manifest written by the previous call for this deck; only new
+    slides and slides with another fingerprint are extracted, the others are
+    taken from the manifest. A slide whose XML changed without changing its
+    extraction, e.g. a recolored shape, counts as unchanged. The manifest is
+    then updated in place. Slides are stored in EMU, so the result can be
+    asked for in any unit.
+    """
+    if engine not in EXTRACTOR_ENGINES:
+        raise ValueError(f"Invalid extractor engine: {engine}")
+    manifest = load_manifest(manifest_path, engine)
+    stored = manifest["slides"]
+    with PptxPackage(pptx_path) as package:
+        fingerprints = slide_fingerprints(package)
+        slide_width, slide_height = package.slide_size()
+        stale = {
+            slide_id
+            for slide_id, fingerprint in fingerprints.items()
+            if stored.get(slide_id, {}).get("fingerprint") != fingerprint
+        }
+        extracted = {
+            slide["slide_id"]: slide
+            for slide in _extract_slides(pptx_path, package, stale, engine)
+        }
+
+    result = IncrementalExtraction(ppt_data={})
+    slides = []
+    for slide_id in fingerprints:
+        before = stored.get(slide_id)
+        slide = extracted.get(slide_id) or before["slide"]
+        slides.append(slide)
+        if before is None:
+            result.added.append(slide_id)
+            diff = diff_shapes([], slide["shapes"])
+        elif before["slide"] != slide:
+            result.modified.append(slide_id)
+            diff = diff_shapes(before["slide"]["shapes"], slide["shapes"])
+        else:
+            result.unchanged.append(slide_id)
+            continue
+        result.diffs[slide_id] = _converted(diff, measurement_unit)
+    for slide_id, entry in stored.items():
+        if slide_id not in fingerprints:
+            result.removed.append(slide_id)
+            diff = diff_shapes(entry["slide"]["shapes"], [])
+            result.diffs[slide_id] = _converted(diff, measurement_unit)
+
+    save_manifest(
+        {
+            "schema": EXTRACTOR_SCHEMA_VERSION,
+            "engine": engine,
+            "slides": {
+                slide["slide_id"]: {
+                    "fingerprint": fingerprints[slide["slide_id"]],
+                    "slide": slide,
+                }
+                for slide in slides
+            },
+        },
+        manifest_path,
+    )
+    ppt_data: dict = {"slide_width": slide_width, "slide_height": slide_height}
+    ppt_data["slides"] = slides
+    if measurement_unit != "emu":
+        ppt_data = convert_ppt(ppt_data, measurement_unit)
+    result.ppt_data = ppt_data
+    return result
@@ -0,0 +1,75 @@
+from collections.abc import Sequence
+from typing import Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class LazySlides(Sequence[T]):
+    """Sequence of slides (dicts or records) extracting each on first access.
+
+    Supports ``len()``, positional indexing (including slices) and iteration.
+    Use :meth:`by_slide_id` to look a slide up by its ``slide_id``. Extracted
+    slides are memoized, so repeated access is free.
+
+    The sequence may own the file the slides are read from (see
+    :meth:`close_with`). :meth:`close` releases it, as does leaving a ``with``
+    block; slides extracted before that stay available, the others raise
+    ``ValueError``.
+    """
+
+    def __init__(self, slide_ids: list[int], extract_slide: Callable[[int], T]):
+        self._slide_ids = slide_ids
+        self._extract_slide = extract_slide
+        self._positions = {slide_id: idx for idx, slide_id in enumerate(slide_ids)}
+        self._slides: list[T | None] = [None] * len(slide_ids)
+        self._resources: list = []
+        self._closed = False
+
+    def close_with(self, resource) -> None:
+        """Close `resource` (anything with a ``close()`` method) in :meth:`close`."""
+        self._resources.append(resource)
+
+    def close(self) -> None:
+        self._closed = True
+        while self._resources:
+            self._resources.pop().close()
+
+    def __enter__(self) -> "LazySlides":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._slide_ids)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self[idx] for idx in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("slide index out of range")
+        slide = self._slides[index]
+        if slide is None:
+            if self._closed:
+                raise ValueError("Slides cannot be extracted after close()")
+            slide = self._slides[index] = self._extract_slide(index)
+        return slide
+
+    def __iter__(self) -> Iterator[T]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+    @property
+    def slide_ids(self) -> list[int]:
+        return list(self._slide_ids)
+
+    def by_slide_id(self, slide_id: int) -> T:
+        if slide_id not in self._positions:
+            raise KeyError(f"Slide not found: {slide_id}")
+        return self[self._positions[slide_id]]
+
+    def extracted_count(self) -> int:
+        """Number of slides extracted so far."""
+        return sum(slide is not None for slide in self._slides)
@@ -0,0 +1,123 @@
+import posixpath
+import zipfile
+from typing import IO
+
+from lxml import etree
+
+NAMESPACES = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "pr": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+
+RT_OFFICE_DOCUMENT = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+)
+RT_SLIDE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide"
+RT_SLIDE_LAYOUT = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout"
+)
+RT_SLIDE_MASTER = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideMaster"
+)
+
+
+def qn(tag: str) -> str:
+    """Return the Clark-notation name of a namespace-prefixed tag, e.g. "p:sp"."""
+    prefix, local_name = tag.split(":")
+    return f"{{{NAMESPACES[prefix]}}}{local_name}"
+
+
+class PptxPackage:
+    """Read-only access to the parts of a .pptx file, without python-pptx."""
+
+    def __init__(self, pptx_path: str):
+        self._pptx_path = pptx_path
+        self._zip = zipfile.ZipFile(pptx_path)
+        self._rels: dict[str, dict[str, tuple[str, str]]] = {}
+        self._presentation: etree._Element | None = None
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def __enter__(self) -> "PptxPackage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def has_part(self, partname: str) -> bool:
+        try:
+            self._zip.getinfo(partname)
+        except KeyError:
+            return False
+        return True
+
+    def open_part(self, partname: str) -> IO[bytes]:
+        return self._zip.open(partname)
+
+    def read_part(self, partname: str) -> bytes:
+        return self._zip.read(partname)
+
+    def parse_part(self, partname: str) -> etree._Element:
+        return etree.fromstring(self.read_part(partname))
+
+    def part_rels(self, partname: str) -> dict[str, tuple[str, str]]:
+        """Map each relationship id of a part to its (reltype, target partname)."""
+        if partname not in self._rels:
+            self._rels[partname] = self._load_rels(partname)
+        return self._rels[partname]
+
+    def related_partname(self, partname: str, reltype: str) -> str | None:
+        for rel_type, target in self.part_rels(partname).values():
+            if rel_type == reltype:
+                return target
+        return None
+
+    def _load_rels(self, partname: str) -> dict[str, tuple[str, str]]:
+        base_dir, filename = posixpath.split(partname)
+        rels_partname = posixpath.join(base_dir, "_rels", f"{filename}.rels")
+        if not self.has_part(rels_partname):
+            return {}
+        rels = {}
+        for rel in self.parse_part(rels_partname).iterfind(
+            "pr:Relationship", NAMESPACES
+        ):
+            if rel.get("TargetMode") == "External":
+                continue
+            target = rel.get("Target", "")
+            if target.startswith("/"):
+                target_partname = target.lstrip("/")
+            else:
+                target_partname = posixpath.normpath(posixpath.join(base_dir, target))
+            rels[rel.get("Id")] = (rel.get("Type"), target_partname)
+        return rels
+
+    @property
+    def presentation_partname(self) -> str:
+        partname = self.related_partname("", RT_OFFICE_DOCUMENT)
+        if partname is None:
+            raise ValueError(f"Not a PowerPoint package: {self._pptx_path}")
+        return partname
+
+    @property
+    def presentation(self) -> etree._Element:
+        if self._presentation is None:
+            self._presentation = self.parse_part(self.presentation_partname)
+        return self._presentation
+
+    def slide_size(self) -> tuple[int | None, int | None]:
+        sld_sz = self.presentation.find("p:sldSz", NAMESPACES)
+        if sld_sz is None:
+            return None, None
+        return int(sld_sz.get("cx")), int(sld_sz.get("cy"))
+
+    def slide_refs(self) -> list[tuple[int, str]]:
+        """Return (slide_id, slide partname) for each slide, in presentation order."""
+        rels = self.part_rels(self.presentation_partname)
+        refs = []
+        for sld_id in self.presentation.iterfind("p:sldIdLst/p:sldId", NAMESPACES):
+            _, partname = rels[sld_id.get(qn("r:id"))]
+            refs.append((int(sld_id.get("id")), partname))
+        return refs
@@ -1,9 +1,14 @@
+from collections.abc import Collection, Sequence
+
 from pptx.presentation import Presentation
 from pptx.slide import Slide
 
-from pptlayout.utils import unit_conversion
+from pptlayout.utils import convert_shapes, unit_conversion
 
-from .factories import shape_extractor_factory
+from .factories import ShapeExtractorPool
+from .groups import flatten_groups
+from .lazy_slides import LazySlides
+from .records import PresentationRecord, SlideRecord, slide_record
 
 
 class SlideShapeExtractor:
@@ -18,20 +23,23 @@ class SlideShapeExtractor:
         }
 
     def extract_shapes(self) -> list:
-        shapes = []
-        for shape in self._slide.shapes:
-            shapes.append(self._extract_shape(shape))
-        return shapes
-
-    def _extract_shape(self, shape) -> dict:
-        extractor = shape_extractor_factory(shape, self._measurement_unit)
-        return extractor.extract_shape()
+        """Extract the slide's shapes, with the members of groups flattened in."""
+        extractors = ShapeExtractorPool(self._measurement_unit)
+        shapes = flatten_groups(
+            self._slide.shapes,
+            lambda shape: extractors.get(shape).extract_raw_shape(),
+            extractors.group_children,
+        )
+        return convert_shapes(shapes, self._measurement_unit)
 
     def extract_slide(self) -> dict:
         slide_data = self.extract_slide_metadate()
         slide_data["shapes"] = self.extract_shapes()
         return slide_data
 
+    def extract_slide_record(self) -> SlideRecord:
+        return slide_record(self.extract_slide(), self._measurement_unit)
+
 
 class PowerPointShapeExtractor:
     def __init__(self, ppt: Presentation, measurement_unit: str = "pt"):
@@ -50,15 +58,49 @@ class PowerPointShapeExtractor:
             "slide_height": self.extract_slide_height(),
         }
 
-    def extract_slides(self) -> list:
-        slides = []
+    def extract_slides(
+        self, records: bool = False, slide_ids: Collection[int] | None = None
+    ) -> list:
+        """Extract every slide, or only those in `slide_ids`, in deck order."""
+        slides: list = []
         for slide in self._ppt.slides:
+            if slide_ids is not None and slide.slide_id not in slide_ids:
+                continue
             slide_extractor = SlideShapeExtractor(slide, self._measurement_unit)
-            slides.append(slide_extractor.extract_slide())
+            if records:
+                slides.append(slide_extractor.extract_slide_record())
+            else:
+                slides.append(slide_extractor.extract_slide())
         return slides
 
-    def extract_ppt(self) -> dict:
-        return {
-            **self._extract_ppt_metadata(),
-            "slides": self.extract_slides(),
-        }
+    def extract_slides_lazy(self, records: bool = False) -> LazySlides:
+        slides = list(self._ppt.slides)
+        return LazySlides(
+            [slide.slide_id for slide in slides],
+            lambda idx: self._extract_slide(slides[idx], records),
+        )
+
+    def _extract_slide(self, slide: Slide, records: bool) -> dict | SlideRecord:
+        slide_extractor = SlideShapeExtractor(slide, self._measurement_unit)
+        if records:
+            return slide_extractor.extract_slide_record()
+        return slide_extractor.extract_slide()
+
+    def extract_ppt(
+        self, lazy: bool = False, records: bool = False
+    ) -> dict | PresentationRecord:
+        """Extract the deck as nested dicts, or as records with ``records=True``."""
+        slides: Sequence
+        if lazy:
+            slides = self.extract_slides_lazy(records)
+        else:
+            slides = self.extract_slides(records)
+        metadata = self._extract_ppt_metadata()
+        if records:
+            return PresentationRecord(
+                metadata["slide_width"],
+                metadata["slide_height"],
+                self._measurement_unit,
+                slides,
+            )
+        return {**metadata, "slides": slides}
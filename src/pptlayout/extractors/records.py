@@ -0,0 +1,189 @@
+import json
+import sys
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class ShapeRecord:
+    """Compact, typed form of an extracted shape dict.
+
+    Lengths are in the unit of the enclosing :class:`SlideRecord`, which is
+    stored once per slide instead of on every shape. Optional fields that are
+    ``None`` are left out of :meth:`to_dict`, matching the dicts produced by the
+    extractors. Records also support ``record["left"]`` and ``record.get()``
+    so dict consumers can read them directly.
+    """
+
+    name: str
+    shape_id: int
+    shape_type: str
+    height: int | float
+    width: int | float
+    left: int | float
+    top: int | float
+    text: str | None = None
+    auto_shape_type: str | None = None
+    has_chart: bool | None = None
+    has_table: bool | None = None
+    group_id: int | None = None
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            value = getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def _extra_items(self) -> Iterator[tuple[str, Any]]:
+        return iter(())
+
+    def to_dict(self, measurement_unit: str) -> dict:
+        shape_data = {
+            "name": self.name,
+            "shape_id": self.shape_id,
+            "shape_type": self.shape_type,
+            "measurement_unit": measurement_unit,
+            "height": self.height,
+            "width": self.width,
+            "left": self.left,
+            "top": self.top,
+        }
+        if self.text is not None:
+            shape_data["text"] = self.text
+        for key, value in self._extra_items():
+            shape_data[key] = value
+        if self.auto_shape_type is not None:
+            shape_data["auto_shape_type"] = self.auto_shape_type
+        if self.has_chart is not None:
+            shape_data["has_chart"] = self.has_chart
+            shape_data["has_table"] = self.has_table
+        if self.group_id is not None:
+            shape_data["group_id"] = self.group_id
+        return shape_data
+
+
+@dataclass(slots=True, kw_only=True)
+class PlaceholderRecord(ShapeRecord):
+    placeholder_type: str
+
+    def _extra_items(self) -> Iterator[tuple[str, Any]]:
+        yield "placeholder_type", self.placeholder_type
+
+
+@dataclass(slots=True, kw_only=True)
+class ConnectorRecord(ShapeRecord):
+    begin_x: int | float
+    begin_y: int | float
+    end_x: int | float
+    end_y: int | float
+
+    def _extra_items(self) -> Iterator[tuple[str, Any]]:
+        yield "begin_x", self.begin_x
+        yield "begin_y", self.begin_y
+        yield "end_x", self.end_x
+        yield "end_y", self.end_y
+
+
+@dataclass(slots=True)
+class SlideRecord:
+    slide_id: int
+    slide_name: str
+    measurement_unit: str
+    shapes: list[ShapeRecord] = field(default_factory=list)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def to_dict(self) -> dict:
+        return {
+            "slide_id": self.slide_id,
+            "slide_name": self.slide_name,
+            "shapes": [shape.to_dict(self.measurement_unit) for shape in self.shapes],
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+@dataclass(slots=True)
+class PresentationRecord:
+    slide_width: int | float
+    slide_height: int | float
+    measurement_unit: str
+    slides: Sequence[SlideRecord]
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def to_dict(self) -> dict:
+        return {
+            "slide_width": self.slide_width,
+            "slide_height": self.slide_height,
+            "slides": [slide.to_dict() for slide in self.slides],
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+def shape_record(shape_data: dict) -> ShapeRecord:
+    """Build the record matching an extracted shape dict."""
+    common = (
+        shape_data["name"],
+        shape_data["shape_id"],
+        sys.intern(shape_data["shape_type"]),
+        shape_data["height"],
+        shape_data["width"],
+        shape_data["left"],
+        shape_data["top"],
+        shape_data.get("text"),
+        shape_data.get("auto_shape_type"),
+        shape_data.get("has_chart"),
+        shape_data.get("has_table"),
+        shape_data.get("group_id"),
+    )
+    if "placeholder_type" in shape_data:
+        return PlaceholderRecord(
+            *common, placeholder_type=sys.intern(shape_data["placeholder_type"])
+        )
+    if "begin_x" in shape_data:
+        return ConnectorRecord(
+            *common,
+            begin_x=shape_data["begin_x"],
+            begin_y=shape_data["begin_y"],
+            end_x=shape_data["end_x"],
+            end_y=shape_data["end_y"],
+        )
+    return ShapeRecord(*common)
+
+
+def slide_record(slide_data: dict, measurement_unit: str) -> SlideRecord:
+    return SlideRecord(
+        slide_data["slide_id"],
+        slide_data["slide_name"],
+        measurement_unit,
+        [shape_record(shape) for shape in slide_data["shapes"]],
+    )
+
+
+def presentation_record(ppt_data: dict, measurement_unit: str) -> PresentationRecord:
+    return PresentationRecord(
+        ppt_data["slide_width"],
+        ppt_data["slide_height"],
+        measurement_unit,
+        [slide_record(slide, measurement_unit) for slide in ppt_data["slides"]],
+    )
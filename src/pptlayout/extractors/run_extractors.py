@@ -1,8 +1,16 @@
 import os
+from typing import Literal, overload
 
-from pptx import Presentation
+from pptlayout.cache import hash_file
+from pptlayout.utils import convert_ppt
 
-from .ppt_extractor import PowerPointShapeExtractor
+from .cache import ExtractionCache
+from .lazy_slides import LazySlides
+from .opc import PptxPackage
+from .records import PresentationRecord, presentation_record
+from .xml_extractor import XmlPowerPointShapeExtractor
+
+EXTRACTOR_ENGINES = ("pptx", "xml")
 
 # Replace with your actual PPTX file path
 # pptx_path = "/data/tianyuhu/PPTLayout/data/pptx/ZK7FNUZ33GBBCG7CFVYS56TQCTD72CJR.pptx"
@@ -12,12 +20,100 @@ from .ppt_extractor import PowerPointShapeExtractor
 # shape_extractor = PowerPointShapeExtractor(ppt)
 # extracted_info = shape_extractor.extract_ppt()
 # print(dumps(extracted_info, indent=4))
-def run_extractors(pptx_path: str, measurement_unit: str = "emu") -> dict:
+def run_extractors(
+    pptx_path: str,
+    measurement_unit: str = "emu",
+    engine: str = "pptx",
+    cache: ExtractionCache | None = None,
+    lazy: bool = False,
+    records: bool = False,
+) -> dict | PresentationRecord:
+    """Extract the layout of every slide in a deck.
+
+    With ``lazy=True`` the returned ``"slides"`` entry is a :class:`LazySlides`
+    sequence that only extracts the slides that are actually accessed. With
+    the xml engine it keeps the deck open until it is closed, so use it as a
+    context manager or call its ``close()`` once done. With
+    ``records=True`` a :class:`PresentationRecord` of slotted shape records is
+    returned instead of nested dicts.
+    """
     if not pptx_path:
         raise ValueError("pptx_path is required")
     if not os.path.exists(pptx_path):
         raise FileNotFoundError(f"File not found: {pptx_path}")
+    if engine not in EXTRACTOR_ENGINES:
+        raise ValueError(f"Invalid extractor engine: {engine}")
+    if lazy:
+        if cache is not None:
+            raise ValueError("Lazy extraction cannot be combined with a cache")
+        return _extract(pptx_path, measurement_unit, engine, lazy=True, records=records)
+    if cache is None:
+        return _extract(pptx_path, measurement_unit, engine, records=records)
+
+    content_hash = hash_file(pptx_path)
+    extracted_info = cache.get(content_hash, engine, measurement_unit)
+    if extracted_info is None:
+        extracted_info = _extract(pptx_path, "emu", engine)
+        cache.put(content_hash, engine, extracted_info)
+        if measurement_unit != "emu":
+            extracted_info = convert_ppt(extracted_info, measurement_unit)
+    if records:
+        return presentation_record(extracted_info, measurement_unit)
+    return extracted_info
+
+
+@overload
+def _extract(
+    pptx_path: str,
+    measurement_unit: str,
+    engine: str,
+    lazy: bool = False,
+    records: Literal[False] = False,
+) -> dict: ...
+
+
+@overload
+def _extract(
+    pptx_path: str,
+    measurement_unit: str,
+    engine: str,
+    lazy: bool = False,
+    records: bool = False,
+) -> dict | PresentationRecord: ...
+
+
+def _extract(
+    pptx_path: str,
+    measurement_unit: str,
+    engine: str,
+    lazy: bool = False,
+    records: bool = False,
+) -> dict | PresentationRecord:
+    if engine == "xml":
+        if lazy:
+            # The package stays open until the lazy slides are closed
+            package = PptxPackage(pptx_path)
+            try:
+                extracted_info = XmlPowerPointShapeExtractor(
+                    package, measurement_unit
+                ).extract_ppt(lazy=True, records=records)
+            except BaseException:
+                package.close()
+                raise
+            # Records support item access too
+            slides: LazySlides = extracted_info["slides"]
+            slides.close_with(package)
+            return extracted_info
+        with PptxPackage(pptx_path) as package:
+            return XmlPowerPointShapeExtractor(package, measurement_unit).extract_ppt(
+                records=records
+            )
+    # python-pptx is only loaded by the engine that needs it
+    from pptx import Presentation
+
+    from .ppt_extractor import PowerPointShapeExtractor
+
     ppt = Presentation(pptx_path)
     shape_extractor = PowerPointShapeExtractor(ppt, measurement_unit)
-    extracted_info = shape_extractor.extract_ppt()
+    extracted_info = shape_extractor.extract_ppt(lazy=lazy, records=records)
     return extracted_info
@@ -6,7 +6,9 @@ from pptx.shapes.graphfrm import GraphicFrame
 from pptx.shapes.group import GroupShape
 from pptx.shapes.picture import Movie, Picture
 
-from pptlayout.utils import unit_conversion
+from pptlayout.utils import convert_shapes, unit_conversion
+
+from .groups import IDENTITY, child_transform, flatten_groups
 
 
 class BaseShapeExtractor:
@@ -36,18 +38,25 @@ class BaseShapeExtractor:
     def set_measurement_unit(self, unit: str) -> None:
         self._measurement_unit = unit
 
-    def extract_shape(self) -> dict:
+    def set_shape(self, shape: BaseShape) -> None:
+        self._shape = shape
+
+    def extract_raw_shape(self) -> dict:
+        """Extract the shape with every length left in EMU."""
         return {
             "name": self._shape.name,
             "shape_id": self._shape.shape_id,
             "shape_type": self.extract_shape_type(),
-            "measurement_unit": self._measurement_unit,
-            "height": self.extract_height(),
-            "width": self.extract_width(),
-            "left": self.extract_left(),
-            "top": self.extract_top(),
+            "measurement_unit": "emu",
+            "height": self._shape.height,
+            "width": self._shape.width,
+            "left": self._shape.left,
+            "top": self._shape.top,
         }
 
+    def extract_shape(self) -> dict:
+        return convert_shapes([self.extract_raw_shape()], self._measurement_unit)[0]
+
 
 class BaseAutoShapeExtractor(BaseShapeExtractor):
     def __init__(self, shape: AutoShape, measurement_unit="pt"):
@@ -58,8 +67,8 @@ class BaseAutoShapeExtractor(BaseShapeExtractor):
             return self._shape.text  # type: ignore[attr-defined]
         raise AttributeError("Shape does not have a text frame")
 
-    def extract_shape(self) -> dict:
-        shape_data = super().extract_shape()
+    def extract_raw_shape(self) -> dict:
+        shape_data = super().extract_raw_shape()
         if self._shape.has_text_frame:
             shape_data["text"] = self.extract_text()
         return shape_data
@@ -84,8 +93,8 @@ class PlaceholderExtractor(BaseAutoShapeExtractor):
                 return placeholder_type.name
         raise AttributeError("Unknown placeholder format")
 
-    def extract_shape(self) -> dict:
-        shape_data = super().extract_shape()
+    def extract_raw_shape(self) -> dict:
+        shape_data = super().extract_raw_shape()
         shape_data["placeholder_type"] = self.extract_placeholder_format()
         return shape_data
 
@@ -111,12 +120,12 @@ class ConnectorExtractor(BaseShapeExtractor):
     def extract_end_y(self) -> int | float:
         return unit_conversion(self._shape.end_y, self._measurement_unit)  # type: ignore[attr-defined]
 
-    def extract_shape(self) -> dict:
-        shape_data = super().extract_shape()
-        shape_data["begin_x"] = self.extract_begin_x()
-        shape_data["begin_y"] = self.extract_begin_y()
-        shape_data["end_x"] = self.extract_end_x()
-        shape_data["end_y"] = self.extract_end_y()
+    def extract_raw_shape(self) -> dict:
+        shape_data = super().extract_raw_shape()
+        shape_data["begin_x"] = self._shape.begin_x  # type: ignore[attr-defined]
+        shape_data["begin_y"] = self._shape.begin_y  # type: ignore[attr-defined]
+        shape_data["end_x"] = self._shape.end_x  # type: ignore[attr-defined]
+        shape_data["end_y"] = self._shape.end_y  # type: ignore[attr-defined]
         return shape_data
 
 
@@ -137,8 +146,8 @@ class PictureExtractor(BaseShapeExtractor):
     #     blob = self._shape.image.blob  # type: ignore[attr-defined]
     #     return base64.b64encode(blob)
 
-    def extract_shape(self) -> dict:
-        shape_data = super().extract_shape()
+    def extract_raw_shape(self) -> dict:
+        shape_data = super().extract_raw_shape()
         if self.extract_auto_shape_type() is not None:
             shape_data["auto_shape_type"] = self.extract_auto_shape_type()
         # shape_data["blob_str"] = self._extract_blob_str()
@@ -154,8 +163,8 @@ class GraphicFrameExtractor(BaseShapeExtractor):
     def __init__(self, shape: GraphicFrame, measurement_unit: str = "pt"):
         super().__init__(shape, measurement_unit)
 
-    def extract_shape(self) -> dict:
-        shape_data = super().extract_shape()
+    def extract_raw_shape(self) -> dict:
+        shape_data = super().extract_raw_shape()
         shape_data["has_chart"] = self._shape.has_chart
         shape_data["has_table"] = self._shape.has_table
         return shape_data
@@ -165,16 +174,40 @@ class GroupShapeExtractor(BaseShapeExtractor):
     def __init__(self, shape: GroupShape, measurement_unit: str = "pt"):
         super().__init__(shape, measurement_unit)
 
+    def extract_child_geometry(self) -> list[int | None]:
+        """Return the group's child space as [chOff.x, chOff.y, chExt.cx, chExt.cy]."""
+        xfrm = "./p:grpSpPr/a:xfrm"
+        ch_off = self._shape._element.xpath(f"{xfrm}/a:chOff")
+        ch_ext = self._shape._element.xpath(f"{xfrm}/a:chExt")
+        return [
+            int(ch_off[0].get("x")) if ch_off else None,
+            int(ch_off[0].get("y")) if ch_off else None,
+            int(ch_ext[0].get("cx")) if ch_ext else None,
+            int(ch_ext[0].get("cy")) if ch_ext else None,
+        ]
+
     def extract_group_shapes(self) -> list:
+        """Extract every shape nested in the group, in slide coordinates."""
         from .factories import (
-            shape_extractor_factory,  # Local import to avoid circular import
+            ShapeExtractorPool,  # Local import to avoid circular import
         )
 
-        group_shape_data = []
-
-        for nested_shape in self._shape.shapes:  # type: ignore[attr-defined]
-            extractor = shape_extractor_factory(nested_shape, self._measurement_unit)
-            shape_data = extractor.extract_shape()
-            group_shape_data.append(shape_data)
-
-        return group_shape_data
+        extractors = ShapeExtractorPool()
+        group_shape_data = self.extract_raw_shape()
+        shapes = flatten_groups(
+            self._shape.shapes,  # type: ignore[attr-defined]
+            lambda shape: extractors.get(shape).extract_raw_shape(),
+            extractors.group_children,
+            child_transform(
+                IDENTITY,
+                [
+                    group_shape_data["left"],
+                    group_shape_data["top"],
+                    group_shape_data["width"],
+                    group_shape_data["height"],
+                ],
+                self.extract_child_geometry(),
+            ),
+            group_shape_data["shape_id"],
+        )
+        return convert_shapes(shapes, self._measurement_unit)
@@ -0,0 +1,490 @@
+from collections.abc import Collection, Sequence
+
+from lxml import etree
+
+from pptlayout.utils import convert_shapes, unit_conversion
+
+from .groups import flatten_groups
+from .lazy_slides import LazySlides
+from .opc import NAMESPACES, RT_SLIDE_LAYOUT, RT_SLIDE_MASTER, PptxPackage, qn
+from .records import PresentationRecord, SlideRecord, slide_record
+
+P_SP = qn("p:sp")
+P_GRP_SP = qn("p:grpSp")
+P_GRAPHIC_FRAME = qn("p:graphicFrame")
+P_CXN_SP = qn("p:cxnSp")
+P_PIC = qn("p:pic")
+P_CONTENT_PART = qn("p:contentPart")
+P_CSLD = qn("p:cSld")
+P_SP_TREE = qn("p:spTree")
+A_R = qn("a:r")
+A_BR = qn("a:br")
+A_FLD = qn("a:fld")
+
+SHAPE_TAGS = (P_SP, P_GRP_SP, P_GRAPHIC_FRAME, P_CXN_SP, P_PIC, P_CONTENT_PART)
+# Elements that may be placeholders and inherit their geometry. python-pptx
+# only types the ``p:sp`` ones as PLACEHOLDER; pictures, tables and charts
+# inserted into a placeholder keep the type of their content.
+PLACEHOLDER_TAGS = (P_SP, P_GRAPHIC_FRAME, P_PIC)
+
+GRAPHIC_DATA_URI_CHART = "http://schemas.openxmlformats.org/drawingml/2006/chart"
+GRAPHIC_DATA_URI_OLEOBJ = "http://schemas.openxmlformats.org/presentationml/2006/ole"
+GRAPHIC_DATA_URI_TABLE = "http://schemas.openxmlformats.org/drawingml/2006/table"
+
+# `p:ph/@type` values mapped to their PP_PLACEHOLDER_TYPE member names
+PLACEHOLDER_TYPE_NAMES = {
+    "clipArt": "BITMAP",
+    "body": "BODY",
+    "ctrTitle": "CENTER_TITLE",
+    "chart": "CHART",
+    "dt": "DATE",
+    "ftr": "FOOTER",
+    "hdr": "HEADER",
+    "media": "MEDIA_CLIP",
+    "obj": "OBJECT",
+    "dgm": "ORG_CHART",
+    "pic": "PICTURE",
+    "sldImg": "SLIDE_IMAGE",
+    "sldNum": "SLIDE_NUMBER",
+    "subTitle": "SUBTITLE",
+    "tbl": "TABLE",
+    "title": "TITLE",
+}
+
+# Layout placeholders inherit from the master placeholder of this type
+MASTER_PLACEHOLDER_TYPES = {
+    "body": "body",
+    "chart": "body",
+    "clipArt": "body",
+    "ctrTitle": "title",
+    "dgm": "body",
+    "dt": "dt",
+    "ftr": "ftr",
+    "media": "body",
+    "obj": "body",
+    "pic": "body",
+    "sldNum": "sldNum",
+    "subTitle": "body",
+    "tbl": "body",
+    "title": "title",
+}
+
+# Common `a:prstGeom/@prst` values of pictures, mapped to MSO_AUTO_SHAPE_TYPE names
+AUTO_SHAPE_TYPE_NAMES = {
+    "rect": "RECTANGLE",
+    "roundRect": "ROUNDED_RECTANGLE",
+    "ellipse": "OVAL",
+    "snip1Rect": "SNIP_1_RECTANGLE",
+    "snip2SameRect": "SNIP_2_SAME_RECTANGLE",
+    "round1Rect": "ROUND_1_RECTANGLE",
+    "round2SameRect": "ROUND_2_SAME_RECTANGLE",
+    "triangle": "ISOSCELES_TRIANGLE",
+    "diamond": "DIAMOND",
+    "hexagon": "HEXAGON",
+    "octagon": "OCTAGON",
+    "parallelogram": "PARALLELOGRAM",
+    "trapezoid": "TRAPEZOID",
+    "frame": "FRAME",
+}
+
+Geometry = list[int | None]  # [left, top, width, height] in EMU
+
+
+def _is_true(value: str | None) -> bool:
+    return value in ("1", "true")
+
+
+def _read_geometry(shape_elm: etree._Element) -> Geometry:
+    tag = shape_elm.tag
+    if tag == P_GRAPHIC_FRAME:
+        xfrm = shape_elm.find("p:xfrm", NAMESPACES)
+    elif tag == P_GRP_SP:
+        xfrm = shape_elm.find("p:grpSpPr/a:xfrm", NAMESPACES)
+    else:
+        xfrm = shape_elm.find("p:spPr/a:xfrm", NAMESPACES)
+    if xfrm is None:
+        return [None, None, None, None]
+    off = xfrm.find("a:off", NAMESPACES)
+    ext = xfrm.find("a:ext", NAMESPACES)
+    left = top = width = height = None
+    if off is not None:
+        left, top = int(off.get("x")), int(off.get("y"))
+    if ext is not None:
+        width, height = int(ext.get("cx")), int(ext.get("cy"))
+    return [left, top, width, height]
+
+
+def _read_child_geometry(grp_sp: etree._Element) -> Geometry:
+    xfrm = grp_sp.find("p:grpSpPr/a:xfrm", NAMESPACES)
+    ch_off = None if xfrm is None else xfrm.find("a:chOff", NAMESPACES)
+    ch_ext = None if xfrm is None else xfrm.find("a:chExt", NAMESPACES)
+    ch_x = ch_y = ch_cx = ch_cy = None
+    if ch_off is not None:
+        ch_x, ch_y = int(ch_off.get("x")), int(ch_off.get("y"))
+    if ch_ext is not None:
+        ch_cx, ch_cy = int(ch_ext.get("cx")), int(ch_ext.get("cy"))
+    return [ch_x, ch_y, ch_cx, ch_cy]
+
+
+def _group_children(shape_elm: etree._Element):
+    if shape_elm.tag != P_GRP_SP:
+        return None
+    return shape_elm.iterchildren(*SHAPE_TAGS), _read_child_geometry(shape_elm)
+
+
+def _find_ph(shape_elm: etree._Element) -> etree._Element | None:
+    return shape_elm[0].find("p:nvPr/p:ph", NAMESPACES)
+
+
+def _extract_auto_shape_type(prst: str) -> str:
+    name = AUTO_SHAPE_TYPE_NAMES.get(prst)
+    if name is None:
+        from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
+
+        name = MSO_AUTO_SHAPE_TYPE.from_xml(prst).name
+    return name
+
+
+def _extract_text(shape_elm: etree._Element) -> str:
+    tx_body = shape_elm.find("p:txBody", NAMESPACES)
+    if tx_body is None:
+        return ""
+    paragraphs = []
+    for paragraph in tx_body.iterfind("a:p", NAMESPACES):
+        texts = []
+        for child in paragraph:
+            if child.tag == A_BR:
+                texts.append("\v")
+            elif child.tag == A_R or child.tag == A_FLD:
+                text_elm = child.find("a:t", NAMESPACES)
+                if text_elm is not None and text_elm.text:
+                    texts.append(text_elm.text)
+        paragraphs.append("".join(texts))
+    return "\n".join(paragraphs)
+
+
+class PlaceholderInheritance:
+    """Resolves the geometry slide placeholders inherit from layouts and masters.
+
+    Layout and master parts are parsed once per package and shared by all slides.
+    """
+
+    def __init__(self, package: PptxPackage):
+        self._package = package
+        self._layouts: dict[str, dict[int, Geometry]] = {}
+        self._masters: dict[str, dict[str, Geometry]] = {}
+
+    def layout_partname(self, slide_partname: str) -> str | None:
+        return self._package.related_partname(slide_partname, RT_SLIDE_LAYOUT)
+
+    def inherited_geometry(self, layout_partname: str | None, idx: int) -> Geometry:
+        if layout_partname is None:
+            return [None, None, None, None]
+        layout = self._layouts.get(layout_partname)
+        if layout is None:
+            layout = self._layouts[layout_partname] = self._load_layout(layout_partname)
+        return layout.get(idx, [None, None, None, None])
+
+    def _load_layout(self, layout_partname: str) -> dict[int, Geometry]:
+        master_partname = self._package.related_partname(
+            layout_partname, RT_SLIDE_MASTER
+        )
+        placeholders: dict[int, Geometry] = {}
+        for shape_elm, ph in self._iter_placeholders(layout_partname):
+            idx = int(ph.get("idx", "0"))
+            if idx in placeholders:
+                continue
+            geometry = _read_geometry(shape_elm)
+            if shape_elm.tag == P_SP and None in geometry:
+                base_type = MASTER_PLACEHOLDER_TYPES.get(ph.get("type", "obj"))
+                base = self._master_geometry(master_partname, base_type)
+                geometry = [
+                    base[i] if value is None else value
+                    for i, value in enumerate(geometry)
+                ]
+            placeholders[idx] = geometry
+        return placeholders
+
+    def _master_geometry(
+        self, master_partname: str | None, ph_type: str | None
+    ) -> Geometry:
+        if master_partname is None or ph_type is None:
+            return [None, None, None, None]
+        master = self._masters.get(master_partname)
+        if master is None:
+            master = {}
+            for shape_elm, ph in self._iter_placeholders(master_partname):
+                master.setdefault(ph.get("type", "obj"), _read_geometry(shape_elm))
+            self._masters[master_partname] = master
+        return master.get(ph_type, [None, None, None, None])
+
+    def _iter_placeholders(self, partname: str):
+        sp_tree = self._package.parse_part(partname).find("p:cSld/p:spTree", NAMESPACES)
+        for shape_elm in sp_tree.iterchildren(*SHAPE_TAGS):
+            ph = _find_ph(shape_elm)
+            if ph is not None:
+                yield shape_elm, ph
+
+
+class XmlSlideShapeExtractor:
+    """Extracts a slide straight from its XML part in a single iterparse pass.
+
+    Produces the same dicts as :class:`SlideShapeExtractor` without building
+    python-pptx objects.
+    """
+
+    def __init__(
+        self,
+        package: PptxPackage,
+        slide_id: int,
+        slide_partname: str,
+        placeholder_inheritance: PlaceholderInheritance,
+        measurement_unit: str = "pt",
+    ):
+        self._package = package
+        self._slide_id = slide_id
+        self._slide_partname = slide_partname
+        self._placeholder_inheritance = placeholder_inheritance
+        self._measurement_unit = measurement_unit
+        self._layout_partname: str | None = None
+        self._slide_name: str | None = None
+        self._shapes: list | None = None
+
+    def extract_slide_metadate(self) -> dict:
+        self._parse_slide()
+        return {
+            "slide_id": self._slide_id,
+            "slide_name": self._slide_name,
+        }
+
+    def extract_shapes(self) -> list:
+        self._parse_slide()
+        return self._shapes  # type: ignore[return-value]
+
+    def extract_slide(self) -> dict:
+        slide_data = self.extract_slide_metadate()
+        slide_data["shapes"] = self.extract_shapes()
+        return slide_data
+
+    def extract_slide_record(self) -> SlideRecord:
+        return slide_record(self.extract_slide(), self._measurement_unit)
+
+    def _parse_slide(self) -> None:
+        if self._shapes is not None:
+            return
+        self._layout_partname = self._placeholder_inheritance.layout_partname(
+            self._slide_partname
+        )
+        self._slide_name = ""
+        shapes = []
+        with self._package.open_part(self._slide_partname) as stream:
+            for event, elm in etree.iterparse(
+                stream, events=("start", "end"), tag=(P_CSLD,) + SHAPE_TAGS
+            ):
+                if elm.tag == P_CSLD:
+                    if event == "start":
+                        self._slide_name = elm.get("name", "")
+                    continue
+                if event == "start":
+                    continue
+                sp_tree = elm.getparent()
+                if sp_tree.tag != P_SP_TREE:
+                    continue
+                shapes.extend(
+                    flatten_groups([elm], self._extract_shape, _group_children)
+                )
+                # Free the shapes that have already been extracted
+                elm.clear()
+                while elm.getprevious() is not None:
+                    del sp_tree[0]
+        self._shapes = convert_shapes(shapes, self._measurement_unit)
+
+    def _extract_shape(self, shape_elm: etree._Element) -> dict:
+        tag = shape_elm.tag
+        c_nv_pr = shape_elm[0].find("p:cNvPr", NAMESPACES)
+        ph = _find_ph(shape_elm) if tag in PLACEHOLDER_TAGS else None
+        shape_type = self._extract_shape_type(shape_elm, ph)
+
+        left, top, width, height = _read_geometry(shape_elm)
+        if ph is not None and None in (left, top, width, height):
+            inherited = self._placeholder_inheritance.inherited_geometry(
+                self._layout_partname, int(ph.get("idx", "0"))
+            )
+            left = inherited[0] if left is None else left
+            top = inherited[1] if top is None else top
+            width = inherited[2] if width is None else width
+            height = inherited[3] if height is None else height
+
+        shape_data = {
+            "name": c_nv_pr.get("name", ""),
+            "shape_id": int(c_nv_pr.get("id")),
+            "shape_type": shape_type,
+            "measurement_unit": "emu",
+            "height": height,
+            "width": width,
+            "left": left,
+            "top": top,
+        }
+
+        if shape_type in ("AUTO_SHAPE", "TEXT_BOX", "FREEFORM"):
+            shape_data["text"] = _extract_text(shape_elm)
+        elif shape_type == "PLACEHOLDER":
+            if tag == P_SP:
+                shape_data["text"] = _extract_text(shape_elm)
+            placeholder_type = PLACEHOLDER_TYPE_NAMES.get(ph.get("type", "obj"))  # type: ignore[union-attr]
+            if placeholder_type is None:
+                raise AttributeError("Unknown placeholder format")
+            shape_data["placeholder_type"] = placeholder_type
+        elif shape_type == "LINE":
+            xfrm = shape_elm.find("p:spPr/a:xfrm", NAMESPACES)
+            flip_h = _is_true(xfrm.get("flipH"))  # type: ignore[union-attr]
+            flip_v = _is_true(xfrm.get("flipV"))  # type: ignore[union-attr]
+            shape_data["begin_x"] = left + width if flip_h else left  # type: ignore[operator]
+            shape_data["begin_y"] = top + height if flip_v else top  # type: ignore[operator]
+            shape_data["end_x"] = left if flip_h else left + width  # type: ignore[operator]
+            shape_data["end_y"] = top if flip_v else top + height  # type: ignore[operator]
+        elif shape_type == "PICTURE":
+            prst_geom = shape_elm.find("p:spPr/a:prstGeom", NAMESPACES)
+            if prst_geom is not None:
+                shape_data["auto_shape_type"] = _extract_auto_shape_type(
+                    prst_geom.get("prst")
+                )
+        elif shape_type in (
+            "CHART",
+            "TABLE",
+            "EMBEDDED_OLE_OBJECT",
+            "LINKED_OLE_OBJECT",
+        ):
+            uri = self._graphic_data_uri(shape_elm)
+            shape_data["has_chart"] = uri == GRAPHIC_DATA_URI_CHART
+            shape_data["has_table"] = uri == GRAPHIC_DATA_URI_TABLE
+        return shape_data
+
+    def _extract_shape_type(
+        self, shape_elm: etree._Element, ph: etree._Element | None
+    ) -> str:
+        tag = shape_elm.tag
+        if tag == P_SP:
+            if ph is not None:
+                return "PLACEHOLDER"
+            if shape_elm.find("p:spPr/a:custGeom", NAMESPACES) is not None:
+                return "FREEFORM"
+            is_textbox = _is_true(
+                shape_elm.find("p:nvSpPr/p:cNvSpPr", NAMESPACES).get("txBox")  # type: ignore[union-attr]
+            )
+            if shape_elm.find("p:spPr/a:prstGeom", NAMESPACES) is not None:
+                if not is_textbox:
+                    return "AUTO_SHAPE"
+            if is_textbox:
+                return "TEXT_BOX"
+            raise NotImplementedError("Shape instance of unrecognized shape type")
+        if tag == P_PIC:
+            if shape_elm.find("p:nvPicPr/p:nvPr/a:videoFile", NAMESPACES) is not None:
+                return "MEDIA"
+            return "PICTURE"
+        if tag == P_CXN_SP:
+            return "LINE"
+        if tag == P_GRP_SP:
+            return "GROUP"
+        if tag == P_GRAPHIC_FRAME:
+            uri = self._graphic_data_uri(shape_elm)
+            if uri == GRAPHIC_DATA_URI_CHART:
+                return "CHART"
+            if uri == GRAPHIC_DATA_URI_TABLE:
+                return "TABLE"
+            if uri == GRAPHIC_DATA_URI_OLEOBJ:
+                ole_objs = shape_elm.findall(".//p:oleObj", NAMESPACES)
+                if ole_objs and ole_objs[-1].find("p:embed", NAMESPACES) is not None:
+                    return "EMBEDDED_OLE_OBJECT"
+                return "LINKED_OLE_OBJECT"
+            return str(None)
+        raise NotImplementedError("BaseShape does not implement `.shape_type`")
+
+    @staticmethod
+    def _graphic_data_uri(shape_elm: etree._Element) -> str | None:
+        graphic_data = shape_elm.find("a:graphic/a:graphicData", NAMESPACES)
+        if graphic_data is None:
+            return None
+        return graphic_data.get("uri")
+
+
+class XmlPowerPointShapeExtractor:
+    """Drop-in alternative to :class:`PowerPointShapeExtractor` reading the OPC
+    package directly instead of going through python-pptx."""
+
+    def __init__(self, package: PptxPackage, measurement_unit: str = "pt"):
+        self._package = package
+        self._measurement_unit = measurement_unit
+        self._placeholder_inheritance = PlaceholderInheritance(package)
+
+    def extract_slide_width(self) -> int | float:
+        return unit_conversion(self._package.slide_size()[0], self._measurement_unit)
+
+    def extract_slide_height(self) -> int | float:
+        return unit_conversion(self._package.slide_size()[1], self._measurement_unit)
+
+    def _extract_ppt_metadata(self) -> dict:
+        return {
+            "slide_width": self.extract_slide_width(),
+            "slide_height": self.extract_slide_height(),
+        }
+
+    def _slide_extractor(
+        self, slide_id: int, slide_partname: str
+    ) -> XmlSlideShapeExtractor:
+        return XmlSlideShapeExtractor(
+            self._package,
+            slide_id,
+            slide_partname,
+            self._placeholder_inheritance,
+            self._measurement_unit,
+        )
+
+    def extract_slides(
+        self, records: bool = False, slide_ids: Collection[int] | None = None
+    ) -> list:
+        """Extract every slide, or only those in `slide_ids`, in deck order."""
+        slides: list = []
+        for slide_id, slide_partname in self._package.slide_refs():
+            if slide_ids is not None and slide_id not in slide_ids:
+                continue
+            slide_extractor = self._slide_extractor(slide_id, slide_partname)
+            if records:
+                slides.append(slide_extractor.extract_slide_record())
+            else:
+                slides.append(slide_extractor.extract_slide())
+        return slides
+
+    def extract_slides_lazy(self, records: bool = False) -> LazySlides:
+        slide_refs = self._package.slide_refs()
+        return LazySlides(
+            [slide_id for slide_id, _ in slide_refs],
+            lambda idx: self._extract_slide(*slide_refs[idx], records),
+        )
+
+    def _extract_slide(
+        self, slide_id: int, slide_partname: str, records: bool
+    ) -> dict | SlideRecord:
+        slide_extractor = self._slide_extractor(slide_id, slide_partname)
+        if records:
+            return slide_extractor.extract_slide_record()
+        return slide_extractor.extract_slide()
+
+    def extract_ppt(
+        self, lazy: bool = False, records: bool = False
+    ) -> dict | PresentationRecord:
+        """Extract the deck as nested dicts, or as records with ``records=True``."""
+        slides: Sequence
+        if lazy:
+            slides = self.extract_slides_lazy(records)
+        else:
+            slides = self.extract_slides(records)
+        metadata = self._extract_ppt_metadata()
+        if records:
+            return PresentationRecord(
+                metadata["slide_width"],
+                metadata["slide_height"],
+                self._measurement_unit,
+                slides,
+            )
+        return {**metadata, "slides": slides}
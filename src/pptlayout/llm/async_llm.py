@@ -0,0 +1,137 @@
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+
+import backoff
+import httpx
+from ollama import AsyncClient, Options, ResponseError
+
+from .backends import OllamaBackend, resolve_backend
+from .images import ImageInput, check_images, to_ollama_images
+from .llm import get_model_name
+
+# HTTP statuses worth retrying; anything else is returned to the caller at once
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+def _is_permanent(error: Exception) -> bool:
+    return (
+        isinstance(error, ResponseError)
+        and error.status_code not in RETRYABLE_STATUS_CODES
+    )
+
+
+class AsyncLLMClient:
+    """Asynchronous counterpart of :func:`call_llm` for the Ollama backend.
+
+    At most `max_concurrency` requests are in flight at once. Every attempt is
+    bounded by `timeout` seconds, and timeouts, connection errors and retryable
+    HTTP statuses are retried with exponential backoff up to `max_tries`
+    attempts in total. Requests go to `host`, or by default to the host of the
+    Ollama backend configured for the model. The client owns its connection
+    pool: use it as an async context manager or await :meth:`close` once done.
+    """
+
+    def __init__(
+        self,
+        host: str | None = None,
+        max_concurrency: int = 4,
+        timeout: float | None = 120.0,
+        max_tries: int = 3,
+        max_backoff: float = 30.0,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        # Ollama's client has no public close(), so the pool is owned here
+        self._transport = httpx.AsyncHTTPTransport()
+        self._host = host
+        self._clients: dict[str | None, AsyncClient] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._timeout = timeout
+        self._generate = backoff.on_exception(
+            backoff.expo,
+            (ResponseError, httpx.TransportError, asyncio.TimeoutError),
+            max_tries=max_tries,
+            max_value=max_backoff,
+            giveup=_is_permanent,
+        )(self._generate_once)
+
+    async def close(self) -> None:
+        await self._transport.aclose()
+
+    async def __aenter__(self) -> "AsyncLLMClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def call_llm(
+        self,
+        model_name: str = "llama3.1:8b",
+        prompt: str = "",
+        temperature: float = 0.5,
+        max_tokens: int = 32000,
+        images: list[ImageInput] | None = None,
+        json: bool = False,
+    ) -> str:
+        model_name = get_model_name(model_name=model_name, images=images)
+        backend = resolve_backend(model_name)
+        if not isinstance(backend, OllamaBackend):
+            raise ValueError(f"{model_name} is not served by Ollama")
+        check_images(images)
+        options = Options(
+            temperature=temperature,
+            num_ctx=max_tokens,
+        )
+        return await self._generate(
+            self._client(self._host if self._host is not None else backend.host),
+            model=model_name,
+            prompt=prompt,
+            images=to_ollama_images(images),
+            options=options,
+            format="json" if json else "",
+        )
+
+    def _client(self, host: str | None) -> AsyncClient:
+        # One client per host, all sharing the connection pool
+        if host not in self._clients:
+            self._clients[host] = AsyncClient(host=host, transport=self._transport)
+        return self._clients[host]
+
+    async def _generate_once(self, client: AsyncClient, **kwargs) -> str:
+        # The slot is held for one attempt only, not while backing off
+        async with self._semaphore:
+            response = await asyncio.wait_for(client.generate(**kwargs), self._timeout)
+        return response["response"]
+
+    async def call_llm_many(self, requests: Iterable[dict]) -> list[str]:
+        """Run :meth:`call_llm` for every keyword dict, returning in order."""
+        return await asyncio.gather(*(self.call_llm(**request) for request in requests))
+
+    async def as_completed(
+        self, requests: Iterable[dict], return_exceptions: bool = False
+    ) -> AsyncIterator[tuple[int, str | BaseException]]:
+        """Yield ``(index, response)`` pairs as soon as each request finishes.
+
+        With ``return_exceptions=True`` a failed request yields its exception
+        instead of aborting the iteration.
+        """
+
+        async def indexed(index: int, request: dict) -> tuple[int, str]:
+            try:
+                return index, await self.call_llm(**request)
+            except Exception as error:
+                if return_exceptions:
+                    return index, error  # type: ignore[return-value]
+                raise
+
+        tasks = [
+            asyncio.ensure_future(indexed(index, request))
+            for index, request in enumerate(requests)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,540 @@
+import base64
+import json as jsonlib
+import os
+import threading
+import time
+from collections.abc import Callable, Generator
+from dataclasses import dataclass
+from typing import Any
+
+from .batching import bucket_by_length
+from .images import ImageInput, image_bytes, to_ollama_images, to_qwen2_vl_image
+from .parser import decode_json_span, find_json_spans
+from .session import get_registry
+
+# Environment variable naming a JSON backend configuration file
+CONFIG_ENV = "PPTLAYOUT_LLM_CONFIG"
+
+DEFAULT_QWEN2_VL_DIR = os.environ.get(
+    "PPTLAYOUT_QWEN2_VL_DIR", "/data/share_weight/Qwen2-VL-7B-Instruct"
+)
+
+DEFAULT_CONFIG: dict = {
+    "default": "ollama",
+    "backends": {"qwen2-vl": {"type": "hf", "model_dir": DEFAULT_QWEN2_VL_DIR}},
+    "models": {"Qwen2-VL-7B-Instruct": "qwen2-vl"},
+}
+
+
+@dataclass(frozen=True)
+class Capabilities:
+    """What a backend can do besides plain text generation."""
+
+    vision: bool = False
+    json_mode: bool = False
+    batching: bool = False
+    streaming: bool = False
+
+
+class LLMBackend:
+    """Base class of the backends :func:`call_llm` dispatches to.
+
+    Subclasses implement :meth:`generate`; streaming and batching fall back to
+    a single chunk and to one request at a time. Backends without
+    ``json_mode`` ignore the `json` flag and leave the parsing to the caller.
+    """
+
+    capabilities = Capabilities()
+
+    def identity(self) -> dict:
+        """Describe the backend in response cache keys.
+
+        Backends with the same identity must give the same answers, so
+        subclasses add whatever selects the server or weights they use.
+        """
+        return {"type": type(self).__name__}
+
+    def check(self, images: list[ImageInput] | None) -> None:
+        if images and not self.capabilities.vision:
+            raise ValueError(f"The {type(self).__name__} backend takes no images")
+
+    def generate(
+        self,
+        model_name: str,
+        prompt: str,
+        temperature: float = 0.5,
+        max_tokens: int = 32000,
+        images: list[ImageInput] | None = None,
+        json: bool = False,
+        seed: int | None = None,
+    ) -> str:
+        raise NotImplementedError
+
+    def generate_stream(
+        self,
+        model_name: str,
+        prompt: str,
+        temperature: float = 0.5,
+        max_tokens: int = 32000,
+        images: list[ImageInput] | None = None,
+        json: bool = False,
+        seed: int | None = None,
+    ) -> Generator[str, None, None]:
+        yield self.generate(
+            model_name, prompt, temperature, max_tokens, images, json, seed
+        )
+
+    def generate_batch(
+        self,
+        requests: list[tuple[str, list[ImageInput] | None]],
+        model_name: str,
+        temperature: float = 0.5,
+        max_tokens: int = 32000,
+        json: bool = False,
+        batch_size: int = 8,
+        max_batch_tokens: int | None = None,
+    ) -> list[str]:
+        return [
+            self.generate(model_name, prompt, temperature, max_tokens, images, json)
+            for prompt, images in requests
+        ]
+
+
+BACKEND_TYPES: dict[str, Callable[..., LLMBackend]] = {}
+
+
+def register_backend(name: str):
+    """Class decorator registering a backend type under `name` for the config."""
+
+    def register(cls):
+        BACKEND_TYPES[name] = cls
+        return cls
+
+    return register
+
+
+@register_backend("ollama")
+class OllamaBackend(LLMBackend):
+    """Models served by Ollama, on the default host unless `host` is given."""
+
+    capabilities = Capabilities(vision=True, json_mode=True, streaming=True)
+
+    def __init__(self, host: str | None = None):
+        self.host = host
+        self._client = None
+
+    def identity(self):
+        return {**super().identity(), "host": self.host}
+
+    def _generate(
+        self, model_name, prompt, temperature, max_tokens, images, json, seed, stream
+    ):
+        import ollama
+
+        if self._client is None:
+            self._client = ollama if self.host is None else ollama.Client(self.host)
+        options = ollama.Options(temperature=temperature, num_ctx=max_tokens)
+        if seed is not None:
+            options["seed"] = seed
+        return self._client.generate(
+            model=model_name,
+            prompt=prompt,
+            images=to_ollama_images(images),
+            options=options,
+            format="json" if json else "",
+            stream=stream,
+        )
+
+    def generate(
+        self,
+        model_name,
+        prompt,
+        temperature=0.5,
+        max_tokens=32000,
+        images=None,
+        json=False,
+        seed=None,
+    ):
+        return self._generate(
+            model_name, prompt, temperature, max_tokens, images, json, seed, False
+        )["response"]
+
+    def generate_stream(
+        self,
+        model_name,
+        prompt,
+        temperature=0.5,
+        max_tokens=32000,
+        images=None,
+        json=False,
+        seed=None,
+    ):
+        parts = self._generate(
+            model_name, prompt, temperature, max_tokens, images, json, seed, True
+        )
+        for part in parts:
+            yield part["response"]
+
+
+def generate_qwen2_vl_message(
+    images: list[ImageInput] | None = None,
+    prompt: str = "",
+) -> list[dict]:
+    if images is None:
+        messages = [
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": prompt
+                        or "What is the problem with the layout of this slide?",
+                    },
+                ],
+            }
+        ]
+    else:
+        content = []
+        for image in images:
+            content.append(
+                {
+                    "type": "image",
+                    "image": to_qwen2_vl_image(image),
+                }
+            )
+        content.append(
+            {
+                "type": "text",
+                "text": prompt,
+            }
+        )
+        messages = [
+            {
+                "role": "user",
+                "content": content,
+            }
+        ]
+    return messages
+
+
+@register_backend("hf")
+class HuggingFaceBackend(LLMBackend):
+    """A Qwen2-VL checkpoint run in process with ``transformers``.
+
+    The model is loaded on first use and shared through the
+    :class:`~pptlayout.llm.session.ModelRegistry`. The requested model name is
+    ignored: the backend always answers with the model in `model_dir`.
+    """
+
+    capabilities = Capabilities(vision=True, batching=True, streaming=True)
+
+    def __init__(
+        self,
+        model_dir: str = DEFAULT_QWEN2_VL_DIR,
+        dtype: str = "auto",
+        device: str | None = None,
+    ):
+        self.model_dir = model_dir
+        self.dtype = dtype
+        self.device = device
+
+    def identity(self):
+        return {**super().identity(), "model_dir": self.model_dir, "dtype": self.dtype}
+
+    def session(self):
+        return get_registry().get(self.model_dir, dtype=self.dtype, device=self.device)
+
+    def generate(
+        self,
+        model_name,
+        prompt,
+        temperature=0.5,
+        max_tokens=32000,
+        images=None,
+        json=False,
+        seed=None,
+    ):
+        return self.session().generate(
+            generate_qwen2_vl_message(images=images, prompt=prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            seed=seed,
+        )
+
+    def generate_stream(
+        self,
+        model_name,
+        prompt,
+        temperature=0.5,
+        max_tokens=32000,
+        images=None,
+        json=False,
+        seed=None,
+    ):
+        return self.session().generate_stream(
+            generate_qwen2_vl_message(images=images, prompt=prompt),
+            temperature=temperature,
+            max_tokens=max_tokens,
+            seed=seed,
+        )
+
+    def generate_batch(
+        self,
+        requests,
+        model_name,
+        temperature=0.5,
+        max_tokens=32000,
+        json=False,
+        batch_size=8,
+        max_batch_tokens=None,
+    ):
+        """Answer requests of similar length together in one ``generate`` call."""
+        session = self.session()
+        messages_list = [
+            generate_qwen2_vl_message(images=images, prompt=prompt)
+            for prompt, images in requests
+        ]
+        lengths = [session.prompt_length(messages) for messages in messages_list]
+        responses: list[str] = [""] * len(requests)
+        for batch in bucket_by_length(lengths, batch_size, max_batch_tokens):
+            outputs = session.generate_batch(
+                [messages_list[index] for index in batch],
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            for index, output in zip(batch, outputs):
+                responses[index] = output
+        return responses
+
+
+def _image_url(image: ImageInput) -> str:
+    data = image_bytes(image)
+    mime = "image/jpeg" if data.startswith(b"\xff\xd8") else "image/png"
+    return f"data:{mime};base64,{base64.b64encode(data).decode()}"
+
+
+@register_backend("openai")
+class OpenAICompatibleBackend(LLMBackend):
+    """Any server speaking the OpenAI chat completions API, such as vLLM.
+
+    `api_key` defaults to ``OPENAI_API_KEY``; set ``vision=False`` for a
+    text-only model.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        vision: bool = True,
+        timeout: float | None = 120.0,
+    ):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.capabilities = Capabilities(vision=vision, json_mode=True, streaming=True)
+        self._client = None
+
+    def identity(self):
+        return {**super().identity(), "base_url": self.base_url}
+
+    def _create(
+        self, model_name, prompt, temperature, max_tokens, images, json, seed, stream
+    ):
+        if self._client is None:
+            from openai import OpenAI
+
+            self._client = OpenAI(
+                base_url=self.base_url,
+                api_key=self.api_key or os.environ.get("OPENAI_API_KEY", "EMPTY"),
+                timeout=self.timeout,
+            )
+        content: list[dict] = [
+            {"type": "image_url", "image_url": {"url": _image_url(image)}}
+            for image in images or []
+        ]
+        content.append({"type": "text", "text": prompt})
+        kwargs: dict[str, Any] = {}
+        if json:
+            kwargs["response_format"] = {"type": "json_object"}
+        if seed is not None:
+            kwargs["seed"] = seed
+        return self._client.chat.completions.create(
+            model=model_name,
+            messages=[{"role": "user", "content": content}],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=stream,
+            **kwargs,
+        )
+
+    def generate(
+        self,
+        model_name,
+        prompt,
+        temperature=0.5,
+        max_tokens=32000,
+        images=None,
+        json=False,
+        seed=None,
+    ):
+        completion = self._create(
+            model_name, prompt, temperature, max_tokens, images, json, seed, False
+        )
+        return completion.choices[0].message.content or ""
+
+    def generate_stream(
+        self,
+        model_name,
+        prompt,
+        temperature=0.5,
+        max_tokens=32000,
+        images=None,
+        json=False,
+        seed=None,
+    ):
+        chunks = self._create(
+            model_name, prompt, temperature, max_tokens, images, json, seed, True
+        )
+        try:
+            for chunk in chunks:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            chunks.close()
+
+
+@register_backend("mock")
+class MockBackend(LLMBackend):
+    """Deterministic offline backend that answers with the prompt's layout.
+
+    The reply wraps the first JSON object of the prompt in a ```` ```json ````
+    fence between some prose, as a model suggesting an unchanged layout
+    would, after sleeping for `latency` seconds to simulate inference. A
+    compact prompt is answered with its CSV layout table in a
+    ```` ```csv ```` fence instead.
+    """
+
+    capabilities = Capabilities(vision=True, json_mode=True, streaming=True)
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def generate(
+        self,
+        model_name,
+        prompt,
+        temperature=0.5,
+        max_tokens=32000,
+        images=None,
+        json=False,
+        seed=None,
+    ):
+        if self.latency:
+            time.sleep(self.latency)
+        table_start = prompt.find("```csv\n")
+        if table_start != -1:
+            table_start += len("```csv\n")
+            table = prompt[table_start : prompt.find("```", table_start)]
+            return (
+                "Here is the improved layout:\n```csv\n"
+                + table
+                + "```\nThe shapes are already well aligned."
+            )
+        layout = None
+        for start, end in find_json_spans(prompt):
+            layout = decode_json_span(prompt, start, end)
+            if layout is not None:
+                break
+        layout = layout if layout is not None else {"shapes": []}
+        if json:
+            return jsonlib.dumps(layout)
+        return (
+            "Here is the improved layout:\n```json\n"
+            + jsonlib.dumps(layout, indent=2)
+            + "\n```\nThe shapes are already well aligned."
+        )
+
+    def generate_stream(self, model_name, prompt, *args, **kwargs):
+        response = self.generate(model_name, prompt, *args, **kwargs)
+        yield from response.splitlines(keepends=True)
+
+
+_config: dict | None = None
+_backends: dict[str, LLMBackend] = {}
+_lock = threading.Lock()
+
+
+def load_backend_config(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return jsonlib.load(f)
+
+
+def _merged(config: dict) -> dict:
+    return {
+        "default": config.get("default", DEFAULT_CONFIG["default"]),
+        "backends": {**DEFAULT_CONFIG["backends"], **config.get("backends", {})},
+        "models": {**DEFAULT_CONFIG["models"], **config.get("models", {})},
+    }
+
+
+def configure_backends(config: dict | None) -> None:
+    """Set the backend configuration for this process.
+
+    `config` has a ``default`` backend name, named ``backends`` given as
+    keyword options plus a ``type`` from :data:`BACKEND_TYPES` (the name
+    itself by default), and ``models`` mapping model names to backend names::
+
+        {
+            "default": "ollama",
+            "backends": {"vllm": {"type": "openai", "base_url": "http://gpu:8000/v1"}},
+            "models": {"Qwen2-VL-7B-Instruct": "vllm"},
+        }
+
+    The entries are added to those of :data:`DEFAULT_CONFIG`. With None, the
+    configuration is read again from the file named by ``PPTLAYOUT_LLM_CONFIG``
+    on next use, if set. Backends already created are discarded.
+    """
+    global _config
+    with _lock:
+        _config = None if config is None else _merged(config)
+        _backends.clear()
+
+
+def _current_config() -> dict:
+    global _config
+    if _config is None:
+        path = os.environ.get(CONFIG_ENV)
+        _config = _merged(load_backend_config(path) if path else {})
+    return _config
+
+
+def get_backend(name: str) -> LLMBackend:
+    """Return the configured backend called `name`, creating it on first use."""
+    with _lock:
+        backend = _backends.get(name)
+        if backend is not None:
+            return backend
+        options = dict(_current_config()["backends"].get(name, {}))
+        backend_type = options.pop("type", name)
+        if backend_type not in BACKEND_TYPES:
+            raise KeyError(f"Unknown LLM backend: {backend_type}")
+        backend = _backends[name] = BACKEND_TYPES[backend_type](**options)
+        return backend
+
+
+def resolve_backend(
+    model_name: str, backend: str | LLMBackend | None = None
+) -> LLMBackend:
+    """Return the backend serving `model_name`.
+
+    `backend` overrides the configuration with a backend instance or name;
+    otherwise the model's configured backend, or the default one, is used.
+    """
+    if isinstance(backend, LLMBackend):
+        return backend
+    if backend is None:
+        with _lock:
+            config = _current_config()
+            name: str = config["models"].get(model_name, config["default"])
+        return get_backend(name)
+    return get_backend(backend)
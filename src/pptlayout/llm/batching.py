@@ -0,0 +1,31 @@
+from collections.abc import Sequence
+
+
+def bucket_by_length(
+    lengths: Sequence[int],
+    max_batch_size: int = 8,
+    max_batch_tokens: int | None = None,
+) -> list[list[int]]:
+    """Group input indices into batches of similar length.
+
+    Indices are sorted by length so each batch pads to a length close to that
+    of its members. A batch holds at most `max_batch_size` inputs and, when
+    `max_batch_tokens` is set, at most that many tokens once padded to its
+    longest input; an input longer than the budget gets a batch of its own.
+    """
+    if max_batch_size < 1:
+        raise ValueError("max_batch_size must be at least 1")
+    batches: list[list[int]] = []
+    batch: list[int] = []
+    for index in sorted(range(len(lengths)), key=lambda i: lengths[i]):
+        padded_tokens = lengths[index] * (len(batch) + 1)
+        if batch and (
+            len(batch) == max_batch_size
+            or (max_batch_tokens is not None and padded_tokens > max_batch_tokens)
+        ):
+            batches.append(batch)
+            batch = []
+        batch.append(index)
+    if batch:
+        batches.append(batch)
+    return batches
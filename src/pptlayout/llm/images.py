@@ -0,0 +1,83 @@
+import base64
+import hashlib
+import io
+import os
+import sys
+from typing import Any, Union
+
+from pptlayout.cache import hash_file
+
+# A path to an image file, its encoded bytes, or a PIL image
+ImageInput = Union[str, os.PathLike, bytes, bytearray, memoryview, Any]
+
+BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+
+def _is_pil_image(image: Any) -> bool:
+    # A PIL image can only exist once PIL has been imported
+    pil = sys.modules.get("PIL.Image")
+    return pil is not None and isinstance(image, pil.Image)
+
+
+def check_images(images: list[ImageInput] | None) -> None:
+    """Raise if an image is a missing file or of an unsupported type."""
+    for image in images or []:
+        if isinstance(image, (str, os.PathLike)):
+            if not os.path.exists(image):
+                raise ValueError(f"Image file not found: {image}")
+        elif not isinstance(image, BUFFER_TYPES) and not _is_pil_image(image):
+            raise TypeError(
+                "Images must be file paths, bytes, memoryviews or PIL images, "
+                f"not {type(image).__name__}"
+            )
+
+
+def image_bytes(image: ImageInput) -> bytes:
+    """Return the encoded bytes of an image; PIL images are encoded as PNG."""
+    if isinstance(image, (str, os.PathLike)):
+        with open(image, "rb") as f:
+            return f.read()
+    if isinstance(image, BUFFER_TYPES):
+        return bytes(image)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def image_digest(image: ImageInput) -> str:
+    """Return the SHA-256 hex digest identifying an image's content.
+
+    A file and a buffer holding the same bytes get the same digest. A PIL image
+    is identified by its pixels, without encoding it.
+    """
+    if isinstance(image, (str, os.PathLike)):
+        return hash_file(os.fspath(image))
+    if isinstance(image, BUFFER_TYPES):
+        return hashlib.sha256(image).hexdigest()
+    digest = hashlib.sha256(f"{image.mode}:{image.size}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def to_ollama_image(image: ImageInput) -> str:
+    """Return an image as Ollama takes it: a path, or base64-encoded bytes."""
+    if isinstance(image, (str, os.PathLike)):
+        return os.fspath(image)
+    if isinstance(image, BUFFER_TYPES):
+        return base64.b64encode(image).decode()
+    return base64.b64encode(image_bytes(image)).decode()
+
+
+def to_ollama_images(images: list[ImageInput] | None) -> list[str] | None:
+    return None if images is None else [to_ollama_image(image) for image in images]
+
+
+def to_qwen2_vl_image(image: ImageInput) -> Any:
+    """Return an image as ``qwen_vl_utils`` takes it: a path or a PIL image."""
+    if isinstance(image, (str, os.PathLike)):
+        return os.fspath(image)
+    if isinstance(image, BUFFER_TYPES):
+        from PIL import Image
+
+        return Image.open(io.BytesIO(image))
+    return image
@@ -1,24 +1,117 @@
-import os
+from collections.abc import Iterator
+from typing import Literal, overload
 
-import ollama
-from ollama import Options
-from qwen_vl_utils import process_vision_info
-from transformers import AutoProcessor, Qwen2VLForConditionalGeneration
+from .backends import (  # noqa: F401 (generate_qwen2_vl_message is re-exported)
+    DEFAULT_QWEN2_VL_DIR,
+    HuggingFaceBackend,
+    LLMBackend,
+    generate_qwen2_vl_message,
+    resolve_backend,
+)
+from .images import ImageInput, check_images
+from .response_cache import (
+    ResponseCache,
+    get_default_response_cache,
+    is_deterministic,
+    response_key,
+)
 
-model_dir = "/data/share_weight/Qwen2-VL-7B-Instruct"
 
+@overload
+def call_llm(
+    model_name: str = "llama3.1:8b",
+    prompt: str = "",
+    temperature: float = 0.5,
+    max_tokens: int = 32000,
+    images: list[ImageInput] | None = None,
+    json: bool = False,
+    seed: int | None = None,
+    cache: ResponseCache | None = None,
+    bypass_cache: bool = False,
+    stream: Literal[False] = False,
+    backend: str | LLMBackend | None = None,
+) -> str: ...
 
+
+@overload
 def call_llm(
     model_name: str = "llama3.1:8b",
     prompt: str = "",
     temperature: float = 0.5,
     max_tokens: int = 32000,
-    images: list[str] | None = None,
+    images: list[ImageInput] | None = None,
+    json: bool = False,
+    seed: int | None = None,
+    cache: ResponseCache | None = None,
+    bypass_cache: bool = False,
+    stream: bool = False,
+    backend: str | LLMBackend | None = None,
+) -> str | Iterator[str]: ...
+
+
+def call_llm(
+    model_name: str = "llama3.1:8b",
+    prompt: str = "",
+    temperature: float = 0.5,
+    max_tokens: int = 32000,
+    images: list[ImageInput] | None = None,
     json: bool = False,
     # top_p: float = 0.9,
-) -> str:
+    seed: int | None = None,
+    cache: ResponseCache | None = None,
+    bypass_cache: bool = False,
+    stream: bool = False,
+    backend: str | LLMBackend | None = None,
+) -> str | Iterator[str]:
+    """Generate a response, answering repeated requests from a response cache.
+
+    `cache` defaults to the one set with :func:`set_default_response_cache`.
+    Requests sampled with a positive temperature are only cached when `seed` is
+    pinned; ``bypass_cache=True`` neither reads nor writes the cache.
+
+    With ``stream=True`` an iterator over the response text is returned
+    instead, see :func:`generate_stream`.
+
+    The request goes to the backend configured for the model, see
+    :func:`~pptlayout.llm.backends.configure_backends`, unless `backend`
+    names another one or is a backend instance.
+    """
     model_name = get_model_name(model_name=model_name, images=images)
+    check_images(images)
+    resolved = resolve_backend(model_name, backend)
+    resolved.check(images)
+
+    if cache is None:
+        cache = get_default_response_cache()
+    key = None
+    if cache is not None and not bypass_cache and is_deterministic(temperature, seed):
+        key = response_key(
+            model_name,
+            prompt,
+            images,
+            temperature,
+            max_tokens,
+            json,
+            seed,
+            resolved.identity(),
+        )
+        response = cache.get(key)
+        if response is not None:
+            return iter((response,)) if stream else response
 
+    if stream:
+        return generate_stream(
+            model_name=model_name,
+            prompt=prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            images=images,
+            json=json,
+            seed=seed,
+            cache=cache if key is not None else None,
+            cache_key=key,
+            backend=resolved,
+        )
     if images is None:
         response = generate_no_image(
             model_name=model_name,
@@ -26,13 +119,10 @@ def call_llm(
             temperature=temperature,
             max_tokens=max_tokens,
             json=json,
+            seed=seed,
+            backend=resolved,
         )
     else:
-        if images is None:
-            raise ValueError("image is None")
-        for image in images:
-            if not os.path.exists(image):
-                raise ValueError(f"Image file not found: {image}")
         response = generate_with_image(
             model_name=model_name,
             prompt=prompt,
@@ -40,42 +130,107 @@ def call_llm(
             max_tokens=max_tokens,
             images=images,
             json=json,
+            seed=seed,
+            backend=resolved,
         )
+    if key is not None:
+        cache.put(key, response)  # type: ignore[union-attr]
     return response
 
 
+def generate_stream(
+    model_name: str = "llama3.1:8b",
+    prompt: str = "",
+    temperature: float = 0.5,
+    max_tokens: int = 32000,
+    images: list[ImageInput] | None = None,
+    json: bool = False,
+    seed: int | None = None,
+    cache: ResponseCache | None = None,
+    cache_key: str | None = None,
+    backend: str | LLMBackend | None = None,
+) -> Iterator[str]:
+    """Yield the response text as the model produces it.
+
+    Closing the iterator early, e.g. once the parser has seen the closing
+    fence, aborts the request. Only a completely read response is cached.
+    A backend that cannot stream yields the whole response at once.
+    """
+    chunks = resolve_backend(model_name, backend).generate_stream(
+        model_name, prompt, temperature, max_tokens, images, json, seed
+    )
+
+    pieces = []
+    try:
+        for chunk in chunks:
+            pieces.append(chunk)
+            yield chunk
+    finally:
+        chunks.close()
+    if cache is not None and cache_key is not None:
+        cache.put(cache_key, "".join(pieces))
+
+
+def call_llm_batch(
+    requests: list[tuple[str, list[ImageInput] | None]],
+    model_name: str = "llama3.1:8b",
+    temperature: float = 0.5,
+    max_tokens: int = 32000,
+    json: bool = False,
+    batch_size: int = 8,
+    max_batch_tokens: int | None = None,
+    backend: str | LLMBackend | None = None,
+) -> list[str]:
+    """Answer many ``(prompt, images)`` requests, returning responses in order.
+
+    With a batching backend, such as the Hugging Face one, the requests are
+    grouped into batches of similar length and each batch is answered by a
+    single ``generate`` call. Other backends answer the requests one by one
+    through :func:`call_llm`.
+    """
+    resolved = resolve_backend(model_name, backend)
+    for _, images in requests:
+        check_images(images)
+        resolved.check(images)
+
+    if not resolved.capabilities.batching:
+        return [
+            call_llm(
+                model_name=model_name,
+                prompt=prompt,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                images=images,
+                json=json,
+                backend=resolved,
+            )
+            for prompt, images in requests
+        ]
+    return resolved.generate_batch(
+        requests,
+        model_name,
+        temperature,
+        max_tokens,
+        json,
+        batch_size,
+        max_batch_tokens,
+    )
+
+
 def generate_with_image(
     model_name: str = "llama3.2-vision:11b",
     prompt: str = "",
     temperature: float = 0.5,
     max_tokens: int = 32000,
-    images: list[str] | None = None,
+    images: list[ImageInput] | None = None,
     json: bool = False,
+    seed: int | None = None,
+    backend: str | LLMBackend | None = None,
 ) -> str:
     model_name = get_model_name(model_name=model_name, images=images)
-
-    if model_name == "Qwen2-VL-7B-Instruct":
-        response = generate_qwen2_vl(
-            prompt=prompt,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            # json=json,
-            images=images,
-        )
-        return response
-    else:
-        options = Options(
-            temperature=temperature,
-            num_ctx=max_tokens,
-        )
-        response = ollama.generate(
-            model=model_name,
-            prompt=prompt,
-            images=images,
-            options=options,
-            format="json" if json else "",
-        )["response"]
-        return response
+    return resolve_backend(model_name, backend).generate(
+        model_name, prompt, temperature, max_tokens, images, json, seed
+    )
 
 
 def generate_no_image(
@@ -84,27 +239,12 @@ def generate_no_image(
     temperature: float = 0.5,
     max_tokens: int = 32000,
     json: bool = False,
+    seed: int | None = None,
+    backend: str | LLMBackend | None = None,
 ) -> str:
-    if model_name == "Qwen2-VL-7B-Instruct":
-        response = generate_qwen2_vl(
-            prompt=prompt,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            # json=json,
-        )
-        return response
-    else:
-        options = Options(
-            temperature=temperature,
-            num_ctx=max_tokens,
-        )
-        response = ollama.generate(
-            model=model_name,
-            prompt=prompt,
-            options=options,
-            format="json" if json else "",
-        )["response"]
-        return response
+    return resolve_backend(model_name, backend).generate(
+        model_name, prompt, temperature, max_tokens, None, json, seed
+    )
 
 
 def generate_qwen2_vl(
@@ -112,97 +252,19 @@ def generate_qwen2_vl(
     temperature: float = 0.5,
     max_tokens: int = 32000,
     # json: bool = False,
-    images: list[str] | None = None,
+    images: list[ImageInput] | None = None,
+    model_path: str | None = None,
+    dtype: str = "auto",
+    device: str | None = None,
+    seed: int | None = None,
 ) -> str:
-    # model_dir = os.path.abspath("/data/tianyuhu/models/Qwen/Qwen2.5-Coder-7B-Instruct-GPTQ-Int4")
-    # model_dir = "/data/share_weight/Qwen2-VL-7B-Instruct"
-
-    # default: Load the model on the available device(s)
-    model = Qwen2VLForConditionalGeneration.from_pretrained(
-        model_dir,
-        torch_dtype="auto",
-        device_map="auto",
-    ).to("cuda")
-
-    min_pixels = 256 * 28 * 28
-    max_pixels = 1280 * 28 * 28
-    processor = AutoProcessor.from_pretrained(
-        model_dir, min_pixels=min_pixels, max_pixels=max_pixels
-    )
-    messages = generate_qwen2_vl_message(images=images, prompt=prompt)
-    text = processor.apply_chat_template(
-        messages, tokenize=False, add_generation_prompt=True
-    )
-    image_inputs, video_inputs = process_vision_info(messages)
-    inputs = processor(
-        text=[text],
-        images=image_inputs,
-        videos=video_inputs,
-        padding=True,
-        return_tensors="pt",
-    )
-    inputs = inputs.to("cuda")
-    # Inference: Generation of the output
-    generated_ids = model.generate(
-        **inputs,
-        max_new_tokens=max_tokens,
-        temperature=temperature,
-        # response_format={"type": "json_object"} if json else {"type": "text"},
+    backend = HuggingFaceBackend(model_path or DEFAULT_QWEN2_VL_DIR, dtype, device)
+    return backend.generate(
+        "Qwen2-VL-7B-Instruct", prompt, temperature, max_tokens, images, seed=seed
     )
-    generated_ids_trimmed = [
-        out_ids[len(in_ids) :]
-        for in_ids, out_ids in zip(inputs.input_ids, generated_ids)
-    ]
-    output_text = processor.batch_decode(
-        generated_ids_trimmed,
-        skip_special_tokens=True,
-        clean_up_tokenization_spaces=False,
-    )
-    # print(output_text)
-    return output_text
-
-
-def generate_qwen2_vl_message(
-    images: list[str] | None = None,
-    prompt: str = "",
-) -> list[dict]:
-    if images is None:
-        messages = [
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "text",
-                        "text": "What is the problem with the layout of this slide?",
-                    },
-                ],
-            }
-        ]
-    else:
-        content = []
-        for image in images:
-            content.append(
-                {
-                    "type": "image",
-                    "image": image,
-                }
-            )
-        content.append(
-            {
-                "type": "text",
-                "text": prompt,
-            }
-        )
-        messages = [
-            {
-                "role": "user",
-                "content": content,
-            }
-        ]
-    return messages
 
 
-def get_model_name(model_name: str | None, images: list[str] | None) -> str:
+def get_model_name(model_name: str | None, images: list[ImageInput] | None) -> str:
     if images is None:
         if model_name is None:
             return "llama3.1:8b"
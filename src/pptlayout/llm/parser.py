@@ -1,33 +1,43 @@
+import csv
 import json
+from collections.abc import Iterable, Iterator
 from typing import Union
 
 import regex as re
 
 
 class LazyDecoder(json.JSONDecoder):
+    """Decoder that repairs stray backslashes and trailing commas first."""
+
+    _invalid_escape = re.compile(r'(\\["\\/bfnrtu])|\\')
+    _trailing_comma = re.compile(r",(\s*[\]}])")
+
     def decode(self, s, **kwargs):
-        regex_replacements = [
-            (re.compile(r"([^\\])\\([^\\])"), r"\1\\\\\2"),
-            (re.compile(r",(\s*])"), r"\1"),
-        ]
-        for regex, replacement in regex_replacements:
-            s = regex.sub(replacement, s)
+        # Valid escapes are kept; any other backslash is escaped itself
+        s = self._invalid_escape.sub(lambda match: match.group(1) or "\\\\", s)
+        s = self._trailing_comma.sub(r"\1", s)
         return super().decode(s, **kwargs)
 
 
-def sanitize_json_string(json_string: str) -> str:
-    """Sanitize the JSON string by removing comments, escaping special characters, and ensuring valid JSON format."""
+# A string literal, a line comment or a control character
+_SANITIZE_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|//[^\n]*|[\x00-\x1F\x7F]', re.DOTALL)
+_CONTROL_CHARACTERS = dict.fromkeys([*range(0x20), 0x7F], " ")
+
 
-    # Remove comments (anything following // until the end of the line)
-    sanitized_string = re.sub(r"//.*", "", json_string)
+def _sanitize_match(match) -> str:
+    token = match.group()
+    if token.startswith('"'):
+        return token.translate(_CONTROL_CHARACTERS)
+    return "" if token.startswith("//") else " "
 
-    # Remove control characters
-    sanitized_string = re.sub(r"[\x00-\x1F\x7F]", " ", sanitized_string)
 
-    # Escape newline characters for consistency
-    sanitized_string = re.sub(r"\n", "\\n", sanitized_string)
+def sanitize_json_string(json_string: str) -> str:
+    """Sanitize the JSON string by removing comments and replacing control characters with spaces.
 
-    return sanitized_string
+    This is a single pass over the string. String literals are skipped, so a
+    ``//`` inside a string, as in a URL, is not taken for a comment.
+    """
+    return _SANITIZE_PATTERN.sub(_sanitize_match, json_string)
 
 
 def extract_json_with_markers(text: str) -> dict | None:
@@ -52,23 +62,67 @@ def extract_json_with_markers(text: str) -> dict | None:
         return None
 
 
-def extract_json_with_regex(text: str) -> Union[dict, None]:
-    # Regular expression to find JSON objects in the text (supports recursion)
-    json_pattern = r"\{(?:[^{}]|(?R))*\}"
+def find_json_spans(text: str) -> list[tuple[int, int]]:
+    """Return the ``(start, end)`` spans of the balanced ``{...}`` blocks in `text`.
 
-    # Search for the first JSON object match
-    match = re.search(json_pattern, text)
+    Braces inside string literals are ignored. Blocks nested in another block
+    are not returned, and an unclosed ``{`` is skipped so that the balanced
+    blocks after it are still found. This is a single linear pass.
+    """
+    spans: list[tuple[int, int]] = []
+    opened: list[int] = []
+    in_string = escape = False
+    for index, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == "{":
+            opened.append(index)
+        elif char == "}" and opened:
+            start = opened.pop()
+            # Blocks closed earlier inside this one are nested in it
+            while spans and spans[-1][0] > start:
+                spans.pop()
+            spans.append((start, index + 1))
+        elif char == '"' and opened:
+            in_string = True
+    return spans
 
-    if match:
-        try:
-            # Parse the JSON string and return it as a dictionary
-            return json.loads(match.group())
-        except json.JSONDecodeError:
-            print("Invalid JSON format detected.")
-            return None
+
+def decode_json_span(text: str, start: int, end: int) -> dict | None:
+    """Decode the object in ``text[start:end]``, repairing it only if needed."""
+    try:
+        json_data, json_end = json.JSONDecoder().raw_decode(text, start)
+        if json_end == end:
+            return json_data
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(sanitize_json_string(text[start:end]), cls=LazyDecoder)
+    except json.JSONDecodeError:
+        return None
+
+
+def extract_json_with_regex(text: str) -> Union[dict, None]:
+    """Return the first decodable JSON object in `text`.
+
+    Candidate objects come from :func:`find_json_spans`, which runs in linear
+    time however unbalanced the braces of the text are.
+    """
+    spans = find_json_spans(text)
+    for start, end in spans:
+        json_data = decode_json_span(text, start, end)
+        if json_data is not None:
+            return json_data
+    if spans:
+        print("Invalid JSON format detected.")
     else:
         print("No JSON object found in the input text.")
-        return None
+    return None
 
 
 def extract_json(text: str) -> dict | None:
@@ -78,3 +132,254 @@ def extract_json(text: str) -> dict | None:
     if json_data is None:
         raise ValueError("No valid JSON object found in the input text.")
     return json_data
+
+
+COMPACT_GEOMETRY_COLUMNS = ("left", "top", "width", "height")
+
+
+def _connector_endpoints(shape: dict) -> dict:
+    """Return the endpoints of a connector moved to its box, keeping its direction."""
+    flip_h = shape["begin_x"] > shape["end_x"]
+    flip_v = shape["begin_y"] > shape["end_y"]
+    right, bottom = shape["left"] + shape["width"], shape["top"] + shape["height"]
+    return {
+        "begin_x": right if flip_h else shape["left"],
+        "begin_y": bottom if flip_v else shape["top"],
+        "end_x": shape["left"] if flip_h else right,
+        "end_y": shape["top"] if flip_v else bottom,
+    }
+
+
+def _compact_type(value: str) -> dict:
+    shape_type, _, placeholder_type = value.partition(":")
+    if placeholder_type:
+        return {"shape_type": shape_type, "placeholder_type": placeholder_type}
+    return {"shape_type": shape_type}
+
+
+def extract_compact_layout(text: str, original_layout: dict | None = None) -> list:
+    """Parse the CSV layout table of a reply to a compact layout prompt.
+
+    Only the ``id`` and geometry columns are read. With `original_layout`, each
+    row updates a copy of the original shape with the same id, so the result
+    has every key the extractors produce, and the endpoints of a connector
+    follow its new box in their original direction; rows for unknown ids are
+    dropped. Without it, the shape types are read from the ``type`` column.
+    """
+    start_index = text.find("```csv")
+    if start_index != -1:
+        start_index += len("```csv")
+        end_index = text.find("```", start_index)
+        table = text[start_index : end_index if end_index != -1 else len(text)]
+    else:
+        header_index = text.find("id,")
+        if header_index == -1:
+            raise ValueError("No layout table found in the input text.")
+        table = text[header_index:]
+
+    rows = csv.DictReader(line for line in table.strip().splitlines() if line.strip())
+    if rows.fieldnames is None or not {"id", *COMPACT_GEOMETRY_COLUMNS} <= {
+        name.strip() for name in rows.fieldnames
+    }:
+        raise ValueError("Layout table is missing the id or geometry columns.")
+
+    originals = {}
+    if original_layout is not None:
+        originals = {shape["shape_id"]: shape for shape in original_layout["shapes"]}
+    shapes = []
+    for row in rows:
+        row = {key.strip(): (value or "").strip() for key, value in row.items() if key}
+        try:
+            shape_id = int(row["id"])
+            geometry = {
+                key: _parse_number(row[key]) for key in COMPACT_GEOMETRY_COLUMNS
+            }
+        except ValueError:
+            continue
+        if original_layout is not None:
+            if shape_id not in originals:
+                continue
+            shape = {**originals[shape_id], **geometry}
+            if "begin_x" in shape:
+                shape.update(_connector_endpoints(shape))
+        else:
+            shape = {
+                "shape_id": shape_id,
+                **_compact_type(row.get("type", "")),
+                **geometry,
+            }
+        shapes.append(shape)
+    return shapes
+
+
+def _parse_number(value: str) -> int | float:
+    number = float(value)
+    return int(number) if number.is_integer() and "." not in value else number
+
+
+class IncrementalShapeParser:
+    """Parse a streamed reply, emitting shape objects as soon as they close.
+
+    Feed the text chunk by chunk; :meth:`feed` returns the objects of the
+    ``"shapes"`` array completed by that chunk. Parsing starts at the opening
+    ```` ```json ```` fence, or at the first ``{`` if the reply has no fence,
+    and :attr:`done` turns true at the closing fence or once the top-level
+    object closes, after which the rest of the reply can be discarded. Outside
+    a fence, an object without a ``"shapes"`` array, such as a ``{title}`` in
+    the prose, is skipped, and a fence opening later restarts the parse. Line
+    comments outside strings are skipped. Shapes that are not valid JSON are
+    counted in :attr:`errors` and dropped.
+    """
+
+    def __init__(self):
+        self.done = False
+        self.errors = 0
+        self._chunks: list[str] = []
+        self._backticks = 0
+        self._restart(fenced=False)
+
+    def _restart(self, fenced: bool) -> None:
+        """Drop the partial parse, then wait for a ``{`` or parse a fenced block."""
+        self._started = self._fenced = fenced
+        self._skip_line = fenced  # fence language tag or comment
+        self._slash = False
+        self._in_string = False
+        self._escape = False
+        self._string: list[str] = []
+        self._last_string: str | None = None
+        self._after_colon = False
+        # Open containers: the key of each array, None for objects
+        self._stack: list[str | None] = []
+        self._shape: list[str] | None = None
+        self._shape_depth = 0
+        self._has_shapes = False
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> list[dict]:
+        self._chunks.append(chunk)
+        shapes: list[dict] = []
+        for char in chunk:
+            if self.done:
+                break
+            shape = self._feed_char(char)
+            if shape is not None:
+                shapes.append(shape)
+        return shapes
+
+    def _feed_char(self, char: str) -> dict | None:
+        if self._skip_line:
+            self._skip_line = char != "\n"
+            return None
+        if self._in_string:
+            if char == "\n" and not self._fenced:
+                # JSON strings hold no line breaks: this brace was prose
+                self._restart(fenced=False)
+                return None
+            self._feed_string_char(char)
+            return None
+
+        if char == "`":
+            self._backticks += 1
+            if self._backticks == 3:
+                self._backticks = 0
+                if self._fenced:
+                    self.done = True
+                else:
+                    self._restart(fenced=True)
+            return None
+        self._backticks = 0
+        if self._slash:
+            self._slash = False
+            if char == "/":
+                self._skip_line = True
+                return None
+            self._record("/")
+        if char == "/":
+            self._slash = True
+            return None
+        if not self._started:
+            if char != "{":
+                return None
+            self._started = True
+        return self._feed_structural_char(char)
+
+    def _feed_string_char(self, char: str) -> None:
+        self._record(char)
+        if self._escape:
+            self._escape = False
+        elif char == "\\":
+            self._escape = True
+        elif char == '"':
+            self._in_string = False
+            self._last_string = "".join(self._string)
+        else:
+            self._string.append(char)
+
+    def _feed_structural_char(self, char: str) -> dict | None:
+        shape = None
+        if char == "{" and self._shape is None and self._stack[-1:] == ["shapes"]:
+            self._shape = []
+            self._shape_depth = len(self._stack)
+        self._record(char)
+        if char == '"':
+            self._in_string = True
+            self._string = []
+        elif char == "{":
+            self._stack.append(None)
+        elif char == "[":
+            self._stack.append(self._last_string if self._after_colon else "")
+            self._has_shapes = self._has_shapes or self._stack[-1] == "shapes"
+        elif char in "}]":
+            if self._stack:
+                self._stack.pop()
+            if self._shape is not None and len(self._stack) == self._shape_depth:
+                shape = self._finish_shape()
+            if not self._stack:
+                if self._fenced or self._has_shapes:
+                    self.done = True
+                else:
+                    self._restart(fenced=False)
+        if not char.isspace():
+            self._after_colon = char == ":"
+        return shape
+
+    def _record(self, char: str) -> None:
+        if self._shape is not None:
+            self._shape.append(char)
+
+    def _finish_shape(self) -> dict | None:
+        shape_string = "".join(self._shape)  # type: ignore[arg-type]
+        self._shape = None
+        try:
+            return json.loads(shape_string)
+        except json.JSONDecodeError:
+            pass
+        try:
+            return json.loads(shape_string, cls=LazyDecoder)
+        except json.JSONDecodeError:
+            self.errors += 1
+            return None
+
+
+def stream_shapes(chunks: Iterable[str]) -> Iterator[dict]:
+    """Yield shapes from a streamed reply and stop reading it at the end.
+
+    The chunk iterator is closed as soon as the parser is done, which aborts
+    a streaming :func:`call_llm` request instead of generating the rest of the
+    reply.
+    """
+    parser = IncrementalShapeParser()
+    iterator = iter(chunks)
+    try:
+        for chunk in iterator:
+            yield from parser.feed(chunk)
+            if parser.done:
+                break
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
@@ -1,4 +1,6 @@
-from json import dumps
+import csv
+import io
+from json import dumps, loads
 
 slide_layout_suggestion_prompts = (
     "Given an input in the form of a JSON format describing the layout of a PowerPoint slide, "
@@ -39,22 +41,140 @@ vision_slide_layout_suggestion_prompts = (
 )
 
 
+compact_slide_layout_suggestion_prompts = (
+    "Given a table describing the layout of a PowerPoint slide, "
+    + "analyze the input and suggest an improved version of the layout. \n"
+    + "Only change existing layout parameters, such as position and size, without adding or removing elements. \n"
+    + "The improvements should enhance the slide's readability, visual appeal, and overall coherence. \n"
+    + "Ensure that consistent alignment, spacing, visual hierarchy, and design principles are maintained. \n"
+    + "The table is CSV with a header row and one row per shape; lengths are in {}. \n"
+    + "The slide width is {} and the slide height is {}. \n"
+    + "The top left corner of the slide is considered the origin (0, 0). \n"
+    + "The input table is: \n"
+    + "```csv\n"
+    + "{}"
+    + "```\n"
+    + "Now generate the output table with the same header and one row for every shape id, inside a ```csv block: \n"
+)
+
+vision_compact_slide_layout_suggestion_prompts = (
+    "Given an image of a slide with grid for you to better locate shapes and a table describing the layout of a PowerPoint slide, "
+    + "analyze the input and suggest an improved version of the layout. \n"
+    + "Only change existing layout parameters, such as position and size, without adding or removing elements. \n"
+    + "The improvements should enhance the slide's readability, visual appeal, and overall coherence. \n"
+    + "Ensure that consistent alignment, spacing, visual hierarchy, and design principles are maintained. \n"
+    + "The table is CSV with a header row and one row per shape; lengths are in {}. \n"
+    + "The slide width is {} and the slide height is {}. \n"
+    + "The top left corner of the slide is considered the origin (0, 0). \n"
+    + "The input table is: \n"
+    + "```csv\n"
+    + "{}"
+    + "```\n"
+    + "Now generate the output table with the same header and one row for every shape id, inside a ```csv block: \n"
+)
+
+# Columns of the compact layout encoding. Only `id` and the geometry are read
+# back from the model's reply; the other columns give the model context.
+COMPACT_LAYOUT_COLUMNS = ("id", "type", "left", "top", "width", "height", "text")
+
+
+def _compact_number(value: int | float, decimals: int) -> int | float:
+    rounded = round(value, decimals)
+    return int(rounded) if float(rounded).is_integer() else rounded
+
+
+def encode_layout_compact(
+    slide_layout: dict, decimals: int = 1, max_text_chars: int | None = 40
+) -> str:
+    """Encode a slide's shapes as CSV with a header row.
+
+    Coordinates are rounded to `decimals`, text is shortened to
+    `max_text_chars` and line breaks are written as spaces, so each shape
+    takes one short line instead of a dozen lines of indented JSON.
+    Placeholders are listed with their placeholder type, as in
+    ``PLACEHOLDER:TITLE``.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(COMPACT_LAYOUT_COLUMNS)
+    for shape in slide_layout["shapes"]:
+        text = " ".join(shape.get("text", "").split())
+        if max_text_chars is not None and len(text) > max_text_chars:
+            text = text[: max_text_chars - 3] + "..."
+        placeholder_type = shape.get("placeholder_type")
+        writer.writerow(
+            (
+                shape["shape_id"],
+                (
+                    f"{shape['shape_type']}:{placeholder_type}"
+                    if placeholder_type is not None
+                    else shape["shape_type"]
+                ),
+                _compact_number(shape["left"], decimals),
+                _compact_number(shape["top"], decimals),
+                _compact_number(shape["width"], decimals),
+                _compact_number(shape["height"], decimals),
+                text,
+            )
+        )
+    return buffer.getvalue()
+
+
+def _layout_unit(slide_layout) -> str:
+    # Slide records carry the unit, slide dicts only on each shape
+    try:
+        return slide_layout["measurement_unit"]
+    except KeyError:
+        shapes = slide_layout["shapes"]
+        return shapes[0]["measurement_unit"] if shapes else "emu"
+
+
 def build_slide_layout_suggestion_prompts(
-    json_input: str,
+    json_input: str | dict,
     slide_width: int | float,
     slide_height: int | float,
     # suggestion: str,
     image_flag: bool = False,
+    compact: bool = False,
+    measurement_unit: str | None = None,
 ) -> str:
+    """Build the layout suggestion prompt for one slide.
+
+    `json_input` is the slide's layout dict, or that dict already dumped to a
+    JSON string, which is used as is instead of being encoded a second time.
+    With ``compact=True`` the layout is sent as a CSV table instead, see
+    :func:`encode_layout_compact`; parse the reply with
+    :func:`pptlayout.llm.parser.extract_compact_layout`. The unit the lengths
+    are given in is `measurement_unit`, by default the one the slide was
+    extracted in. `image_flag` selects the prompt for a vision model shown the
+    slide image in either case.
+    """
+    if compact:
+        slide_layout = loads(json_input) if isinstance(json_input, str) else json_input
+        if measurement_unit is None:
+            measurement_unit = _layout_unit(slide_layout)
+        template = (
+            vision_compact_slide_layout_suggestion_prompts
+            if image_flag
+            else compact_slide_layout_suggestion_prompts
+        )
+        return template.format(
+            measurement_unit,
+            slide_width,
+            slide_height,
+            encode_layout_compact(slide_layout),
+        )
+    if not isinstance(json_input, str):
+        json_input = dumps(json_input, indent=4)
     if image_flag is False:
         return slide_layout_suggestion_prompts.format(
             slide_width,
             slide_height,
-            dumps(json_input, indent=4),
+            json_input,
         )
     else:
         return vision_slide_layout_suggestion_prompts.format(
             slide_width,
             slide_height,
-            dumps(json_input, indent=4),
+            json_input,
         )
@@ -0,0 +1,93 @@
+import hashlib
+import json
+
+from pptlayout.cache import CacheStats, SQLiteCache
+
+from .images import ImageInput, image_digest
+
+# Bump to drop every cached response, e.g. when the prompts change meaning
+RESPONSE_CACHE_VERSION = "2"
+
+DEFAULT_MAX_BYTES = 256 << 20
+
+
+def is_deterministic(temperature: float, seed: int | None) -> bool:
+    """Whether a request can be answered from the cache.
+
+    Sampling with a positive temperature gives a different response on every
+    call unless the seed is pinned.
+    """
+    return temperature <= 0 or seed is not None
+
+
+def response_key(
+    model_name: str,
+    prompt: str,
+    images: list[ImageInput] | None,
+    temperature: float,
+    max_tokens: int,
+    json_format: bool,
+    seed: int | None = None,
+    backend: dict | None = None,
+) -> str:
+    """Return the cache key of a request.
+
+    Images are identified by the hash of their content, so a re-rendered but
+    identical slide image still hits, whether it is passed as a file or as a
+    buffer. `backend` is the :meth:`~pptlayout.llm.backends.LLMBackend.identity`
+    of the backend answering, so that another server or checkpoint serving the
+    same model name does not share its responses.
+    """
+    payload = [
+        backend,
+        model_name,
+        prompt,
+        [image_digest(image) for image in images or []],
+        float(temperature),
+        max_tokens,
+        json_format,
+        seed,
+    ]
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+
+class ResponseCache:
+    """On-disk, size-bounded cache of LLM responses for :func:`call_llm`."""
+
+    def __init__(self, path: str, max_bytes: int | None = DEFAULT_MAX_BYTES):
+        self._store = SQLiteCache(path, RESPONSE_CACHE_VERSION, max_bytes)
+
+    def close(self) -> None:
+        self._store.close()
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get(self, key: str) -> str | None:
+        value = self._store.get(key)
+        return None if value is None else value.decode()
+
+    def put(self, key: str, response: str) -> None:
+        self._store.put(key, response.encode())
+
+    def invalidate(self) -> None:
+        self._store.invalidate()
+
+    def stats(self) -> CacheStats:
+        return self._store.stats()
+
+
+_default_cache: ResponseCache | None = None
+
+
+def set_default_response_cache(cache: ResponseCache | None) -> None:
+    """Set the cache :func:`call_llm` uses when none is passed explicitly."""
+    global _default_cache
+    _default_cache = cache
+
+
+def get_default_response_cache() -> ResponseCache | None:
+    return _default_cache
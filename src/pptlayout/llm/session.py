@@ -0,0 +1,281 @@
+import gc
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Generator
+from dataclasses import dataclass
+from typing import Any
+
+MIN_PIXELS = 256 * 28 * 28
+MAX_PIXELS = 1280 * 28 * 28
+
+
+def cuda_available() -> bool:
+    try:
+        import torch
+    except ImportError:
+        return False
+    return torch.cuda.is_available()
+
+
+def select_device(device: str | None = None) -> str:
+    """Return `device`, or the best available one when it is None.
+
+    A CUDA device is only returned when CUDA is actually available; otherwise
+    the session falls back to the CPU.
+    """
+    if device is None or device.startswith("cuda"):
+        if cuda_available():
+            return device or "cuda"
+        return "cpu"
+    return device
+
+
+def load_qwen2_vl(model_dir: str, dtype: str, device: str) -> tuple[Any, Any]:
+    """Load a Qwen2-VL model and its processor from `model_dir`."""
+    from transformers import AutoProcessor, Qwen2VLForConditionalGeneration
+
+    if device.startswith("cuda"):
+        model = Qwen2VLForConditionalGeneration.from_pretrained(
+            model_dir, torch_dtype=dtype, device_map="auto"
+        )
+    else:
+        model = Qwen2VLForConditionalGeneration.from_pretrained(
+            model_dir, torch_dtype=dtype
+        ).to(device)
+    model.eval()
+    processor = AutoProcessor.from_pretrained(
+        model_dir, min_pixels=MIN_PIXELS, max_pixels=MAX_PIXELS
+    )
+    return model, processor
+
+
+@dataclass
+class ModelSession:
+    """A loaded model and processor, kept alive between calls."""
+
+    model_dir: str
+    dtype: str
+    device: str
+    model: Any
+    processor: Any
+
+    def generate(
+        self,
+        messages: list[dict],
+        temperature: float = 0.5,
+        max_tokens: int = 32000,
+        seed: int | None = None,
+    ) -> str:
+        return self.generate_batch([messages], temperature, max_tokens, seed)[0]
+
+    def prompt_length(self, messages: list[dict]) -> int:
+        """Estimate the number of input tokens of a conversation."""
+        text = self.processor.apply_chat_template(
+            messages, tokenize=False, add_generation_prompt=True
+        )
+        images = sum(
+            item.get("type") in ("image", "video")
+            for message in messages
+            for item in message["content"]
+        )
+        return len(self.processor.tokenizer(text).input_ids) + images * (
+            MAX_PIXELS // (28 * 28)
+        )
+
+    def _prepare_inputs(self, messages_list: list[list[dict]], seed: int | None):
+        texts = [
+            self.processor.apply_chat_template(
+                messages, tokenize=False, add_generation_prompt=True
+            )
+            for messages in messages_list
+        ]
+        image_inputs = video_inputs = None
+        if any(
+            item.get("type") in ("image", "video")
+            for messages in messages_list
+            for message in messages
+            for item in message["content"]
+        ):
+            from qwen_vl_utils import process_vision_info
+
+            image_inputs, video_inputs = process_vision_info(
+                [message for messages in messages_list for message in messages]
+            )
+        # Decoder-only models must be left-padded to generate in a batch
+        tokenizer = self.processor.tokenizer
+        padding_side, tokenizer.padding_side = tokenizer.padding_side, "left"
+        try:
+            inputs = self.processor(
+                text=texts,
+                images=image_inputs,
+                videos=video_inputs,
+                padding=True,
+                return_tensors="pt",
+            )
+        finally:
+            tokenizer.padding_side = padding_side
+        if seed is not None:
+            import torch
+
+            torch.manual_seed(seed)
+        return inputs.to(self.model.device)
+
+    def generate_batch(
+        self,
+        messages_list: list[list[dict]],
+        temperature: float = 0.5,
+        max_tokens: int = 32000,
+        seed: int | None = None,
+    ) -> list[str]:
+        """Run one padded ``generate`` call over several conversations."""
+        inputs = self._prepare_inputs(messages_list, seed)
+        # Inference: Generation of the output
+        generated_ids = self.model.generate(
+            **inputs,
+            max_new_tokens=max_tokens,
+            temperature=temperature,
+        )
+        generated_ids_trimmed = [
+            out_ids[len(in_ids) :]
+            for in_ids, out_ids in zip(inputs.input_ids, generated_ids)
+        ]
+        return self.processor.batch_decode(
+            generated_ids_trimmed,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=False,
+        )
+
+    def generate_stream(
+        self,
+        messages: list[dict],
+        temperature: float = 0.5,
+        max_tokens: int = 32000,
+        seed: int | None = None,
+    ) -> Generator[str, None, None]:
+        """Yield the response text piece by piece while it is generated.
+
+        Generation runs in a background thread. Closing the iterator early
+        stops generation at the next token.
+        """
+        from transformers import (
+            StoppingCriteria,
+            StoppingCriteriaList,
+            TextIteratorStreamer,
+        )
+
+        class StopWhenClosed(StoppingCriteria):
+            def __call__(self, input_ids, scores, **kwargs) -> bool:
+                return stopped.is_set()
+
+        stopped = threading.Event()
+        inputs = self._prepare_inputs([messages], seed)
+        streamer = TextIteratorStreamer(
+            self.processor.tokenizer,
+            skip_prompt=True,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=False,
+        )
+        thread = threading.Thread(
+            target=self.model.generate,
+            kwargs={
+                **inputs,
+                "max_new_tokens": max_tokens,
+                "temperature": temperature,
+                "streamer": streamer,
+                "stopping_criteria": StoppingCriteriaList([StopWhenClosed()]),
+            },
+            daemon=True,
+        )
+        thread.start()
+        finished = False
+        try:
+            for text in streamer:
+                if text:
+                    yield text
+            finished = True
+        finally:
+            if not finished:
+                stopped.set()
+                # Drain the streamer so the generation thread is never blocked
+                for _ in streamer:
+                    pass
+            thread.join()
+
+
+Loader = Callable[[str, str, str], tuple[Any, Any]]
+
+
+class ModelRegistry:
+    """Process-wide cache of :class:`ModelSession` objects.
+
+    Sessions are keyed by the absolute model directory and the dtype, loaded on
+    first use and kept until they are unloaded, or evicted as the least
+    recently used session once more than `max_sessions` are loaded.
+    """
+
+    def __init__(self, loader: Loader = load_qwen2_vl, max_sessions: int | None = 1):
+        self._loader = loader
+        self._max_sessions = max_sessions
+        self._sessions: OrderedDict[tuple[str, str], ModelSession] = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(model_dir: str, dtype: str) -> tuple[str, str]:
+        return os.path.abspath(model_dir), dtype
+
+    def get(
+        self, model_dir: str, dtype: str = "auto", device: str | None = None
+    ) -> ModelSession:
+        key = self._key(model_dir, dtype)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+                return session
+            device = select_device(device)
+            model, processor = self._loader(key[0], dtype, device)
+            session = ModelSession(key[0], dtype, device, model, processor)
+            self._sessions[key] = session
+            if self._max_sessions is not None:
+                while len(self._sessions) > self._max_sessions:
+                    self._release(self._sessions.popitem(last=False)[1])
+            return session
+
+    def unload(self, model_dir: str, dtype: str = "auto") -> bool:
+        with self._lock:
+            session = self._sessions.pop(self._key(model_dir, dtype), None)
+        if session is None:
+            return False
+        self._release(session)
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            self._release(session)
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return self._key(*key) in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @staticmethod
+    def _release(session: ModelSession) -> None:
+        device = session.device
+        session.model = session.processor = None
+        gc.collect()
+        if device.startswith("cuda"):
+            import torch
+
+            torch.cuda.empty_cache()
+
+
+_registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    return _registry
@@ -0,0 +1,324 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+from pptlayout.spatial import GridIndex
+
+METRIC_NAMES = ("overlap", "out_of_bounds", "alignment", "spacing", "balance")
+
+# Columns of a boxes array, in the order of the extracted shape keys
+BOX_KEYS = ("left", "top", "width", "height")
+
+# Above this many shapes, pairwise metrics use a spatial index
+DENSE_SHAPES = 128
+
+
+def leaf_shapes(shapes: Sequence) -> list:
+    """Return the shapes of a slide without the group shapes.
+
+    The extractors list each group next to its members, in slide coordinates,
+    so scoring the group as well would count it as overlapping its own members.
+    """
+    return [shape for shape in shapes if shape.get("shape_type") != "GROUP"]
+
+
+def shape_boxes(shapes: Sequence) -> np.ndarray:
+    """Return the ``(n, 4)`` array of ``left, top, width, height`` of `shapes`.
+
+    `shapes` are extracted shape dicts or records, all in the same unit.
+    """
+    if not shapes:
+        return np.zeros((0, 4))
+    return np.array([[shape[key] for key in BOX_KEYS] for shape in shapes], float)
+
+
+def pad_boxes(boxes_list: Sequence[np.ndarray]) -> tuple[np.ndarray, np.ndarray]:
+    """Stack per-slide boxes into a ``(slides, n, 4)`` array and its mask.
+
+    Slides are padded with empty boxes to the largest shape count; the boolean
+    ``(slides, n)`` mask is true for real shapes.
+    """
+    max_shapes = max((len(boxes) for boxes in boxes_list), default=0)
+    padded = np.zeros((len(boxes_list), max_shapes, 4))
+    mask = np.zeros((len(boxes_list), max_shapes), bool)
+    for index, boxes in enumerate(boxes_list):
+        padded[index, : len(boxes)] = boxes
+        mask[index, : len(boxes)] = True
+    return padded, mask
+
+
+def _batched(boxes: np.ndarray, mask: np.ndarray | None):
+    boxes = np.asarray(boxes, float)
+    single = boxes.ndim == 2
+    if single:
+        boxes = boxes[None]
+    if mask is None:
+        mask = np.ones(boxes.shape[:2], bool)
+    elif single:
+        mask = np.asarray(mask, bool)[None]
+    return boxes, mask, single
+
+
+def _result(values: np.ndarray, single: bool) -> np.ndarray | float:
+    return float(values[0]) if single else values
+
+
+def _edges(boxes: np.ndarray) -> tuple[np.ndarray, ...]:
+    left, top = boxes[..., 0], boxes[..., 1]
+    return left, top, left + boxes[..., 2], top + boxes[..., 3]
+
+
+def _pair_mask(mask: np.ndarray) -> np.ndarray:
+    pairs = mask[:, :, None] & mask[:, None, :]
+    return pairs & ~np.eye(mask.shape[1], dtype=bool)
+
+
+def overlap_area(
+    boxes: np.ndarray, mask: np.ndarray | None = None
+) -> np.ndarray | float:
+    """Return the summed intersection area of every pair of shapes.
+
+    `boxes` is the ``(n, 4)`` array of one slide, or a padded ``(slides, n, 4)``
+    batch with its mask, for which one value per slide is returned. Batches
+    padded to more than :data:`DENSE_SHAPES` shapes go through a
+    :class:`~pptlayout.spatial.GridIndex` per slide instead of testing every
+    pair.
+    """
+    boxes, mask, single = _batched(boxes, mask)
+    if boxes.shape[1] > DENSE_SHAPES:
+        return _result(
+            np.array(
+                [
+                    GridIndex(slide[valid]).overlap_area()
+                    for slide, valid in zip(boxes, mask)
+                ]
+            ),
+            single,
+        )
+    left, top, right, bottom = _edges(boxes)
+    widths = np.minimum(right[:, :, None], right[:, None, :]) - np.maximum(
+        left[:, :, None], left[:, None, :]
+    )
+    heights = np.minimum(bottom[:, :, None], bottom[:, None, :]) - np.maximum(
+        top[:, :, None], top[:, None, :]
+    )
+    areas = np.clip(widths, 0, None) * np.clip(heights, 0, None)
+    # Each pair appears twice in the symmetric matrix
+    return _result(np.where(_pair_mask(mask), areas, 0).sum(axis=(1, 2)) / 2, single)
+
+
+def _clipped_boxes(
+    boxes: np.ndarray, slide_width, slide_height
+) -> tuple[np.ndarray, ...]:
+    slide_width = np.asarray(slide_width, float).reshape(-1, 1)
+    slide_height = np.asarray(slide_height, float).reshape(-1, 1)
+    left, top, right, bottom = _edges(boxes)
+    return (
+        np.clip(left, 0, slide_width),
+        np.clip(top, 0, slide_height),
+        np.clip(right, 0, slide_width),
+        np.clip(bottom, 0, slide_height),
+    )
+
+
+def out_of_bounds_area(
+    boxes: np.ndarray,
+    slide_width: float | np.ndarray,
+    slide_height: float | np.ndarray,
+    mask: np.ndarray | None = None,
+) -> np.ndarray | float:
+    """Return the total area of the shapes that lies outside the slide."""
+    boxes, mask, single = _batched(boxes, mask)
+    left, top, right, bottom = _clipped_boxes(boxes, slide_width, slide_height)
+    inside = (right - left) * (bottom - top)
+    outside = np.abs(boxes[..., 2] * boxes[..., 3]) - inside
+    return _result(np.where(mask, outside, 0).sum(axis=1), single)
+
+
+def alignment_score(
+    boxes: np.ndarray, tolerance: float | np.ndarray, mask: np.ndarray | None = None
+) -> np.ndarray | float:
+    """Return the fraction of left, center and right edges shared with another shape.
+
+    An edge is aligned when the same edge of some other shape lies within
+    `tolerance` of it. A slide with fewer than two shapes scores 1.
+    """
+    boxes, mask, single = _batched(boxes, mask)
+    left, _, right, _ = _edges(boxes)
+    edges = np.stack([left, (left + right) / 2, right], axis=-1)
+    # The closest edge to each edge is its neighbour in sorted order
+    edges = np.sort(np.where(mask[..., None], edges, np.inf), axis=1)
+    tolerance = np.asarray(tolerance, float).reshape(-1, 1, 1)
+    with np.errstate(invalid="ignore"):
+        close = np.diff(edges, axis=1) <= tolerance
+    padding = np.zeros_like(close[:, :1])
+    aligned = np.concatenate([padding, close], 1) | np.concatenate([close, padding], 1)
+    counts = mask.sum(axis=1)
+    scores = aligned.sum(axis=(1, 2)) / np.maximum(3 * counts, 1)
+    return _result(np.where(counts < 2, 1.0, scores), single)
+
+
+def spacing_uniformity(
+    boxes: np.ndarray, mask: np.ndarray | None = None
+) -> np.ndarray | float:
+    """Score how evenly shapes are spaced from top to bottom, between 0 and 1.
+
+    Shapes are sorted by their top edge and the vertical gaps between
+    consecutive shapes, clipped at zero, are compared: equal gaps score 1, and
+    the score falls with the coefficient of variation of the gaps. A slide
+    with fewer than two gaps scores 1.
+    """
+    boxes, mask, single = _batched(boxes, mask)
+    _, top, _, bottom = _edges(boxes)
+    order = np.argsort(np.where(mask, top, np.inf), axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    bottom = np.take_along_axis(bottom, order, axis=1)
+    valid = np.take_along_axis(mask, order, axis=1)
+    gaps = np.clip(top[:, 1:] - bottom[:, :-1], 0, None)
+    valid = valid[:, 1:] & valid[:, :-1]
+    counts = valid.sum(axis=1)
+    safe_counts = np.maximum(counts, 1)
+    mean = np.where(valid, gaps, 0).sum(axis=1) / safe_counts
+    variance = np.where(valid, (gaps - mean[:, None]) ** 2, 0).sum(axis=1)
+    std = np.sqrt(variance / safe_counts)
+    variation = np.divide(std, mean, out=np.zeros_like(std), where=mean > 0)
+    return _result(np.where(counts < 2, 1.0, 1 / (1 + variation)), single)
+
+
+def whitespace_balance(
+    boxes: np.ndarray,
+    slide_width: float | np.ndarray,
+    slide_height: float | np.ndarray,
+    mask: np.ndarray | None = None,
+) -> np.ndarray | float:
+    """Score how centered the visual weight of the shapes is, between 0 and 1.
+
+    The area-weighted centroid of the on-slide part of the shapes is compared
+    with the slide center: 1 when they coincide, 0 when the centroid sits in a
+    corner. A slide without visible area scores 1.
+    """
+    boxes, mask, single = _batched(boxes, mask)
+    slide_width = np.asarray(slide_width, float).reshape(-1)
+    slide_height = np.asarray(slide_height, float).reshape(-1)
+    left, top, right, bottom = _clipped_boxes(boxes, slide_width, slide_height)
+    areas = np.where(mask, (right - left) * (bottom - top), 0)
+    total = areas.sum(axis=1)
+    safe_total = np.where(total > 0, total, 1)
+    center_x = (areas * (left + right) / 2).sum(axis=1) / safe_total
+    center_y = (areas * (top + bottom) / 2).sum(axis=1) / safe_total
+    offset_x = (center_x - slide_width / 2) / (slide_width / 2)
+    offset_y = (center_y - slide_height / 2) / (slide_height / 2)
+    balance = 1 - np.hypot(offset_x, offset_y) / np.sqrt(2)
+    return _result(np.where(total > 0, balance, 1.0), single)
+
+
+def _score_boxes(
+    boxes: np.ndarray,
+    mask: np.ndarray,
+    slide_width: np.ndarray,
+    slide_height: np.ndarray,
+    align_tolerance: float,
+) -> dict[str, np.ndarray]:
+    slide_area = slide_width * slide_height
+    return {
+        "overlap": overlap_area(boxes, mask) / slide_area,
+        "out_of_bounds": out_of_bounds_area(boxes, slide_width, slide_height, mask)
+        / slide_area,
+        "alignment": alignment_score(boxes, align_tolerance * slide_width, mask),
+        "spacing": spacing_uniformity(boxes, mask),
+        "balance": whitespace_balance(boxes, slide_width, slide_height, mask),
+    }
+
+
+def score_layout(
+    slide_layout: dict,
+    slide_width: int | float,
+    slide_height: int | float,
+    align_tolerance: float = 0.01,
+) -> dict[str, float]:
+    """Return the layout metrics of one extracted slide.
+
+    ``overlap`` and ``out_of_bounds`` are areas as a fraction of the slide area;
+    the other metrics are scores between 0 and 1 where higher is better.
+    Edges count as aligned within `align_tolerance` times the slide width.
+    Group shapes are left out, see :func:`leaf_shapes`.
+    """
+    scores = score_slides([slide_layout], slide_width, slide_height, align_tolerance)
+    return {name: float(values[0]) for name, values in scores.items()}
+
+
+def score_slides(
+    slide_layouts: Sequence[dict],
+    slide_width: int | float | Sequence[int | float],
+    slide_height: int | float | Sequence[int | float],
+    align_tolerance: float = 0.01,
+    chunk_size: int = 1024,
+) -> dict[str, np.ndarray]:
+    """Compute the metrics of :func:`score_layout` for many slides at once.
+
+    The slide size is shared or given per slide. Slides are sorted by shape
+    count and scored `chunk_size` at a time as padded arrays, so each chunk is a
+    handful of NumPy operations; slides with more than :data:`DENSE_SHAPES`
+    shapes are scored one at a time. Returns one array per metric, in the order of
+    `slide_layouts`.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    count = len(slide_layouts)
+    widths = np.broadcast_to(np.asarray(slide_width, float), (count,))
+    heights = np.broadcast_to(np.asarray(slide_height, float), (count,))
+    boxes_list = [shape_boxes(leaf_shapes(slide["shapes"])) for slide in slide_layouts]
+    sizes = np.array([len(boxes) for boxes in boxes_list], int)
+    order = np.argsort(sizes, kind="stable")
+    sparse = np.count_nonzero(sizes <= DENSE_SHAPES)
+    chunks = [
+        order[start : start + chunk_size] for start in range(0, sparse, chunk_size)
+    ]
+    # Dense slides are scored alone rather than padded to each other's size
+    chunks += [order[index : index + 1] for index in range(sparse, count)]
+
+    scores = {name: np.empty(count) for name in METRIC_NAMES}
+    for chunk in chunks:
+        boxes, mask = pad_boxes([boxes_list[index] for index in chunk])
+        chunk_scores = _score_boxes(
+            boxes, mask, widths[chunk], heights[chunk], align_tolerance
+        )
+        for name, values in chunk_scores.items():
+            scores[name][chunk] = values
+    return scores
+
+
+def _overlapping_ids(shapes: list) -> tuple[np.ndarray, list[list[int]]]:
+    shape_ids = np.array([shape["shape_id"] for shape in shapes], np.int64)
+    pairs = GridIndex(shape_boxes(shapes)).overlapping_pairs()
+    return shape_ids, np.sort(shape_ids[pairs], axis=1).tolist()
+
+
+def validate_layout(
+    slide_layout: dict,
+    slide_width: int | float,
+    slide_height: int | float,
+    original_layout: dict | None = None,
+) -> dict[str, list]:
+    """Return the problems of a slide layout, such as one revised by the LLM.
+
+    ``overlaps`` lists the ``[shape_id, shape_id]`` pairs of shapes sharing
+    area, found with a :class:`~pptlayout.spatial.GridIndex`, and
+    ``out_of_bounds`` the ids of the shapes reaching past the slide. Given the
+    `original_layout`, only the overlaps the revision introduced are listed.
+    Group shapes are left out, see :func:`leaf_shapes`.
+    """
+    shapes = leaf_shapes(slide_layout["shapes"])
+    shape_ids, overlaps = _overlapping_ids(shapes)
+    if original_layout is not None:
+        _, original = _overlapping_ids(leaf_shapes(original_layout["shapes"]))
+        known = set(map(tuple, original))
+        overlaps = [pair for pair in overlaps if tuple(pair) not in known]
+    left, top, right, bottom = _edges(shape_boxes(shapes))
+    outside = (
+        (np.minimum(left, right) < 0)
+        | (np.minimum(top, bottom) < 0)
+        | (np.maximum(left, right) > slide_width)
+        | (np.maximum(top, bottom) > slide_height)
+    )
+    return {"overlaps": overlaps, "out_of_bounds": shape_ids[outside].tolist()}
@@ -0,0 +1,203 @@
+from collections.abc import Sequence
+
+import numpy as np
+
+Box = Sequence[float]  # left, top, width, height
+
+# Upper bound on the number of grid cells, per indexed box
+MAX_CELLS_PER_BOX = 4
+
+
+def _corners(boxes: np.ndarray) -> tuple[np.ndarray, ...]:
+    """Return ``x0, y0, x1, y1`` of ``left, top, width, height`` boxes."""
+    left, top = boxes[..., 0], boxes[..., 1]
+    right, bottom = left + boxes[..., 2], top + boxes[..., 3]
+    return (
+        np.minimum(left, right),
+        np.minimum(top, bottom),
+        np.maximum(left, right),
+        np.maximum(top, bottom),
+    )
+
+
+def _box_corners(box: Box) -> tuple[float, float, float, float]:
+    x0, y0, x1, y1 = _corners(np.asarray(box, float))
+    return float(x0), float(y0), float(x1), float(y1)
+
+
+class GridIndex:
+    """Uniform grid over the boxes of one slide.
+
+    `boxes` is the ``(n, 4)`` array of ``left, top, width, height`` returned by
+    :func:`pptlayout.metrics.shape_boxes`; queries return indices into it. Every
+    box is registered in each grid cell it touches, and the cell entries are
+    kept sorted by cell so that a query only looks at the boxes of the cells it
+    covers. The default cell size is the median box extent, which keeps both
+    the number of cells per box and the number of boxes per cell small on dense
+    slides. Cells are enlarged until the grid has at most
+    :data:`MAX_CELLS_PER_BOX` cells per box, whatever the unit of the boxes.
+    """
+
+    def __init__(self, boxes: np.ndarray, cell_size: float | None = None):
+        self.boxes = np.asarray(boxes, float).reshape(-1, 4)
+        self._x0, self._y0, self._x1, self._y1 = _corners(self.boxes)
+        self._origin = (
+            (float(self._x0.min()), float(self._y0.min())) if len(self) else (0, 0)
+        )
+        span_x = float(self._x1.max()) - self._origin[0] if len(self) else 0.0
+        span_y = float(self._y1.max()) - self._origin[1] if len(self) else 0.0
+        if cell_size is None:
+            extents = np.concatenate([self._x1 - self._x0, self._y1 - self._y0])
+            cell_size = float(np.median(extents)) if len(extents) else 0.0
+        if not cell_size > 0:
+            # Zero-size boxes: split the area they cover into about one cell each
+            cell_size = max(span_x, span_y) / np.sqrt(max(len(self), 1)) or 1.0
+        max_cells = MAX_CELLS_PER_BOX * max(len(self), 1)
+        while (span_x // cell_size + 1) * (span_y // cell_size + 1) > max_cells:
+            cell_size *= 2
+        self.cell_size = cell_size
+
+        cx0, cy0 = self._cell(self._x0, self._y0)
+        cx1, cy1 = self._cell(self._x1, self._y1)
+        self._shape = (int(cx1.max(initial=0)) + 1, int(cy1.max(initial=0)) + 1)
+        widths, heights = cx1 - cx0 + 1, cy1 - cy0 + 1
+        counts = widths * heights
+        ids = np.repeat(np.arange(len(self)), counts)
+        # Position of every entry within the cell range of its box
+        ramp = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        xs = cx0[ids] + ramp // heights[ids]
+        ys = cy0[ids] + ramp % heights[ids]
+        keys = xs * self._shape[1] + ys
+        order = np.lexsort((ids, keys))
+        self._keys = keys[order]
+        self._ids = ids[order]
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def _cell(self, x, y) -> tuple[np.ndarray, np.ndarray]:
+        cx = np.floor((np.asarray(x) - self._origin[0]) / self.cell_size)
+        cy = np.floor((np.asarray(y) - self._origin[1]) / self.cell_size)
+        return cx.astype(np.int64), cy.astype(np.int64)
+
+    def _candidates(self, x0: float, y0: float, x1: float, y1: float) -> np.ndarray:
+        low_x, low_y = self._cell(x0, y0)
+        high_x, high_y = self._cell(x1, y1)
+        cx0, cy0 = max(int(low_x), 0), max(int(low_y), 0)
+        cx1 = min(int(high_x), self._shape[0] - 1)
+        cy1 = min(int(high_y), self._shape[1] - 1)
+        if cx0 > cx1 or cy0 > cy1:
+            return np.zeros(0, np.int64)
+        # Each grid column is a contiguous run of keys
+        starts = np.arange(cx0, cx1 + 1) * self._shape[1]
+        lows = np.searchsorted(self._keys, starts + cy0, "left")
+        highs = np.searchsorted(self._keys, starts + cy1, "right")
+        return np.unique(
+            np.concatenate([self._ids[low:high] for low, high in zip(lows, highs)])
+        )
+
+    def intersecting(self, box: Box) -> np.ndarray:
+        """Return the indices of the boxes that touch or overlap `box`."""
+        x0, y0, x1, y1 = _box_corners(box)
+        ids = self._candidates(x0, y0, x1, y1)
+        hit = (
+            (self._x0[ids] <= x1)
+            & (self._x1[ids] >= x0)
+            & (self._y0[ids] <= y1)
+            & (self._y1[ids] >= y0)
+        )
+        return ids[hit]
+
+    def within(self, box: Box) -> np.ndarray:
+        """Return the indices of the boxes lying entirely inside `box`."""
+        x0, y0, x1, y1 = _box_corners(box)
+        ids = self._candidates(x0, y0, x1, y1)
+        inside = (
+            (self._x0[ids] >= x0)
+            & (self._x1[ids] <= x1)
+            & (self._y0[ids] >= y0)
+            & (self._y1[ids] <= y1)
+        )
+        return ids[inside]
+
+    def containing(self, box: Box) -> np.ndarray:
+        """Return the indices of the boxes that contain `box`.
+
+        A point is the box ``(x, y, 0, 0)``.
+        """
+        x0, y0, x1, y1 = _box_corners(box)
+        ids = self._candidates(x0, y0, x1, y1)
+        contains = (
+            (self._x0[ids] <= x0)
+            & (self._x1[ids] >= x1)
+            & (self._y0[ids] <= y0)
+            & (self._y1[ids] >= y1)
+        )
+        return ids[contains]
+
+    def distances(self, box: Box, ids: np.ndarray | None = None) -> np.ndarray:
+        """Return the gap between `box` and each box, 0 where they touch."""
+        if ids is None:
+            ids = np.arange(len(self))
+        x0, y0, x1, y1 = _box_corners(box)
+        dx = np.maximum(np.maximum(self._x0[ids] - x1, x0 - self._x1[ids]), 0)
+        dy = np.maximum(np.maximum(self._y0[ids] - y1, y0 - self._y1[ids]), 0)
+        return np.hypot(dx, dy)
+
+    def nearest(self, box: Box, k: int = 1, exclude: Sequence[int] = ()) -> np.ndarray:
+        """Return the indices of the `k` boxes closest to `box`, nearest first.
+
+        The cells around `box` are searched in a margin that doubles until `k`
+        boxes are known to be closer than anything outside it. Indices in
+        `exclude`, such as the box being queried, are skipped.
+        """
+        x0, y0, x1, y1 = _box_corners(box)
+        excluded = np.unique(np.asarray(exclude, np.int64))
+        remaining = len(self) - len(excluded)
+        k = min(k, remaining)
+        if k <= 0:
+            return np.zeros(0, np.int64)
+        margin = 0.0
+        while True:
+            ids = self._candidates(x0 - margin, y0 - margin, x1 + margin, y1 + margin)
+            ids = ids[~np.isin(ids, excluded)]
+            distances = self.distances(box, ids)
+            # Boxes outside the searched area are farther than `margin`
+            if len(ids) == remaining or np.count_nonzero(distances <= margin) >= k:
+                break
+            margin = 2 * margin + self.cell_size
+        order = np.lexsort((ids, distances))[:k]
+        return ids[order]
+
+    def overlapping_pairs(self) -> np.ndarray:
+        """Return the ``(m, 2)`` index pairs ``i < j`` of boxes sharing area.
+
+        Only pairs registered in a common cell are tested, instead of all
+        ``n * (n - 1) / 2`` pairs.
+        """
+        ends = np.searchsorted(self._keys, self._keys, "right")
+        # Pair every entry with the entries after it in the same cell
+        counts = ends - np.arange(len(self._keys)) - 1
+        first = np.repeat(np.arange(len(self._keys)), counts)
+        ramp = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        i, j = self._ids[first], self._ids[first + 1 + ramp]
+        pairs = np.unique(np.stack([np.minimum(i, j), np.maximum(i, j)], 1), axis=0)
+        i, j = pairs[:, 0], pairs[:, 1]
+        overlap = (
+            np.minimum(self._x1[i], self._x1[j]) > np.maximum(self._x0[i], self._x0[j])
+        ) & (
+            np.minimum(self._y1[i], self._y1[j]) > np.maximum(self._y0[i], self._y0[j])
+        )
+        return pairs[overlap]
+
+    def overlap_area(self) -> float:
+        """Return the summed intersection area of every pair of boxes."""
+        pairs = self.overlapping_pairs()
+        i, j = pairs[:, 0], pairs[:, 1]
+        widths = np.minimum(self._x1[i], self._x1[j]) - np.maximum(
+            self._x0[i], self._x0[j]
+        )
+        heights = np.minimum(self._y1[i], self._y1[j]) - np.maximum(
+            self._y0[i], self._y0[j]
+        )
+        return float((widths * heights).sum())
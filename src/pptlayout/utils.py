@@ -1,17 +1,99 @@
-from pptx.util import Length
+from decimal import ROUND_HALF_EVEN, Decimal
 
+EMUS_PER_UNIT = {
+    "cm": 360000,
+    "inches": 914400,
+    "in": 914400,
+    "inch": 914400,
+    "pt": 12700,
+    "emu": 1,
+}
 
-def unit_conversion(value: Length | None, unit: str) -> int | float:
+# Keys of an extracted shape dict that hold a length
+GEOMETRY_KEYS = (
+    "height",
+    "width",
+    "left",
+    "top",
+    "begin_x",
+    "begin_y",
+    "end_x",
+    "end_y",
+)
+
+
+def emus_per_unit(unit: str) -> int:
+    try:
+        return EMUS_PER_UNIT[unit]
+    except KeyError:
+        raise ValueError(f"Invalid measurement unit: {unit}") from None
+
+
+def unit_conversion(value: int | None, unit: str) -> int | float:
     if value is None:
         raise ValueError("Value cannot be None")
 
-    if unit == "cm":
-        return value.cm
-    elif unit == "inches" or unit == "in" or unit == "inch":
-        return value.inches
-    elif unit == "pt":
-        return value.pt
-    elif unit == "emu":
-        return value.emu
+    emus = emus_per_unit(unit)
+    if emus == 1:
+        return int(value)
+    return value / float(emus)
+
+
+def to_emu(value: int | float, unit: str) -> int:
+    """Convert a length in `unit` back to a whole number of EMU.
+
+    The value is scaled as the decimal it prints as, so a length produced by
+    :func:`unit_conversion` maps back to exactly the EMU it came from.
+    """
+    emus = emus_per_unit(unit)
+    if isinstance(value, int):
+        return value * emus
+    scaled = Decimal(str(float(value))) * emus
+    return int(scaled.to_integral_value(ROUND_HALF_EVEN))
+
+
+def convert_shapes(shapes: list[dict], measurement_unit: str) -> list[dict]:
+    """Convert raw EMU shape dicts to `measurement_unit` in place.
+
+    All lengths of all shapes are gathered into one array and divided in a
+    single NumPy operation, which gives exactly the same floats as converting
+    each value with :func:`unit_conversion`.
+    """
+    emus = emus_per_unit(measurement_unit)
+    slots = [(shape, key) for shape in shapes for key in GEOMETRY_KEYS if key in shape]
+    values = [shape[key] for shape, key in slots]
+    if any(value is None for value in values):
+        raise ValueError("Value cannot be None")
+
+    if emus == 1:
+        converted = [int(value) for value in values]
     else:
-        raise ValueError(f"Invalid measurement unit: {unit}")
+        import numpy as np
+
+        converted = (np.array(values, dtype=np.float64) / emus).tolist()
+    for (shape, key), value in zip(slots, converted):
+        shape[key] = value
+    for shape in shapes:
+        shape["measurement_unit"] = measurement_unit
+    return shapes
+
+
+def convert_ppt(ppt_data: dict, measurement_unit: str) -> dict:
+    """Return a copy of an EMU extraction with every length in `measurement_unit`.
+
+    Extract once with ``measurement_unit="emu"`` and call this to serve any
+    other unit; the whole deck is converted in one pass.
+    """
+    slides = [
+        {**slide, "shapes": [dict(shape) for shape in slide["shapes"]]}
+        for slide in ppt_data["slides"]
+    ]
+    convert_shapes(
+        [shape for slide in slides for shape in slide["shapes"]], measurement_unit
+    )
+    return {
+        **ppt_data,
+        "slide_width": unit_conversion(ppt_data["slide_width"], measurement_unit),
+        "slide_height": unit_conversion(ppt_data["slide_height"], measurement_unit),
+        "slides": slides,
+    }
@@ -0,0 +1,231 @@
+import io
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice, repeat
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import PatchCollection
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
+
+from pptlayout.spatial import GridIndex
+
+# Margins of the axes when the reference grid labels are drawn around them
+GRID_AXES_RECT = (0.06, 0.02, 0.92, 0.88)
+
+LABEL_FONTSIZE = 8
+
+
+def _label_boxes(ax: Axes, shapes: list, fontsize: float) -> np.ndarray:
+    """Estimate the box each shape's centered label covers, in slide units."""
+    x_min, x_max = ax.get_xlim()
+    y_max, y_min = ax.get_ylim()
+    bbox = ax.get_window_extent()
+    # With an equal aspect the slide is fitted to the tighter axis
+    units_per_pixel = max(
+        (x_max - x_min) / max(bbox.width, 1), (y_max - y_min) / max(bbox.height, 1)
+    )
+    units_per_point = units_per_pixel * ax.figure.dpi / 72
+    widths = np.array([0.6 * len(shape["shape_type"]) for shape in shapes])
+    widths *= fontsize * units_per_point
+    height = 1.2 * fontsize * units_per_point
+    centers_x = np.array([shape["left"] + shape["width"] / 2 for shape in shapes])
+    centers_y = np.array([shape["top"] + shape["height"] / 2 for shape in shapes])
+    return np.c_[
+        centers_x - widths / 2,
+        centers_y - height / 2,
+        widths,
+        np.full(len(shapes), height),
+    ]
+
+
+def place_labels(label_boxes: np.ndarray) -> np.ndarray:
+    """Return the indices of the labels to draw so that none overlap.
+
+    Labels are taken in order, each one skipped if it would overlap a label
+    already placed; a :class:`~pptlayout.spatial.GridIndex` keeps this near
+    linear on slides with hundreds of shapes.
+    """
+    index = GridIndex(label_boxes)
+    placed = np.zeros(len(index), bool)
+    for label in range(len(index)):
+        others = index.intersecting(label_boxes[label])
+        placed[label] = not placed[others].any()
+    return np.flatnonzero(placed)
+
+
+def draw_layout(
+    ax: Axes,
+    slide_width: int | float,
+    slide_height: int | float,
+    slide_layout: dict,
+    labels: bool = True,
+) -> None:
+    """Draw the shapes of a slide on `ax` as a single collection.
+
+    With `labels`, each shape is labelled with its type at its center, leaving
+    out the labels that would overlap one drawn before, see
+    :func:`place_labels`.
+    """
+    ax.set_xlim(0, slide_width)
+    ax.set_ylim(0, slide_height)
+    ax.set_aspect("equal", adjustable="box")
+    ax.invert_yaxis()  # Flip the y-axis to match slide coordinate systems
+
+    shapes = slide_layout["shapes"]
+    ax.add_collection(
+        PatchCollection(
+            [
+                Rectangle(
+                    (shape["left"], shape["top"]), shape["width"], shape["height"]
+                )
+                for shape in shapes
+            ],
+            linewidth=1,
+            edgecolor="black",
+            facecolor="lightblue",
+            alpha=0.6,
+        )
+    )
+    if labels and shapes:
+        for index in place_labels(_label_boxes(ax, shapes, LABEL_FONTSIZE)):
+            shape = shapes[index]
+            ax.text(
+                shape["left"] + shape["width"] / 2,
+                shape["top"] + shape["height"] / 2,
+                shape["shape_type"],
+                color="black",
+                fontsize=LABEL_FONTSIZE,
+                ha="center",
+                va="center",
+            )
+
+
+def draw_reference_grid(
+    ax: Axes, slide_width: int | float, slide_height: int | float, intervals: int
+) -> None:
+    """Overlay a labelled grid splitting the slide into `intervals` steps per side.
+
+    The ticks are in slide units, so a vision model can read positions off
+    the image.
+    """
+    x_ticks = np.linspace(0, slide_width, intervals + 1)
+    y_ticks = np.linspace(0, slide_height, intervals + 1)
+    ax.set_xticks(x_ticks, [f"{tick:g}" for tick in np.round(x_ticks, 1)])
+    ax.set_yticks(y_ticks, [f"{tick:g}" for tick in np.round(y_ticks, 1)])
+    ax.xaxis.tick_top()
+    ax.tick_params(axis="x", labelrotation=45, labelsize=6)
+    ax.tick_params(axis="y", labelsize=6)
+    ax.grid(color="green", linestyle="--", linewidth=0.5)
+    ax.set_axisbelow(False)
+
+
+def render_slide(
+    slide_layout: dict,
+    slide_width: int | float,
+    slide_height: int | float,
+    width_px: int = 960,
+    dpi: int = 100,
+    grid: int | None = None,
+    labels: bool = True,
+    format: str = "png",
+) -> bytes:
+    """Render a slide layout to an image and return the encoded bytes.
+
+    The figure is drawn with the Agg canvas and never registered with pyplot,
+    so it needs no display and is freed as soon as it goes out of scope. With
+    `grid`, a reference grid of that many intervals per side is overlaid.
+    """
+    height_px = round(width_px * slide_height / slide_width)
+    fig = Figure(figsize=(width_px / dpi, height_px / dpi), dpi=dpi)
+    FigureCanvasAgg(fig)
+    if grid:
+        ax = fig.add_axes(GRID_AXES_RECT)
+    else:
+        ax = fig.add_axes((0, 0, 1, 1))
+        ax.set_axis_off()
+    draw_layout(ax, slide_width, slide_height, slide_layout, labels)
+    if grid:
+        draw_reference_grid(ax, slide_width, slide_height, grid)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=format, dpi=dpi)
+    return buffer.getvalue()
+
+
+def _render_chunk(
+    jobs: list[tuple[str, dict, float, float]], options: dict
+) -> list[str]:
+    for path, slide_layout, slide_width, slide_height in jobs:
+        image = render_slide(slide_layout, slide_width, slide_height, **options)
+        with open(path, "wb") as f:
+            f.write(image)
+    return [path for path, *_ in jobs]
+
+
+def _chunked(items: Iterable, chunk_size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def _per_slide(size: int | float | Sequence[int | float]) -> Iterator[float]:
+    sizes = np.asarray(size, float)
+    return repeat(float(sizes)) if sizes.ndim == 0 else iter(sizes.tolist())
+
+
+def render_slides(
+    slide_layouts: Iterable[dict],
+    slide_width: int | float | Sequence[int | float],
+    slide_height: int | float | Sequence[int | float],
+    output_dir: str,
+    names: Iterable[str] | None = None,
+    workers: int | None = None,
+    chunk_size: int = 32,
+    **options,
+) -> list[str]:
+    """Render many slides to image files over a process pool.
+
+    The slide size is shared or given per slide. Files are named after
+    `names`, or ``<position>_slide_<slide_id>`` since slide ids repeat across
+    decks, with the extension of the format, and their paths are returned in
+    input order; two slides mapped to the same file raise ``ValueError``. At most two chunks per worker are
+    in flight, so the slides can be a lazy iterable; `options` are passed to
+    :func:`render_slide`.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    os.makedirs(output_dir, exist_ok=True)
+    extension = options.get("format", "png")
+    slide_layouts = iter(slide_layouts)
+    widths, heights = _per_slide(slide_width), _per_slide(slide_height)
+    names = iter(names) if names is not None else None
+    paths: set[str] = set()
+
+    def jobs() -> Iterator[tuple[str, dict, float, float]]:
+        sizes = zip(slide_layouts, widths, heights)
+        for index, (slide_layout, width, height) in enumerate(sizes):
+            name = next(names) if names is not None else None
+            name = name or f"{index}_slide_{slide_layout['slide_id']}"
+            path = os.path.join(output_dir, f"{name}.{extension}")
+            if path in paths:
+                raise ValueError(f"Two slides would be rendered to {path}")
+            paths.add(path)
+            yield path, slide_layout, width, height
+
+    workers = workers or os.cpu_count() or 1
+    chunks = enumerate(_chunked(jobs(), chunk_size))
+    results: dict[int, list[str]] = {}
+    pending: dict[Future, int] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for index, chunk in islice(chunks, workers * 2):
+            pending[executor.submit(_render_chunk, chunk, options)] = index
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[pending.pop(future)] = future.result()
+                for index, chunk in islice(chunks, 1):
+                    pending[executor.submit(_render_chunk, chunk, options)] = index
+    return [path for index in sorted(results) for path in results[index]]
@@ -0,0 +1,134 @@
+import io
+
+import pytest
+from PIL import Image
+from pptx import Presentation
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
+from pptx.util import Emu, Inches, Pt
+
+
+def _png_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (8, 8), color=(200, 30, 30)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def build_sample_presentation():
+    """Build a small deck covering every shape type the extractors handle."""
+    ppt = Presentation()
+
+    # Title slide: placeholders inheriting their geometry from the layout
+    slide = ppt.slides.add_slide(ppt.slide_layouts[0])
+    slide.shapes.title.text = "Layout\vbenchmark"
+    slide.placeholders[1].text = "First line\nSecond line"
+
+    # Title and content slide with a moved placeholder and free shapes
+    slide = ppt.slides.add_slide(ppt.slide_layouts[1])
+    slide.shapes.title.text = "Shapes"
+    slide.shapes.title.left = Inches(1)
+    slide.placeholders[1].text = "Body"
+    slide.shapes.add_textbox(Inches(1), Inches(5), Inches(3), Inches(1)).text = "Note"
+    slide.shapes.add_shape(
+        MSO_SHAPE.ROUNDED_RECTANGLE, Inches(5), Inches(5), Inches(2), Inches(1)
+    )
+    builder = slide.shapes.build_freeform(Emu(100), Emu(100))
+    builder.add_line_segments([(Emu(500), Emu(100)), (Emu(300), Emu(400))])
+    builder.convert_to_shape()
+    slide.shapes.add_connector(
+        MSO_CONNECTOR.STRAIGHT, Inches(6), Inches(1), Inches(4), Inches(3)
+    )
+
+    # Blank slide with a picture, a table, a chart and a group
+    slide = ppt.slides.add_slide(ppt.slide_layouts[6])
+    slide.name = "Media"
+    slide.shapes.add_picture(io.BytesIO(_png_bytes()), Inches(1), Inches(1), Pt(72))
+    slide.shapes.add_table(2, 2, Inches(4), Inches(1), Inches(3), Inches(1))
+    chart_data = CategoryChartData()
+    chart_data.categories = ["a", "b"]
+    chart_data.add_series("s", (1, 2))
+    slide.shapes.add_chart(
+        XL_CHART_TYPE.COLUMN_CLUSTERED,
+        Inches(1),
+        Inches(3),
+        Inches(3),
+        Inches(2),
+        chart_data,
+    )
+    group = slide.shapes.add_group_shape()
+    group.shapes.add_shape(MSO_SHAPE.OVAL, Inches(5), Inches(4), Inches(1), Inches(1))
+    group.shapes.add_shape(MSO_SHAPE.OVAL, Inches(7), Inches(5), Inches(1), Inches(1))
+
+    # Two content slide with a table and a chart inserted into placeholders
+    slide = ppt.slides.add_slide(ppt.slide_layouts[3])
+    slide.shapes.title.text = "Placeholders"
+    for idx, ph_type in ((1, "tbl"), (2, "chart")):
+        slide.placeholders[idx].element.ph.set("type", ph_type)
+    slide.placeholders[1].insert_table(2, 2)
+    slide.placeholders[2].insert_chart(XL_CHART_TYPE.PIE, chart_data)
+    return ppt
+
+
+@pytest.fixture
+def sample_pptx_path(tmp_path):
+    """Path to a generated .pptx file built by :func:`build_sample_presentation`."""
+    pptx_path = tmp_path / "sample.pptx"
+    build_sample_presentation().save(str(pptx_path))
+    return str(pptx_path)
+
+
+@pytest.fixture(scope="session")
+def tiny_qwen2_vl_dir(tmp_path_factory):
+    """A randomly initialised, few-kilobyte Qwen2-VL checkpoint."""
+    pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+    tokenizers = pytest.importorskip("tokenizers")
+
+    vocab = {"<unk>": 0, "<|endoftext|>": 1, "<|image_pad|>": 2, "<|video_pad|>": 3}
+    for word in "<|im_start|> <|im_end|> user assistant layout slide".split():
+        vocab[word] = len(vocab)
+    tokenizer_model = tokenizers.Tokenizer(
+        tokenizers.models.WordLevel(vocab=vocab, unk_token="<unk>")
+    )
+    tokenizer_model.pre_tokenizer = tokenizers.pre_tokenizers.WhitespaceSplit()
+    tokenizer = transformers.PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer_model,
+        unk_token="<unk>",
+        eos_token="<|endoftext|>",
+        pad_token="<|endoftext|>",
+    )
+    processors = {
+        "image_processor": transformers.Qwen2VLImageProcessor(),
+        "tokenizer": tokenizer,
+        "chat_template": (
+            "{% for message in messages %}<|im_start|> {{ message['role'] }} "
+            "{% for item in message['content'] %}{{ item['text'] }} {% endfor %}"
+            "<|im_end|> {% endfor %}<|im_start|> assistant "
+        ),
+    }
+    try:
+        processors["video_processor"] = transformers.Qwen2VLVideoProcessor()
+    except (AttributeError, ImportError):
+        pass
+
+    config = transformers.Qwen2VLConfig(
+        text_config={
+            "hidden_size": 16,
+            "intermediate_size": 32,
+            "num_hidden_layers": 1,
+            "num_attention_heads": 2,
+            "num_key_value_heads": 1,
+            "vocab_size": len(vocab),
+            "rope_scaling": {"type": "mrope", "mrope_section": [1, 1, 2]},
+        },
+        vision_config={"depth": 1, "embed_dim": 16, "hidden_size": 16, "num_heads": 2},
+        hidden_size=16,
+        vocab_size=len(vocab),
+        eos_token_id=1,
+        pad_token_id=1,
+    )
+    model_dir = tmp_path_factory.mktemp("tiny-qwen2-vl")
+    transformers.Qwen2VLForConditionalGeneration(config).save_pretrained(model_dir)
+    transformers.Qwen2VLProcessor(**processors).save_pretrained(model_dir)
+    return str(model_dir)
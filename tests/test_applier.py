@@ -0,0 +1,240 @@
+import io
+import json
+import multiprocessing
+import os
+import zipfile
+
+import pytest
+from pptx import Presentation
+
+from pptlayout.appliers import batch as applier_batch
+from pptlayout.appliers.batch import run_apply_batch
+from pptlayout.appliers.xml_applier import apply_layouts
+from pptlayout.extractors.run_extractors import run_extractors
+
+
+def _shapes(ppt_data: dict) -> dict:
+    return {
+        (slide["slide_id"], shape["shape_id"]): shape
+        for slide in ppt_data["slides"]
+        for shape in slide["shapes"]
+    }
+
+
+@pytest.mark.parametrize("measurement_unit", ["pt", "cm", "inches"])
+def test_unchanged_layouts_round_trip_exactly(
+    sample_pptx_path, tmp_path, measurement_unit
+):
+    original = run_extractors(sample_pptx_path, "emu", engine="xml")
+    revised = run_extractors(sample_pptx_path, measurement_unit, engine="xml")
+    output_path = str(tmp_path / "applied.pptx")
+
+    summary = apply_layouts(
+        sample_pptx_path, revised["slides"], output_path, measurement_unit
+    )
+    assert summary == {"slides": 4, "shapes": 17, "missing": [], "conflicts": []}
+    assert run_extractors(output_path, "emu", engine="xml") == original
+
+
+def test_revisions_are_written_to_the_xml(sample_pptx_path, tmp_path):
+    output_path = str(tmp_path / "applied.pptx")
+    revised = [
+        {
+            # A placeholder that inherits its geometry gets its own transform
+            "slide_id": 256,
+            "shapes": [
+                {"shape_id": 2, "left": 36, "top": 72, "width": 648, "height": 90}
+            ],
+        },
+        {
+            "slide_id": 257,
+            "shapes": [
+                {"shape_id": 4, "left": 1.5, "top": 360.25},
+                # The connector now runs the other way
+                {
+                    "shape_id": 7,
+                    "begin_x": 288,
+                    "begin_y": 72,
+                    "end_x": 432,
+                    "end_y": 216,
+                },
+            ],
+        },
+        {
+            "slide_id": 258,
+            "shapes": [
+                {"shape_id": 6, "left": 400, "top": 300},
+                {"shape_id": 99, "left": 0},
+            ],
+        },
+        {"slide_id": 1, "shapes": []},
+    ]
+    summary = apply_layouts(sample_pptx_path, revised, output_path)
+    assert summary["missing"] == [[258, 99], [1, None]]
+    assert (summary["slides"], summary["shapes"], summary["conflicts"]) == (3, 4, [])
+
+    for engine in ("xml", "pptx"):
+        shapes = _shapes(run_extractors(output_path, "pt", engine=engine))
+        title = shapes[256, 2]
+        assert [title[key] for key in ("left", "top", "width", "height")] == [
+            36,
+            72,
+            648,
+            90,
+        ]
+        assert (shapes[257, 4]["left"], shapes[257, 4]["top"]) == (1.5, 360.25)
+        assert shapes[257, 4]["width"] == 216
+        connector = shapes[257, 7]
+        assert [connector[key] for key in ("begin_x", "begin_y", "end_x", "end_y")] == [
+            288,
+            72,
+            432,
+            216,
+        ]
+        assert (shapes[258, 6]["left"], shapes[258, 6]["top"]) == (400, 300)
+
+    # The deck still opens and unrelated parts are untouched
+    assert len(Presentation(output_path).slides) == 4
+    with (
+        zipfile.ZipFile(sample_pptx_path) as before,
+        zipfile.ZipFile(output_path) as after,
+    ):
+        assert before.namelist() == after.namelist()
+        assert before.read("ppt/presentation.xml") == after.read("ppt/presentation.xml")
+
+
+def test_members_of_scaled_groups(sample_pptx_path, tmp_path):
+    # Halve the group's child space, so its members are drawn twice as large
+    scaled_path = str(tmp_path / "scaled.pptx")
+    with (
+        zipfile.ZipFile(sample_pptx_path) as source,
+        zipfile.ZipFile(scaled_path, "w") as target,
+    ):
+        for info in source.infolist():
+            data = source.read(info)
+            if info.filename == "ppt/slides/slide3.xml":
+                data = data.replace(
+                    b'<a:chExt cx="2743200" cy="1828800"/>',
+                    b'<a:chExt cx="1371600" cy="914400"/>',
+                )
+                assert b'cx="1371600"' in data
+            target.writestr(info, data)
+
+    member = {"shape_id": 7, "left": 500, "top": 400, "width": 144, "height": 36}
+    apply_layouts(scaled_path, [{"slide_id": 258, "shapes": [member]}])
+    shape = _shapes(run_extractors(scaled_path, "pt", engine="xml"))[258, 7]
+    assert {key: shape[key] for key in member} == member
+
+
+def test_run_apply_batch(sample_pptx_path, tmp_path):
+    revised = [{"slide_id": 257, "shapes": [{"shape_id": 4, "left": 10, "top": 20}]}]
+    jobs = [
+        {
+            "pptx_path": sample_pptx_path,
+            "output_path": str(tmp_path / f"out{index}.pptx"),
+            "slides": revised,
+        }
+        for index in range(3)
+    ]
+    jobs.insert(1, {"pptx_path": str(tmp_path / "missing.pptx"), "slides": revised})
+    output = io.StringIO()
+
+    summary = run_apply_batch(jobs, output, workers=2, chunk_size=1)
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    errors = [row["path"] for row in rows if row["status"] == "error"]
+    assert errors == [jobs[1]["pptx_path"]]
+    assert (summary["files"], summary["errors"], summary["shapes"]) == (4, 1, 3)
+    shapes = _shapes(run_extractors(jobs[3]["output_path"], "pt", engine="xml"))
+    assert (shapes[257, 4]["left"], shapes[257, 4]["top"]) == (10, 20)
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="the patched applier only reaches forked workers",
+)
+def test_only_the_deck_killing_its_worker_fails(
+    sample_pptx_path, tmp_path, monkeypatch
+):
+    apply_layouts = applier_batch.apply_layouts
+
+    def crash_on_bad_decks(pptx_path, *args):
+        if os.path.basename(pptx_path) == "crash.pptx":
+            os._exit(1)
+        return apply_layouts(pptx_path, *args)
+
+    monkeypatch.setattr(applier_batch, "apply_layouts", crash_on_bad_decks)
+    revised = [{"slide_id": 257, "shapes": [{"shape_id": 4, "left": 10, "top": 20}]}]
+    jobs = [{"pptx_path": str(tmp_path / "crash.pptx"), "slides": revised}]
+    for index in range(5):
+        output_path = str(tmp_path / f"out{index}.pptx")
+        jobs.append(
+            {"pptx_path": sample_pptx_path, "output_path": output_path, "slides": []}
+        )
+    output = io.StringIO()
+
+    summary = run_apply_batch(jobs, output, workers=2, chunk_size=2)
+
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert (summary["files"], summary["errors"]) == (6, 1)
+    errors = [row for row in rows if row["status"] == "error"]
+    assert [row["path"] for row in errors] == [jobs[0]["pptx_path"]]
+    assert errors[0]["error"].startswith("BrokenProcessPool")
+    assert sorted(row["output_path"] for row in rows if row["status"] == "ok") == [
+        job["output_path"] for job in jobs[1:]
+    ]
+
+
+def test_connectors_move_through_their_box(sample_pptx_path, tmp_path):
+    output_path = str(tmp_path / "applied.pptx")
+    connector = _shapes(run_extractors(sample_pptx_path, "pt", engine="xml"))[257, 7]
+    # The endpoints are echoed unchanged, so the box is what moved
+    moved = {**connector, "left": connector["left"] + 100, "top": connector["top"] + 50}
+    summary = apply_layouts(
+        sample_pptx_path, [{"slide_id": 257, "shapes": [moved]}], output_path
+    )
+    assert (summary["shapes"], summary["conflicts"]) == (1, [])
+
+    shape = _shapes(run_extractors(output_path, "pt", engine="xml"))[257, 7]
+    assert (shape["left"], shape["top"]) == (moved["left"], moved["top"])
+    assert (shape["width"], shape["height"]) == (
+        connector["width"],
+        connector["height"],
+    )
+    assert (shape["begin_x"], shape["begin_y"]) == (
+        connector["begin_x"] + 100,
+        connector["begin_y"] + 50,
+    )
+    assert (shape["end_x"], shape["end_y"]) == (
+        connector["end_x"] + 100,
+        connector["end_y"] + 50,
+    )
+
+    # New endpoints win over a box that disagrees with them, which is reported
+    revised = {**moved, "begin_x": 288, "begin_y": 72, "end_x": 432, "end_y": 216}
+    summary = apply_layouts(
+        sample_pptx_path, [{"slide_id": 257, "shapes": [revised]}], output_path
+    )
+    assert (summary["shapes"], summary["conflicts"]) == (1, [[257, 7]])
+    shape = _shapes(run_extractors(output_path, "pt", engine="xml"))[257, 7]
+    assert [shape[key] for key in ("begin_x", "begin_y", "end_x", "end_y")] == [
+        288,
+        72,
+        432,
+        216,
+    ]
+
+
+def test_partial_revisions_of_inheriting_placeholders(sample_pptx_path, tmp_path):
+    output_path = str(tmp_path / "applied.pptx")
+    title = _shapes(run_extractors(sample_pptx_path, "pt", engine="xml"))[256, 2]
+    revised = [{"slide_id": 256, "shapes": [{"shape_id": 2, "left": 36}]}]
+    summary = apply_layouts(sample_pptx_path, revised, output_path)
+    assert summary == {"slides": 1, "shapes": 1, "missing": [], "conflicts": []}
+    shape = _shapes(run_extractors(output_path, "pt", engine="xml"))[256, 2]
+    assert shape == {**title, "left": 36}
+
+    # Nothing to write leaves the placeholder inheriting its geometry
+    revised = [{"slide_id": 256, "shapes": [{"shape_id": 2}]}]
+    apply_layouts(sample_pptx_path, revised, output_path)
+    with zipfile.ZipFile(output_path) as package:
+        assert b"<a:xfrm/>" not in package.read("ppt/slides/slide1.xml")
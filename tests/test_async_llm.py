@@ -0,0 +1,170 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+pytest.importorskip("ollama")
+pytest.importorskip("backoff")
+
+from pptlayout.llm.async_llm import AsyncLLMClient  # noqa: E402
+from pptlayout.llm.backends import configure_backends  # noqa: E402
+
+
+class StandInOllama(ThreadingHTTPServer):
+    """Answers ``POST /api/generate`` like an Ollama server would."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.failures: dict[str, list[int]] = {}
+        self.delays: dict[str, float] = {}
+        self.requests: list[dict] = []
+
+    @property
+    def host(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        prompt = body["prompt"]
+        with server.lock:
+            server.requests.append(body)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            failures = server.failures.get(prompt)
+            status = failures.pop(0) if failures else 200
+        time.sleep(server.delays.get(prompt, 0.05))
+        with server.lock:
+            server.in_flight -= 1
+
+        if status == 200:
+            payload = {"model": body["model"], "response": f"echo {prompt}"}
+        else:
+            payload = {"error": "busy"}
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def server():
+    server = StandInOllama()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_concurrency_is_bounded_and_order_kept(server):
+    async def run():
+        async with AsyncLLMClient(server.host, max_concurrency=2) as client:
+            return await client.call_llm_many(
+                [{"prompt": f"p{i}", "json": True} for i in range(6)]
+            )
+
+    assert asyncio.run(run()) == [f"echo p{i}" for i in range(6)]
+    assert server.max_in_flight == 2
+    assert {request["format"] for request in server.requests} == {"json"}
+
+
+def test_retries_transient_errors_only(server):
+    server.failures = {"flaky": [503, 503], "bad": [400]}
+
+    async def run():
+        async with AsyncLLMClient(server.host, max_tries=3, max_backoff=0.01) as client:
+            flaky = await client.call_llm(prompt="flaky")
+            with pytest.raises(Exception) as error:
+                await client.call_llm(prompt="bad")
+            return flaky, error.value
+
+    flaky, error = asyncio.run(run())
+    assert flaky == "echo flaky"
+    assert getattr(error, "status_code", None) == 400
+    prompts = [request["prompt"] for request in server.requests]
+    assert prompts.count("flaky") == 3
+    assert prompts.count("bad") == 1
+
+
+def test_as_completed_streams_and_times_out(server):
+    server.delays = {"slow": 0.3, "hung": 5}
+
+    async def run():
+        async with AsyncLLMClient(
+            server.host, timeout=1, max_tries=1, max_concurrency=4
+        ) as client:
+            requests = [{"prompt": prompt} for prompt in ("slow", "fast", "hung")]
+            return [
+                result
+                async for result in client.as_completed(
+                    requests, return_exceptions=True
+                )
+            ]
+
+    results = asyncio.run(run())
+    assert results[:2] == [(1, "echo fast"), (0, "echo slow")]
+    assert results[2][0] == 2
+    assert isinstance(results[2][1], asyncio.TimeoutError)
+
+
+def test_rejects_non_ollama_models():
+    async def run():
+        async with AsyncLLMClient() as client:
+            await client.call_llm(model_name="Qwen2-VL-7B-Instruct")
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+
+def test_uses_the_configured_backend_host(server):
+    configure_backends(
+        {
+            "backends": {"remote": {"type": "ollama", "host": server.host}},
+            "models": {"remote-model": "remote"},
+        }
+    )
+
+    async def run():
+        async with AsyncLLMClient() as client:
+            return await client.call_llm(model_name="remote-model", prompt="p")
+
+    try:
+        assert asyncio.run(run()) == "echo p"
+    finally:
+        configure_backends(None)
+    assert server.requests[0]["model"] == "remote-model"
+
+
+def test_close_releases_the_connection_pool(server, monkeypatch):
+    closed = []
+    aclose = httpx.AsyncHTTPTransport.aclose
+
+    async def record_aclose(transport):
+        closed.append(transport)
+        await aclose(transport)
+
+    monkeypatch.setattr(httpx.AsyncHTTPTransport, "aclose", record_aclose)
+
+    async def run():
+        async with AsyncLLMClient(server.host) as client:
+            return await client.call_llm(prompt="p")
+
+    assert asyncio.run(run()) == "echo p"
+    assert len(closed) == 1
@@ -0,0 +1,119 @@
+import json
+
+import pytest
+
+from pptlayout.llm import backends, llm
+from pptlayout.llm.backends import (
+    BACKEND_TYPES,
+    HuggingFaceBackend,
+    LLMBackend,
+    MockBackend,
+    OllamaBackend,
+    configure_backends,
+    register_backend,
+    resolve_backend,
+)
+from pptlayout.llm.response_cache import ResponseCache
+
+PROMPT = 'Improve this layout: {"slide_id": 1, "shapes": []} Thanks.'
+
+
+@pytest.fixture(autouse=True)
+def reset_backends(monkeypatch):
+    monkeypatch.delenv(backends.CONFIG_ENV, raising=False)
+    configure_backends(None)
+    yield
+    configure_backends(None)
+
+
+def test_default_config_preserves_model_routing():
+    assert isinstance(resolve_backend("llama3.1:8b"), OllamaBackend)
+    qwen = resolve_backend("Qwen2-VL-7B-Instruct")
+    assert isinstance(qwen, HuggingFaceBackend)
+    assert qwen.model_dir == backends.DEFAULT_QWEN2_VL_DIR
+    assert resolve_backend("Qwen2-VL-7B-Instruct") is qwen
+    assert qwen.capabilities.batching and not qwen.capabilities.json_mode
+
+
+def test_backends_are_selected_by_config(tmp_path, monkeypatch):
+    configure_backends(
+        {
+            "default": "mock",
+            "backends": {"slow": {"type": "mock", "latency": 0.5}},
+            "models": {"slow-model": "slow"},
+        }
+    )
+    assert type(resolve_backend("llama3.1:8b")) is MockBackend
+    assert resolve_backend("slow-model").latency == 0.5
+    # Sections left out keep their defaults
+    assert isinstance(resolve_backend("Qwen2-VL-7B-Instruct"), HuggingFaceBackend)
+
+    config_path = tmp_path / "llm.json"
+    config_path.write_text(json.dumps({"models": {"llama3.1:8b": "mock"}}))
+    monkeypatch.setenv(backends.CONFIG_ENV, str(config_path))
+    configure_backends(None)
+    assert type(resolve_backend("llama3.1:8b")) is MockBackend
+    assert isinstance(resolve_backend("other"), OllamaBackend)
+
+    configure_backends({"default": "missing"})
+    with pytest.raises(KeyError):
+        resolve_backend("llama3.1:8b")
+
+
+def test_mock_backend_is_deterministic():
+    response = llm.call_llm(prompt=PROMPT, backend="mock", bypass_cache=True)
+    assert response == llm.call_llm(prompt=PROMPT, backend="mock", bypass_cache=True)
+    assert '"slide_id": 1' in response and "```json" in response
+    assert json.loads(
+        llm.call_llm(prompt=PROMPT, json=True, backend="mock", bypass_cache=True)
+    ) == {"slide_id": 1, "shapes": []}
+
+    streamed = llm.call_llm(prompt=PROMPT, backend="mock", stream=True)
+    assert "".join(streamed) == response
+
+
+def test_custom_backends_can_be_registered(monkeypatch):
+    monkeypatch.setattr(backends, "BACKEND_TYPES", dict(BACKEND_TYPES))
+
+    @register_backend("echo")
+    class EchoBackend(LLMBackend):
+        def generate(self, model_name, prompt, *args, **kwargs):
+            return f"{model_name}: {prompt}"
+
+    configure_backends({"models": {"echo-model": "echo"}})
+
+    assert llm.call_llm("echo-model", "hi", bypass_cache=True) == "echo-model: hi"
+    # Without streaming or batching the backend answers in one piece, one by one
+    assert list(llm.call_llm("echo-model", "hi", stream=True)) == ["echo-model: hi"]
+    assert llm.call_llm_batch([("a", None), ("b", None)], "echo-model") == [
+        "echo-model: a",
+        "echo-model: b",
+    ]
+    with pytest.raises(ValueError, match="no images"):
+        llm.call_llm("echo-model", "hi", images=[b"\x89PNG"])
+
+
+def test_cached_responses_are_keyed_by_backend(tmp_path):
+    class EchoBackend(LLMBackend):
+        def generate(self, model_name, prompt, *args, **kwargs):
+            return f"echo: {prompt}"
+
+    configure_backends(
+        {"backends": {"remote": {"type": "ollama", "host": "http://gpu:11434"}}}
+    )
+    with ResponseCache(str(tmp_path / "responses.sqlite")) as cache:
+        mocked = llm.call_llm(
+            "llama3.1:8b", PROMPT, temperature=0, backend="mock", cache=cache
+        )
+        echoed = llm.call_llm(
+            "llama3.1:8b", PROMPT, temperature=0, backend=EchoBackend(), cache=cache
+        )
+        assert mocked != echoed == f"echo: {PROMPT}"
+        assert cache.stats().hits == 0
+
+    identities = [
+        resolve_backend("llama3.1:8b", name).identity()
+        for name in ("ollama", "remote", "qwen2-vl", "mock")
+    ]
+    assert identities[1] == {"type": "OllamaBackend", "host": "http://gpu:11434"}
+    assert len({json.dumps(identity) for identity in identities}) == 4
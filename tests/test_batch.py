@@ -0,0 +1,108 @@
+import io
+import json
+import multiprocessing
+import os
+import shutil
+
+import pytest
+
+from pptlayout.extractors import batch
+from pptlayout.extractors.batch import iter_pptx_paths, main, run_batch
+
+
+def _make_corpus(directory, sample_pptx_path):
+    os.makedirs(directory / "nested")
+    shutil.copy(sample_pptx_path, directory / "a.pptx")
+    shutil.copy(sample_pptx_path, directory / "nested" / "b.pptx")
+    (directory / "corrupt.pptx").write_bytes(b"not a zip file")
+    (directory / "notes.txt").write_text("ignored")
+
+
+def test_iter_pptx_paths_from_directory_and_manifest(tmp_path, sample_pptx_path):
+    corpus = tmp_path / "corpus"
+    _make_corpus(corpus, sample_pptx_path)
+    paths = list(iter_pptx_paths(str(corpus)))
+    assert [os.path.basename(path) for path in paths] == [
+        "a.pptx",
+        "corrupt.pptx",
+        "b.pptx",
+    ]
+
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# decks\n" + "\n".join(paths) + "\n\n")
+    assert list(iter_pptx_paths(str(manifest))) == paths
+
+
+def test_run_batch_records_errors_without_stopping(tmp_path, sample_pptx_path):
+    corpus = tmp_path / "corpus"
+    _make_corpus(corpus, sample_pptx_path)
+    output = io.StringIO()
+
+    summary = run_batch(
+        iter_pptx_paths(str(corpus)), output, workers=2, chunk_size=1, engine="xml"
+    )
+
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert summary["files"] == 3
+    assert summary["errors"] == 1
+    by_name = {os.path.basename(row["path"]): row for row in rows}
+    assert by_name["corrupt.pptx"]["status"] == "error"
+    assert by_name["a.pptx"]["status"] == "ok"
+    assert len(by_name["b.pptx"]["result"]["slides"]) == 4
+    assert all(row["elapsed"] >= 0 for row in rows)
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers must inherit the patched extractor",
+)
+def test_only_the_deck_killing_its_worker_is_an_error(
+    tmp_path, sample_pptx_path, monkeypatch
+):
+    run_extractors = batch.run_extractors
+
+    def crash_on_bad_decks(pptx_path, *args):
+        if os.path.basename(pptx_path) == "crash.pptx":
+            os._exit(1)
+        return run_extractors(pptx_path, *args)
+
+    monkeypatch.setattr(batch, "run_extractors", crash_on_bad_decks)
+    paths = [str(tmp_path / "crash.pptx")]
+    for index in range(7):
+        paths.append(str(tmp_path / f"{index}.pptx"))
+        shutil.copy(sample_pptx_path, paths[-1])
+    output = io.StringIO()
+
+    summary = run_batch(paths, output, workers=2, chunk_size=2)
+
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert (summary["files"], summary["errors"]) == (8, 1)
+    assert sorted(row["path"] for row in rows) == sorted(paths)
+    errors = [row["path"] for row in rows if row["status"] == "error"]
+    assert errors == [paths[0]]
+
+
+def test_main_writes_jsonl(tmp_path, sample_pptx_path):
+    corpus = tmp_path / "corpus"
+    _make_corpus(corpus, sample_pptx_path)
+    output = tmp_path / "out.jsonl"
+
+    exit_code = main([str(corpus), "-o", str(output), "-w", "1", "-c", "2"])
+
+    assert exit_code == 0
+    assert len(output.read_text().splitlines()) == 3
+
+
+def test_extract_file_reports_cache_hits(tmp_path, sample_pptx_path, monkeypatch):
+    cache_path = str(tmp_path / "cache.sqlite")
+    first = batch.extract_file(sample_pptx_path, "pt", "xml", cache_path)
+
+    def fail(self):
+        raise AssertionError("Cache statistics queried per deck")
+
+    monkeypatch.setattr(batch.ExtractionCache, "stats", fail)
+    second = batch.extract_file(sample_pptx_path, "pt", "xml", cache_path)
+
+    assert (first["cache_hit"], second["cache_hit"]) == (False, True)
+    assert second["result"] == first["result"]
+    batch._worker_caches.pop(cache_path).close()
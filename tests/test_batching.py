@@ -0,0 +1,19 @@
+import pytest
+
+from pptlayout.llm.batching import bucket_by_length
+
+
+def test_bucket_by_length_groups_similar_lengths():
+    lengths = [50, 10, 40, 12, 11, 45]
+
+    assert bucket_by_length(lengths, max_batch_size=3) == [[1, 4, 3], [2, 5, 0]]
+    assert bucket_by_length(lengths, max_batch_size=8, max_batch_tokens=100) == [
+        [1, 4, 3],
+        [2, 5],
+        [0],
+    ]
+    # An input over the token budget still gets a batch of its own
+    assert bucket_by_length([500, 1], max_batch_tokens=100) == [[1], [0]]
+    assert bucket_by_length([]) == []
+    with pytest.raises(ValueError):
+        bucket_by_length([1], max_batch_size=0)
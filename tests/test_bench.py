@@ -0,0 +1,78 @@
+import json
+
+from pptlayout.bench.cli import main
+from pptlayout.bench.harness import STAGES, compare_reports, run_benchmark
+from pptlayout.bench.mock import MockLLM
+
+
+def test_run_benchmark_times_every_stage(sample_pptx_path):
+    llm = MockLLM()
+    report = run_benchmark([sample_pptx_path, sample_pptx_path], llm)
+
+    assert report["decks"] == 2
+    assert report["slides"] == 8
+    assert llm.calls == 8
+    assert set(report["stages"]) == set(STAGES)
+    assert report["stages"]["extract"]["count"] == 2
+    for stage in ("prompt", "llm", "parse"):
+        stats = report["stages"][stage]
+        assert stats["count"] == 8
+        assert stats["errors"] == 0
+        assert 0 < stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+        assert stats["peak_rss_mb"] > 0
+
+
+def test_run_benchmark_counts_errors(sample_pptx_path, tmp_path):
+    def failing_llm(**kwargs):
+        raise RuntimeError("model unavailable")
+
+    missing = str(tmp_path / "missing.pptx")
+    report = run_benchmark([missing, sample_pptx_path], failing_llm, max_slides=1)
+
+    assert report["decks"] == 1
+    assert report["stages"]["extract"]["errors"] == 1
+    assert report["stages"]["llm"] == {**report["stages"]["llm"], "errors": 1}
+    assert report["stages"]["parse"]["count"] == 0
+
+
+def test_compact_replies_are_parsed_as_tables(sample_pptx_path):
+    report = run_benchmark([sample_pptx_path], MockLLM(), compact=True)
+
+    assert report["stages"]["parse"]["count"] == 4
+    assert report["stages"]["parse"]["errors"] == 0
+
+
+def test_compare_reports_flags_regressions():
+    def report(p50_ms, throughput):
+        stats = {
+            "count": 10,
+            "p50_ms": p50_ms,
+            "p95_ms": p50_ms,
+            "p99_ms": p50_ms,
+            "peak_rss_mb": 100.0,
+            "throughput": throughput,
+        }
+        return {"stages": {"llm": stats}}
+
+    baseline = report(10.0, 100.0)
+    assert compare_reports(report(10.5, 98.0), baseline) == []
+    regressions = compare_reports(report(20.0, 50.0), baseline)
+    assert len(regressions) == 4
+    assert regressions[0].startswith("llm.p50_ms: 10 -> 20")
+    assert compare_reports(baseline, report(20.0, 50.0)) == []
+
+
+def test_cli_with_mock_and_baseline(sample_pptx_path, tmp_path, capsys):
+    corpus = str(tmp_path)
+    output = tmp_path / "report.json"
+    assert main([corpus, "--mock", "-o", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert report["slides"] == 4
+    assert "llm" in capsys.readouterr().out
+
+    baseline = json.loads(output.read_text())
+    baseline["stages"]["llm"]["p50_ms"] = 1e-6
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps(baseline))
+    assert main([corpus, "--mock", "--baseline", str(baseline_path)]) == 1
+    assert "REGRESSION llm.p50_ms" in capsys.readouterr().err
@@ -0,0 +1,148 @@
+from pptlayout.clustering import (
+    cluster_layouts,
+    layout_fingerprint,
+    map_suggestion,
+    suggest_per_cluster,
+)
+from pptlayout.extractors.run_extractors import run_extractors
+
+WIDTH, HEIGHT = 720, 540
+
+
+def template_slide(slide_id: int, title: str, offset: float = 0.0) -> dict:
+    return {
+        "slide_id": slide_id,
+        "slide_name": "",
+        "shapes": [
+            {
+                "shape_id": slide_id * 10 + 2,
+                "name": "Body",
+                "shape_type": "PLACEHOLDER",
+                "placeholder_type": "BODY",
+                "left": 36 + offset,
+                "top": 126,
+                "width": 648,
+                "height": 356,
+                "text": f"Notes on {title}",
+            },
+            {
+                "shape_id": slide_id * 10 + 1,
+                "name": "Title",
+                "shape_type": "PLACEHOLDER",
+                "placeholder_type": "TITLE",
+                "left": 72,
+                "top": 0,
+                "width": 648,
+                "height": 90,
+                "text": title,
+            },
+        ],
+    }
+
+
+def test_fingerprint_ignores_text_ids_order_and_unit(sample_pptx_path):
+    first = template_slide(1, "Revenue")
+    second = template_slide(2, "Costs")
+    second["shapes"].reverse()
+    assert layout_fingerprint(first, WIDTH, HEIGHT) == layout_fingerprint(
+        second, WIDTH, HEIGHT
+    )
+    # Within the quantization step, but not beyond it
+    moved = template_slide(3, "Revenue", offset=2)
+    assert layout_fingerprint(moved, WIDTH, HEIGHT) == layout_fingerprint(
+        first, WIDTH, HEIGHT
+    )
+    moved = template_slide(3, "Revenue", offset=30)
+    assert layout_fingerprint(moved, WIDTH, HEIGHT) != layout_fingerprint(
+        first, WIDTH, HEIGHT
+    )
+    retyped = template_slide(4, "Revenue")
+    retyped["shapes"][0]["placeholder_type"] = "OBJECT"
+    assert layout_fingerprint(retyped, WIDTH, HEIGHT) != layout_fingerprint(
+        first, WIDTH, HEIGHT
+    )
+
+    fingerprints = [
+        [
+            layout_fingerprint(slide, ppt_data["slide_width"], ppt_data["slide_height"])
+            for slide in ppt_data["slides"]
+        ]
+        for ppt_data in (
+            run_extractors(sample_pptx_path, unit, engine="xml")
+            for unit in ("emu", "pt", "cm")
+        )
+    ]
+    assert fingerprints[0] == fingerprints[1] == fingerprints[2]
+    assert len(set(fingerprints[0])) == 4
+
+
+def test_cluster_layouts_groups_near_duplicates():
+    slides = [
+        template_slide(1, "a"),
+        template_slide(2, "b", offset=30),
+        template_slide(3, "c"),
+        {"slide_id": 4, "slide_name": "", "shapes": []},
+        template_slide(5, "d", offset=20),
+    ]
+
+    exact = cluster_layouts(slides, WIDTH, HEIGHT)
+    assert [cluster.members for cluster in exact] == [[0, 2], [1], [3], [4]]
+
+    near = cluster_layouts(slides, WIDTH, HEIGHT, tolerance=0.05)
+    assert [cluster.members for cluster in near] == [[0, 1, 2, 4], [3]]
+    assert near[0].representative == 0
+
+    # Per-slide sizes: the same layout on a slide twice as large
+    large = template_slide(6, "e")
+    for shape in large["shapes"]:
+        for key in ("left", "top", "width", "height"):
+            shape[key] *= 2
+    clusters = cluster_layouts(
+        [slides[0], large], [WIDTH, 2 * WIDTH], [HEIGHT, 2 * HEIGHT]
+    )
+    assert [cluster.members for cluster in clusters] == [[0, 1]]
+
+
+def test_map_suggestion_pairs_shapes_by_layout():
+    representative = template_slide(1, "a")
+    member = template_slide(2, "b")
+    member["shapes"].reverse()
+    suggestion = {
+        "slide_id": 1,
+        "shapes": [{"shape_id": 11, "left": 100, "top": 20, "width": 520}],
+    }
+
+    revised = map_suggestion(
+        suggestion, representative, member, (WIDTH, HEIGHT), (2 * WIDTH, HEIGHT)
+    )
+
+    title = next(shape for shape in revised["shapes"] if shape["shape_id"] == 21)
+    assert (title["left"], title["top"], title["width"]) == (200, 20, 1040)
+    assert title["height"] == 90 and title["text"] == "b"
+    body = next(shape for shape in revised["shapes"] if shape["shape_id"] == 22)
+    assert body == member["shapes"][1]
+    assert member["shapes"][0]["left"] == 72
+
+
+def test_suggest_per_cluster_calls_once_per_cluster():
+    slides = [template_slide(slide_id, str(slide_id)) for slide_id in range(1, 6)]
+    slides.append({"slide_id": 6, "slide_name": "", "shapes": []})
+    calls = []
+
+    def suggest(slide):
+        calls.append(slide["slide_id"])
+        if not slide["shapes"]:
+            return None
+        shape_id = slide["shapes"][1]["shape_id"]
+        return {"shapes": [{"shape_id": shape_id, "top": 10}]}
+
+    revised = suggest_per_cluster(slides, WIDTH, HEIGHT, suggest)
+
+    assert calls == [1, 6]
+    assert revised[-1] is None
+    for slide, suggestion in zip(slides, revised[:-1]):
+        assert suggestion["slide_id"] == slide["slide_id"]
+        title = next(
+            s for s in suggestion["shapes"] if s["placeholder_type"] == "TITLE"
+        )
+        assert title["top"] == 10 and title["text"] == slide["shapes"][1]["text"]
@@ -0,0 +1,45 @@
+import pytest
+
+from pptlayout.extractors.columnar import ParquetLayoutReader, write_parquet
+from pptlayout.extractors.run_extractors import run_extractors
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.mark.parametrize("unit", ["emu", "pt"])
+def test_parquet_round_trip(tmp_path, sample_pptx_path, unit):
+    ppt_data = run_extractors(sample_pptx_path, unit, engine="xml")
+    decks = [("deck-a", ppt_data), ("deck-b", ppt_data)]
+    root = str(tmp_path / "layouts")
+
+    rows = write_parquet(decks, root, num_buckets=4, max_rows_per_batch=1)
+
+    reader = ParquetLayoutReader(root, num_buckets=4)
+    assert rows == 2 * sum(len(slide["shapes"]) for slide in ppt_data["slides"])
+    assert reader.deck_ids() == ["deck-a", "deck-b"]
+    assert reader.read_deck("deck-b") == ppt_data
+    assert reader.read_slide("deck-a", 257) == ppt_data["slides"][1]
+    with pytest.raises(KeyError):
+        reader.read_deck("missing")
+
+    table = reader.table(columns=["shape_type", "text_length"])
+    assert table.num_rows == rows
+    assert "LINE" in table.column("shape_type").to_pylist()
+
+
+def test_empty_slides_and_repeated_writes(tmp_path, sample_pptx_path):
+    ppt_data = run_extractors(sample_pptx_path, "emu", engine="xml")
+    empty_slide = {"slide_id": 300, "slide_name": "Empty", "shapes": []}
+    with_empty = {**ppt_data, "slides": [*ppt_data["slides"], empty_slide]}
+    no_slides = {**ppt_data, "slides": []}
+    root = str(tmp_path / "layouts")
+
+    # Both calls write to the same partition without replacing each other
+    write_parquet([("deck-a", with_empty)], root, num_buckets=1)
+    write_parquet([("deck-b", no_slides)], root, num_buckets=1)
+
+    reader = ParquetLayoutReader(root, num_buckets=1)
+    assert reader.deck_ids() == ["deck-a", "deck-b"]
+    assert reader.read_deck("deck-a") == with_empty
+    assert reader.read_slide("deck-a", 300) == empty_slide
+    assert reader.read_deck("deck-b") == no_slides
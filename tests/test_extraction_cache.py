@@ -0,0 +1,79 @@
+from pptlayout.cache import SQLiteCache
+from pptlayout.extractors import cache as extraction_cache
+from pptlayout.extractors import run_extractors as run_extractors_module
+from pptlayout.extractors.cache import ExtractionCache
+from pptlayout.extractors.run_extractors import run_extractors
+
+
+def test_cache_hit_skips_extraction(tmp_path, sample_pptx_path, monkeypatch):
+    with ExtractionCache(str(tmp_path / "cache.sqlite")) as cache:
+        first = run_extractors(sample_pptx_path, "pt", cache=cache)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Deck extracted on a cache hit")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(run_extractors_module, "_extract", fail)
+            second = run_extractors(sample_pptx_path, "pt", cache=cache)
+
+        assert second == first
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+        assert stats.hit_rate == 0.5
+
+        # The EMU entry serves every other unit
+        assert run_extractors(sample_pptx_path, "cm", cache=cache) == run_extractors(
+            sample_pptx_path, "cm", engine="xml"
+        )
+        assert cache.stats().entries == 1
+
+
+def test_schema_version_bump_invalidates(tmp_path, sample_pptx_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite")
+    with ExtractionCache(path) as cache:
+        run_extractors(sample_pptx_path, cache=cache)
+        assert cache.stats().entries == 1
+
+    monkeypatch.setattr(extraction_cache, "EXTRACTOR_SCHEMA_VERSION", "next")
+    with ExtractionCache(path) as cache:
+        assert cache.stats().entries == 0
+
+    with ExtractionCache(path) as cache:
+        run_extractors(sample_pptx_path, cache=cache)
+        cache.invalidate()
+        assert cache.stats().entries == 0
+
+
+def test_sqlite_cache_evicts_least_recently_used(tmp_path):
+    with SQLiteCache(str(tmp_path / "lru.sqlite"), "1", max_bytes=250) as cache:
+        cache.put("a", b"a" * 100)
+        cache.put("b", b"b" * 100)
+        assert cache.get("a") is not None  # "b" is now least recently used
+        cache.put("c", b"c" * 100)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats().size_bytes == 200
+
+
+def test_engines_do_not_share_entries(tmp_path, sample_pptx_path, monkeypatch):
+    with ExtractionCache(str(tmp_path / "cache.sqlite")) as cache:
+        run_extractors(sample_pptx_path, cache=cache)
+        engines = []
+
+        def extract(pptx_path, measurement_unit, engine, **kwargs):
+            engines.append(engine)
+            return {"slides": [], "engine": engine}
+
+        monkeypatch.setattr(run_extractors_module, "_extract", extract)
+        assert run_extractors(sample_pptx_path, engine="xml", cache=cache) == {
+            "slides": [],
+            "engine": "xml",
+        }
+        assert (
+            run_extractors(sample_pptx_path, engine="xml", cache=cache)["engine"]
+            == "xml"
+        )
+        assert engines == ["xml"]
+        assert cache.stats().entries == 2
@@ -0,0 +1,95 @@
+import pytest
+from pptx import Presentation
+from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
+from pptx.util import Inches
+
+from pptlayout.extractors.groups import IDENTITY, child_transform, flatten_groups
+from pptlayout.extractors.run_extractors import run_extractors
+
+
+@pytest.fixture
+def nested_group_pptx_path(tmp_path):
+    ppt = Presentation()
+    slide = ppt.slides.add_slide(ppt.slide_layouts[6])
+    outer = slide.shapes.add_group_shape()
+    inner = outer.shapes.add_group_shape()
+    inner.shapes.add_shape(
+        MSO_SHAPE.RECTANGLE, Inches(1), Inches(1), Inches(1), Inches(1)
+    )
+    outer.shapes.add_shape(MSO_SHAPE.OVAL, Inches(3), Inches(1), Inches(1), Inches(1))
+    outer.shapes.add_connector(
+        MSO_CONNECTOR.STRAIGHT, Inches(4), Inches(1), Inches(3), Inches(2)
+    )
+
+    # Stretch the outer group 2x and move the inner group's child space
+    outer._element.xfrm.ext.cx = outer._element.xfrm.chExt.cx * 2
+    outer._element.xfrm.ext.cy = outer._element.xfrm.chExt.cy * 2
+    inner._element.xfrm.chOff.x = 0
+    inner._element.xfrm.chOff.y = 0
+
+    pptx_path = tmp_path / "groups.pptx"
+    ppt.save(str(pptx_path))
+    return str(pptx_path)
+
+
+@pytest.mark.parametrize("engine", ["pptx", "xml"])
+def test_nested_groups_are_flattened(nested_group_pptx_path, engine):
+    shapes = run_extractors(nested_group_pptx_path, "inches", engine=engine)["slides"][
+        0
+    ]["shapes"]
+    by_name = {shape["name"]: shape for shape in shapes}
+    outer, inner = shapes[0], shapes[1]
+
+    assert [shape["shape_type"] for shape in shapes] == [
+        "GROUP",
+        "GROUP",
+        "AUTO_SHAPE",
+        "AUTO_SHAPE",
+        "LINE",
+    ]
+    assert "group_id" not in outer
+    assert inner["group_id"] == outer["shape_id"]
+
+    rectangle = by_name["Rectangle 3"]
+    assert rectangle["group_id"] == inner["shape_id"]
+    assert (rectangle["left"], rectangle["top"]) == (3, 3)
+    assert (rectangle["width"], rectangle["height"]) == (2, 2)
+
+    oval = by_name["Oval 4"]
+    assert oval["group_id"] == outer["shape_id"]
+    assert (oval["left"], oval["top"], oval["width"]) == (5, 1, 2)
+
+    connector = shapes[4]
+    assert (connector["begin_x"], connector["begin_y"]) == (7, 1)
+    assert (connector["end_x"], connector["end_y"]) == (5, 3)
+
+
+def test_engines_agree_on_nested_groups(nested_group_pptx_path):
+    assert run_extractors(nested_group_pptx_path, "emu") == run_extractors(
+        nested_group_pptx_path, "emu", engine="xml"
+    )
+
+
+def test_flatten_groups_does_not_recurse():
+    depth = 5000
+    tree = {"shape_id": 0, "children": []}
+    node = tree
+    for shape_id in range(1, depth):
+        child = {"shape_id": shape_id, "children": []}
+        node["children"].append(child)
+        node = child
+
+    shapes = flatten_groups(
+        [tree],
+        lambda node: {"shape_id": node["shape_id"], "left": 0, "width": 1},
+        lambda node: (node["children"], [0, 0, 1, 1]) if node["children"] else None,
+    )
+
+    assert len(shapes) == depth
+    assert shapes[-1]["group_id"] == depth - 2
+    assert child_transform(IDENTITY, [10, 20, 4, 4], [0, 0, 2, 2]) == (
+        2.0,
+        10.0,
+        2.0,
+        20.0,
+    )
@@ -0,0 +1,73 @@
+import base64
+import io
+
+import pytest
+from PIL import Image
+
+ollama = pytest.importorskip("ollama")
+
+from pptlayout.llm import llm  # noqa: E402
+from pptlayout.llm.images import (  # noqa: E402
+    check_images,
+    image_bytes,
+    image_digest,
+    to_ollama_image,
+    to_qwen2_vl_image,
+)
+from pptlayout.llm.response_cache import response_key  # noqa: E402
+
+
+@pytest.fixture
+def png():
+    buffer = io.BytesIO()
+    Image.new("RGB", (4, 3), "white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_check_images(tmp_path, png):
+    check_images([png, memoryview(png), bytearray(png), Image.new("RGB", (1, 1))])
+    with pytest.raises(ValueError, match="Image file not found"):
+        check_images([str(tmp_path / "missing.png")])
+    with pytest.raises(TypeError):
+        check_images([42])
+
+
+def test_buffers_and_files_share_a_digest(tmp_path, png):
+    path = tmp_path / "slide.png"
+    path.write_bytes(png)
+    digests = {image_digest(image) for image in (str(path), path, png, memoryview(png))}
+    assert len(digests) == 1
+
+    pil_image = Image.open(io.BytesIO(png))
+    assert image_digest(pil_image) == image_digest(pil_image.copy())
+    assert image_digest(pil_image) != image_digest(Image.new("RGB", (4, 3), "black"))
+    assert response_key("m", "p", [png], 0, 8, False) == response_key(
+        "m", "p", [str(path)], 0, 8, False
+    )
+
+
+def test_backend_conversions(tmp_path, png):
+    assert base64.b64decode(to_ollama_image(memoryview(png))) == png
+    assert to_ollama_image(tmp_path / "slide.png") == str(tmp_path / "slide.png")
+    pil_image = Image.open(io.BytesIO(png))
+    assert base64.b64decode(to_ollama_image(pil_image)) == image_bytes(pil_image)
+
+    assert to_qwen2_vl_image(png).size == (4, 3)
+    assert to_qwen2_vl_image(pil_image) is pil_image
+
+
+def test_call_llm_sends_buffers_to_ollama(monkeypatch, png):
+    requests = []
+
+    def generate(**kwargs):
+        requests.append(kwargs)
+        return {"response": "ok"}
+
+    monkeypatch.setattr(ollama, "generate", generate)
+    assert llm.call_llm(prompt="layout", images=[png], bypass_cache=True) == "ok"
+    assert requests[0]["images"] == [base64.b64encode(png).decode()]
+
+
+def test_qwen2_vl_message_decodes_buffers(png):
+    messages = llm.generate_qwen2_vl_message(images=[memoryview(png)], prompt="p")
+    assert messages[0]["content"][0]["image"].size == (4, 3)
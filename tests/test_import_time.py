@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Cold import budget of the extraction entry points, in milliseconds
+IMPORT_BUDGET_MS = float(os.environ.get("PPTLAYOUT_IMPORT_BUDGET_MS", 250))
+
+# Modules an extraction worker must not load until it needs them
+HEAVY_MODULES = (
+    "matplotlib",
+    "numpy",
+    "ollama",
+    "openai",
+    "pptx",
+    "seaborn",
+    "torch",
+    "transformers",
+)
+
+
+def cold_import(module: str) -> tuple[float, set[str]]:
+    """Import `module` in a fresh interpreter.
+
+    Returns its cumulative import time in milliseconds, as reported by
+    ``python -X importtime``, and the top-level packages it loaded.
+    """
+    code = f"import sys, {module}; print(' '.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    cumulative = None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, microseconds, name = line.split("|")
+        if name.strip() == module:
+            cumulative = int(microseconds) / 1000
+    assert cumulative is not None, result.stderr[-2000:]
+    loaded = {name.partition(".")[0] for name in result.stdout.split()}
+    return cumulative, loaded
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "pptlayout.extractors.run_extractors",
+        "pptlayout.extractors.batch",
+        "pptlayout.extractors.xml_extractor",
+    ],
+)
+def test_extractors_import_within_budget(module):
+    milliseconds, loaded = cold_import(module)
+    assert not loaded & set(HEAVY_MODULES)
+    assert milliseconds < IMPORT_BUDGET_MS
+
+
+@pytest.mark.parametrize(
+    "module", ["pptlayout.llm.llm", "pptlayout.visualizers.layout_visualizer"]
+)
+def test_heavy_dependencies_load_on_first_use(module):
+    _, loaded = cold_import(module)
+    assert not loaded & set(HEAVY_MODULES) - {"numpy", "pptx"}
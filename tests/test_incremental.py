@@ -0,0 +1,101 @@
+import json
+
+import pytest
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.util import Inches
+
+from pptlayout.extractors import incremental
+from pptlayout.extractors.incremental import extract_incremental
+from pptlayout.extractors.run_extractors import run_extractors
+
+
+@pytest.fixture
+def extracted_ids(monkeypatch):
+    calls = []
+    extract_slides = incremental._extract_slides
+
+    def record(pptx_path, package, slide_ids, engine):
+        calls.append(set(slide_ids))
+        return extract_slides(pptx_path, package, slide_ids, engine)
+
+    monkeypatch.setattr(incremental, "_extract_slides", record)
+    return calls
+
+
+@pytest.mark.parametrize("engine", ["xml", "pptx"])
+def test_first_extraction_adds_every_slide(sample_pptx_path, tmp_path, engine):
+    manifest_path = str(tmp_path / "manifest.json")
+    result = extract_incremental(sample_pptx_path, manifest_path, "pt", engine)
+
+    assert result.ppt_data == run_extractors(sample_pptx_path, "pt", engine=engine)
+    assert result.added == [256, 257, 258, 259]
+    assert result.modified == result.removed == result.unchanged == []
+    assert result.changed_slides == result.ppt_data["slides"]
+    assert result.diffs[256].added == result.ppt_data["slides"][0]["shapes"]
+    with open(manifest_path) as f:
+        assert json.load(f)["engine"] == engine
+
+
+def test_unchanged_deck_is_not_extracted(sample_pptx_path, tmp_path, extracted_ids):
+    manifest_path = str(tmp_path / "manifest.json")
+    first = extract_incremental(sample_pptx_path, manifest_path, "cm")
+    second = extract_incremental(sample_pptx_path, manifest_path, "cm")
+
+    assert extracted_ids == [{256, 257, 258, 259}, set()]
+    assert second.ppt_data == first.ppt_data
+    assert second.unchanged == [256, 257, 258, 259]
+    assert second.changed_slides == [] and second.diffs == {}
+
+    # Another engine never reuses the manifest
+    extract_incremental(sample_pptx_path, manifest_path, engine="pptx")
+    assert extracted_ids[-1] == {256, 257, 258, 259}
+
+
+def test_only_edited_slides_are_extracted(sample_pptx_path, tmp_path, extracted_ids):
+    manifest_path = str(tmp_path / "manifest.json")
+    extract_incremental(sample_pptx_path, manifest_path, "pt")
+
+    ppt = Presentation(sample_pptx_path)
+    note = ppt.slides[1].shapes[2]
+    note.left += Inches(1)
+    ppt.slides[2].shapes.add_shape(
+        MSO_SHAPE.RECTANGLE, Inches(8), Inches(1), Inches(1), Inches(1)
+    )
+    slide_ids = ppt.slides._sldIdLst
+    slide_ids.remove(slide_ids[0])
+    ppt.save(sample_pptx_path)
+
+    result = extract_incremental(sample_pptx_path, manifest_path, "pt")
+
+    assert extracted_ids[-1] == {257, 258}
+    assert result.ppt_data == run_extractors(sample_pptx_path, "pt", engine="xml")
+    assert (result.modified, result.removed, result.added) == ([257, 258], [256], [])
+    assert [slide["slide_id"] for slide in result.changed_slides] == [257, 258]
+    (moved,) = result.diffs[257].modified
+    assert moved["shape_id"] == note.shape_id
+    assert moved["after"]["left"] - moved["before"]["left"] == 72
+    assert not result.diffs[257].added and not result.diffs[257].removed
+    assert [shape["shape_type"] for shape in result.diffs[258].added] == ["AUTO_SHAPE"]
+    assert [shape["name"] for shape in result.diffs[256].removed] == [
+        "Title 1",
+        "Subtitle 2",
+    ]
+
+
+def test_layout_edits_reach_the_slides_using_them(
+    sample_pptx_path, tmp_path, extracted_ids
+):
+    manifest_path = str(tmp_path / "manifest.json")
+    extract_incremental(sample_pptx_path, manifest_path)
+
+    ppt = Presentation(sample_pptx_path)
+    ppt.slide_layouts[1].placeholders[1].top += Inches(1)
+    ppt.save(sample_pptx_path)
+
+    result = extract_incremental(sample_pptx_path, manifest_path)
+
+    assert extracted_ids[-1] == {257}
+    assert result.modified == [257]
+    (body,) = result.diffs[257].modified
+    assert body["after"]["top"] - body["before"]["top"] == Inches(1)
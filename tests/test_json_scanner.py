@@ -0,0 +1,59 @@
+import json
+import time
+
+from pptlayout.llm.parser import (
+    LazyDecoder,
+    extract_json,
+    extract_json_with_regex,
+    find_json_spans,
+    sanitize_json_string,
+)
+
+
+def test_find_json_spans_ignores_braces_in_strings():
+    text = 'Note {a} then {"name": "x}{", "shape": {"id": 1}} and {"b": 2}'
+    spans = find_json_spans(text)
+    assert [text[start:end] for start, end in spans] == [
+        "{a}",
+        '{"name": "x}{", "shape": {"id": 1}}',
+        '{"b": 2}',
+    ]
+
+
+def test_find_json_spans_skips_unclosed_braces():
+    text = '{ unbalanced { chatter {"slide_id": 1} more {'
+    assert [text[start:end] for start, end in find_json_spans(text)] == [
+        '{"slide_id": 1}'
+    ]
+
+
+def test_extract_json_skips_undecodable_candidates():
+    text = 'Use {braces} for sets. Result: {"shapes": [{"left": 1,},],}'
+    assert extract_json_with_regex(text) == {"shapes": [{"left": 1}]}
+    assert extract_json_with_regex("no json here") is None
+
+
+def test_extract_json_repairs_comments_and_escapes():
+    text = '```json\n{"text": "see http://x.org", // comment\n "path": "C:\\dir"}\n```'
+    assert extract_json(text) == {"text": "see http://x.org", "path": "C:\\dir"}
+
+
+def test_sanitize_json_string():
+    sanitized = sanitize_json_string('{"a": "x // y\tz", // note\n"b": 1}')
+    assert json.loads(sanitized) == {"a": "x // y z", "b": 1}
+
+
+def test_lazy_decoder_keeps_valid_escapes():
+    text = '{"a": "say \\"hi\\"\\n", "b": "C:\\dir\\\\x", "c": [1, 2,]}'
+    assert json.loads(text, cls=LazyDecoder) == {
+        "a": 'say "hi"\n',
+        "b": "C:\\dir\\x",
+        "c": [1, 2],
+    }
+
+
+def test_extract_json_is_linear_on_unbalanced_braces():
+    text = "{ " * 50_000 + '{"slide_id": 1}'
+    start = time.perf_counter()
+    assert extract_json_with_regex(text) == {"slide_id": 1}
+    assert time.perf_counter() - start < 1
@@ -0,0 +1,66 @@
+import pytest
+
+from pptlayout.extractors.lazy_slides import LazySlides
+from pptlayout.extractors.opc import PptxPackage
+from pptlayout.extractors.run_extractors import run_extractors
+
+
+def test_lazy_slides_extract_on_first_access():
+    calls = []
+
+    def extract_slide(idx):
+        calls.append(idx)
+        return {"slide_id": 256 + idx, "shapes": []}
+
+    slides = LazySlides([256, 257, 258], extract_slide)
+
+    assert len(slides) == 3
+    assert calls == []
+    assert slides[-1]["slide_id"] == 258
+    assert slides.by_slide_id(258) is slides[2]
+    assert calls == [2]
+    assert slides.extracted_count() == 1
+    assert [slide["slide_id"] for slide in slides[:2]] == [256, 257]
+    assert calls == [2, 0, 1]
+    with pytest.raises(IndexError):
+        slides[3]
+    with pytest.raises(KeyError):
+        slides.by_slide_id(1)
+
+
+@pytest.mark.parametrize("engine", ["pptx", "xml"])
+def test_run_extractors_lazy_matches_eager(sample_pptx_path, engine):
+    eager = run_extractors(sample_pptx_path, "pt", engine=engine)
+    lazy = run_extractors(sample_pptx_path, "pt", engine=engine, lazy=True)
+
+    slides = lazy["slides"]
+    assert lazy["slide_width"] == eager["slide_width"]
+    assert len(slides) == len(eager["slides"])
+    assert slides[1] == eager["slides"][1]
+    assert slides.extracted_count() == 1
+    assert list(slides) == eager["slides"]
+    slides.close()
+
+
+def test_lazy_xml_slides_close_the_deck(sample_pptx_path, monkeypatch):
+    closed = []
+    close = PptxPackage.close
+
+    def record_close(package):
+        closed.append(package)
+        close(package)
+
+    monkeypatch.setattr(PptxPackage, "close", record_close)
+
+    with run_extractors(sample_pptx_path, "pt", engine="xml", lazy=True)[
+        "slides"
+    ] as slides:
+        first = slides[0]
+        assert closed == []
+
+    assert len(closed) == 1
+    assert slides[0] is first
+    with pytest.raises(ValueError):
+        slides[1]
+    slides.close()
+    assert len(closed) == 1
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from pptlayout.metrics import (
+    METRIC_NAMES,
+    alignment_score,
+    out_of_bounds_area,
+    overlap_area,
+    pad_boxes,
+    score_layout,
+    score_slides,
+    shape_boxes,
+    spacing_uniformity,
+    whitespace_balance,
+)
+
+
+def _shape(left, top, width, height, shape_id=1):
+    return {
+        "shape_id": shape_id,
+        "shape_type": "AUTO_SHAPE",
+        "left": left,
+        "top": top,
+        "width": width,
+        "height": height,
+    }
+
+
+def _slide(*boxes):
+    return {"slide_id": 1, "shapes": [_shape(*box) for box in boxes]}
+
+
+def test_overlap_area():
+    boxes = np.array([[0, 0, 4, 4], [2, 2, 4, 4], [3, 0, 1, 1], [10, 10, 1, 1]])
+    # 2x2 between the first two, 1x1 between the first and third
+    assert overlap_area(boxes) == 5
+    assert overlap_area(boxes[:1]) == 0
+
+
+def test_out_of_bounds_area():
+    boxes = np.array([[-1, 0, 2, 2], [9, 9, 2, 2], [1, 1, 2, 2]])
+    assert out_of_bounds_area(boxes, 10, 10) == 2 + 3
+
+
+def test_alignment_score():
+    # Left edges of the first two and right edges of the last two match
+    boxes = np.array([[0, 0, 4, 1], [0, 2, 2, 1], [5, 4, 4, 1], [3, 6, 6, 1]])
+    assert alignment_score(boxes, 0.1) == pytest.approx(4 / 12)
+    assert alignment_score(boxes[:1], 0.1) == 1
+
+
+def test_spacing_uniformity():
+    even = np.array([[0, 0, 1, 1], [0, 2, 1, 1], [0, 4, 1, 1]])
+    uneven = np.array([[0, 0, 1, 1], [0, 2, 1, 1], [0, 8, 1, 1]])
+    assert spacing_uniformity(even) == 1
+    assert spacing_uniformity(uneven) == pytest.approx(1 / (1 + 2 / 3))
+    # The order of the shapes does not matter
+    assert spacing_uniformity(uneven[::-1]) == spacing_uniformity(uneven)
+
+
+def test_whitespace_balance():
+    assert whitespace_balance(np.array([[4, 4, 2, 2]]), 10, 10) == 1
+    assert whitespace_balance(np.array([[0, 0, 0.001, 0.001]]), 10, 10) < 0.01
+    assert whitespace_balance(np.zeros((0, 4)), 10, 10) == 1
+
+
+def test_padded_batch_matches_single_slides():
+    rng = np.random.default_rng(0)
+    boxes_list = [rng.uniform(0, 10, (n, 4)) for n in (0, 1, 3, 7)]
+    boxes, mask = pad_boxes(boxes_list)
+    batched = overlap_area(boxes, mask)
+    alignment = alignment_score(boxes, 0.5, mask)
+    spacing = spacing_uniformity(boxes, mask)
+    for index, single in enumerate(boxes_list):
+        assert batched[index] == pytest.approx(overlap_area(single))
+        assert alignment[index] == pytest.approx(alignment_score(single, 0.5))
+        assert spacing[index] == pytest.approx(spacing_uniformity(single))
+
+
+def test_score_slides_matches_score_layout():
+    slides = [
+        _slide((0, 0, 50, 50), (25, 25, 50, 50)),
+        _slide(),
+        _slide((10, 10, 20, 10), (10, 30, 20, 10), (10, 50, 30, 10), (90, 90, 20, 20)),
+    ]
+    scores = score_slides(slides, 100, 100, chunk_size=2)
+    assert set(scores) == set(METRIC_NAMES)
+    for index, slide in enumerate(slides):
+        for name, value in score_layout(slide, 100, 100).items():
+            assert scores[name][index] == pytest.approx(value)
+    assert scores["overlap"][0] == pytest.approx(625 / 10_000)
+    assert scores["out_of_bounds"][2] == pytest.approx(300 / 10_000)
+
+
+def test_score_slides_per_slide_size():
+    slides = [_slide((0, 0, 10, 10)), _slide((0, 0, 10, 10))]
+    scores = score_slides(slides, [10, 20], [10, 20])
+    assert scores["out_of_bounds"].tolist() == [0, 0]
+    assert scores["balance"][0] == 1 and scores["balance"][1] < 1
+
+
+def test_shape_boxes_reads_records():
+    from pptlayout.extractors.records import shape_record
+
+    shape = {**_shape(1, 2, 3, 4), "name": ""}
+    assert shape_boxes([shape_record(shape)]).tolist() == [[1, 2, 3, 4]]
+
+
+def test_group_shapes_are_not_scored(sample_pptx_path):
+    from pptlayout.extractors.run_extractors import run_extractors
+
+    ppt_data = run_extractors(sample_pptx_path, "emu", engine="xml")
+    slide = ppt_data["slides"][2]
+    assert "GROUP" in [shape["shape_type"] for shape in slide["shapes"]]
+    size = ppt_data["slide_width"], ppt_data["slide_height"]
+
+    scores = score_layout(slide, *size)
+    assert scores["overlap"] == 0
+    members = [shape for shape in slide["shapes"] if shape["shape_type"] != "GROUP"]
+    assert scores == score_layout({**slide, "shapes": members}, *size)
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from pptlayout.extractors.run_extractors import run_extractors
+from pptlayout.llm.parser import extract_compact_layout
+from pptlayout.llm.prompts import (
+    build_slide_layout_suggestion_prompts,
+    encode_layout_compact,
+)
+
+
+@pytest.fixture
+def slide_layout(sample_pptx_path):
+    return run_extractors(sample_pptx_path, "pt", engine="xml")["slides"][1]
+
+
+def test_json_string_input_is_not_encoded_twice(slide_layout):
+    json_input = json.dumps(slide_layout, indent=4)
+    prompt = build_slide_layout_suggestion_prompts(json_input, 720, 540)
+
+    assert json_input in prompt
+    assert prompt == build_slide_layout_suggestion_prompts(slide_layout, 720, 540)
+
+
+def test_compact_layout_round_trip(slide_layout):
+    table = encode_layout_compact(slide_layout)
+    lines = table.splitlines()
+
+    assert lines[0] == "id,type,left,top,width,height,text"
+    assert lines[1] == "2,PLACEHOLDER:TITLE,72,0,648,90,Shapes"
+    assert len(lines) == len(slide_layout["shapes"]) + 1
+
+    reply = (
+        "Here is the improved layout:\n```csv\n"
+        + table.replace(":TITLE,72,0,", ":TITLE,36,18.5,")
+        + "```\nDone."
+    )
+    shapes = extract_compact_layout(reply, slide_layout)
+    assert shapes[0] == {**slide_layout["shapes"][0], "left": 36, "top": 18.5}
+    assert shapes[1:] == [
+        {
+            **shape,
+            **{key: round(shape[key], 1) for key in ("left", "top", "width", "height")},
+        }
+        for shape in slide_layout["shapes"][1:]
+    ]
+    assert extract_compact_layout(table)[0] == {
+        "shape_id": 2,
+        "shape_type": "PLACEHOLDER",
+        "placeholder_type": "TITLE",
+        "left": 72,
+        "top": 0,
+        "width": 648,
+        "height": 90,
+    }
+    with pytest.raises(ValueError):
+        extract_compact_layout("no table here")
+
+
+def test_compact_prompt_is_shorter(slide_layout):
+    json_prompt = build_slide_layout_suggestion_prompts(slide_layout, 720, 540)
+    compact_prompt = build_slide_layout_suggestion_prompts(
+        json.dumps(slide_layout), 720, 540, compact=True
+    )
+
+    assert "lengths are in pt" in compact_prompt
+    assert encode_layout_compact(slide_layout) in compact_prompt
+    assert len(compact_prompt) < len(json_prompt) / 2
+
+
+@pytest.mark.parametrize("measurement_unit", ["pt", "cm"])
+def test_compact_prompt_states_record_unit(sample_pptx_path, measurement_unit):
+    ppt_record = run_extractors(sample_pptx_path, measurement_unit, records=True)
+    slide = ppt_record.slides[1]
+    prompt = build_slide_layout_suggestion_prompts(
+        slide, ppt_record.slide_width, ppt_record.slide_height, compact=True
+    )
+
+    assert f"lengths are in {measurement_unit}" in prompt
+    assert encode_layout_compact(slide.to_dict()) in prompt
+
+
+def test_compact_replies_move_connector_endpoints(slide_layout):
+    connector = next(s for s in slide_layout["shapes"] if s["shape_type"] == "LINE")
+    # The sample connector runs right to left and top to bottom
+    assert connector["begin_x"] > connector["end_x"]
+    table = encode_layout_compact({"shapes": [connector]})
+    row = table.splitlines()[1].split(",")
+    row[2:4] = ["100", "50"]
+    reply = "```csv\n" + table.splitlines()[0] + "\n" + ",".join(row) + "\n```"
+
+    (shape,) = extract_compact_layout(reply, slide_layout)
+    assert (shape["left"], shape["top"]) == (100, 50)
+    assert (shape["begin_x"], shape["begin_y"]) == (100 + shape["width"], 50)
+    assert (shape["end_x"], shape["end_y"]) == (100, 50 + shape["height"])
+
+
+def test_compact_prompt_for_vision_models(slide_layout):
+    prompt = build_slide_layout_suggestion_prompts(
+        slide_layout, 720, 540, image_flag=True, compact=True
+    )
+    assert prompt.startswith("Given an image of a slide")
+    assert encode_layout_compact(slide_layout) in prompt
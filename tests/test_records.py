@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from pptlayout.extractors.cache import ExtractionCache
+from pptlayout.extractors.records import (
+    ConnectorRecord,
+    PlaceholderRecord,
+    ShapeRecord,
+    shape_record,
+)
+from pptlayout.extractors.run_extractors import run_extractors
+
+
+@pytest.mark.parametrize("engine", ["pptx", "xml"])
+def test_records_round_trip_to_dicts(sample_pptx_path, engine):
+    ppt_data = run_extractors(sample_pptx_path, "pt", engine=engine)
+    record = run_extractors(sample_pptx_path, "pt", engine=engine, records=True)
+
+    assert record.to_dict() == ppt_data
+    assert json.loads(record.to_json()) == json.loads(json.dumps(ppt_data))
+    # Key order is kept, so prompts built from either form are identical
+    assert record.to_json() == json.dumps(ppt_data)
+
+    shapes = record.slides[1].shapes
+    assert isinstance(shapes[0], PlaceholderRecord)
+    assert isinstance(shapes[-1], ConnectorRecord)
+    assert shapes[-1]["begin_x"] == ppt_data["slides"][1]["shapes"][-1]["begin_x"]
+    assert shapes[2].get("placeholder_type") is None
+    with pytest.raises(KeyError):
+        shapes[2]["placeholder_type"]
+
+
+def test_records_lazy_and_cached(tmp_path, sample_pptx_path):
+    ppt_data = run_extractors(sample_pptx_path, "cm")
+    lazy = run_extractors(sample_pptx_path, "cm", engine="xml", lazy=True, records=True)
+    assert lazy.slides[2].to_dict() == ppt_data["slides"][2]
+    lazy.slides.close()
+
+    with ExtractionCache(str(tmp_path / "cache.sqlite")) as cache:
+        run_extractors(sample_pptx_path, cache=cache)
+        cached = run_extractors(sample_pptx_path, "cm", cache=cache, records=True)
+    assert cached.to_dict() == ppt_data
+
+
+def test_records_use_slots():
+    record = shape_record(
+        {
+            "name": "Oval 1",
+            "shape_id": 2,
+            "shape_type": "AUTO_SHAPE",
+            "measurement_unit": "emu",
+            "height": 1,
+            "width": 2,
+            "left": 3,
+            "top": 4,
+            "text": "",
+        }
+    )
+    assert type(record) is ShapeRecord
+    assert not hasattr(record, "__dict__")
+    assert record.to_dict("emu")["text"] == ""
@@ -0,0 +1,76 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from pptlayout.visualizers.renderer import render_slide, render_slides
+
+SLIDE = {
+    "slide_id": 256,
+    "shapes": [
+        {
+            "shape_type": "PLACEHOLDER",
+            "left": 40,
+            "top": 30,
+            "width": 640,
+            "height": 80,
+        },
+        {"shape_type": "PICTURE", "left": 60, "top": 150, "width": 300, "height": 300},
+    ],
+}
+
+
+def test_render_slide_to_png():
+    image = render_slide(SLIDE, 720, 540, width_px=480)
+    assert image.startswith(b"\x89PNG")
+    assert Image.open(io.BytesIO(image)).size == (480, 360)
+
+    gridded = render_slide(SLIDE, 720, 540, width_px=480, grid=10)
+    assert Image.open(io.BytesIO(gridded)).size == (480, 360)
+    assert gridded != image
+
+
+def test_render_slide_does_not_use_pyplot():
+    import matplotlib.pyplot as plt
+
+    render_slide(SLIDE, 720, 540, width_px=200, labels=False)
+    assert plt.get_fignums() == []
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_render_slides_writes_files_in_order(tmp_path, workers):
+    slides = ({**SLIDE, "slide_id": slide_id} for slide_id in range(7))
+    paths = render_slides(
+        slides, 720, 540, str(tmp_path), workers=workers, chunk_size=2, width_px=120
+    )
+    assert paths == [str(tmp_path / f"{i}_slide_{i}.png") for i in range(7)]
+    assert all(os.path.getsize(path) > 0 for path in paths)
+
+
+def test_render_slides_names_and_sizes(tmp_path):
+    paths = render_slides(
+        [SLIDE, SLIDE],
+        [720, 960],
+        [540, 540],
+        str(tmp_path),
+        names=["a", "b"],
+        workers=1,
+        width_px=120,
+        format="jpg",
+    )
+    assert [os.path.basename(path) for path in paths] == ["a.jpg", "b.jpg"]
+    assert Image.open(paths[1]).size == (120, 68)
+
+
+def test_render_slides_never_overwrites(tmp_path):
+    # Slide ids start at 256 in every deck
+    paths = render_slides([SLIDE, SLIDE], 720, 540, str(tmp_path), workers=1)
+    assert [os.path.basename(path) for path in paths] == [
+        "0_slide_256.png",
+        "1_slide_256.png",
+    ]
+    with pytest.raises(ValueError):
+        render_slides(
+            [SLIDE, SLIDE], 720, 540, str(tmp_path), names=["a", "a"], workers=1
+        )
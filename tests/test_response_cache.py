@@ -0,0 +1,92 @@
+import pytest
+
+ollama = pytest.importorskip("ollama")
+
+from pptlayout.llm import llm  # noqa: E402
+from pptlayout.llm.response_cache import (  # noqa: E402
+    ResponseCache,
+    response_key,
+    set_default_response_cache,
+)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def generate(**kwargs):
+        calls.append(kwargs)
+        return f"response {len(calls)}"
+
+    monkeypatch.setattr(llm, "generate_no_image", generate)
+    monkeypatch.setattr(llm, "generate_with_image", generate)
+    return calls
+
+
+def test_deterministic_requests_are_cached(tmp_path, calls):
+    with ResponseCache(str(tmp_path / "responses.sqlite")) as cache:
+        first = llm.call_llm(prompt="layout", temperature=0, cache=cache)
+        assert llm.call_llm(prompt="layout", temperature=0, cache=cache) == first
+        assert (
+            llm.call_llm(prompt="layout", temperature=0, json=True, cache=cache)
+            != first
+        )
+        assert len(calls) == 2
+
+        # Sampled requests are only cached with a pinned seed
+        llm.call_llm(prompt="layout", temperature=0.7, cache=cache)
+        llm.call_llm(prompt="layout", temperature=0.7, cache=cache)
+        assert len(calls) == 4
+        seeded = llm.call_llm(prompt="layout", temperature=0.7, seed=1, cache=cache)
+        assert (
+            llm.call_llm(prompt="layout", temperature=0.7, seed=1, cache=cache)
+            == seeded
+        )
+        assert calls[-1]["seed"] == 1
+        assert len(calls) == 5
+
+        llm.call_llm(prompt="layout", temperature=0, cache=cache, bypass_cache=True)
+        assert len(calls) == 6
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (2, 3, 3)
+        assert stats.hit_rate == 0.4
+
+
+def test_default_cache_and_image_hashing(tmp_path, calls):
+    image = tmp_path / "slide.png"
+    copy = tmp_path / "copy.png"
+    image.write_bytes(b"png")
+    copy.write_bytes(b"png")
+
+    assert response_key("m", "p", [str(image)], 0, 10, False) == response_key(
+        "m", "p", [str(copy)], 0, 10, False
+    )
+    with ResponseCache(str(tmp_path / "responses.sqlite")) as cache:
+        set_default_response_cache(cache)
+        try:
+            llm.call_llm(prompt="layout", temperature=0, images=[str(image)])
+            llm.call_llm(prompt="layout", temperature=0, images=[str(copy)])
+            copy.write_bytes(b"edited")
+            llm.call_llm(prompt="layout", temperature=0, images=[str(copy)])
+        finally:
+            set_default_response_cache(None)
+    assert len(calls) == 2
+
+
+def test_streamed_responses_are_cached_once_complete(tmp_path, monkeypatch):
+    parts = ["{", '"a"', ": 1}"]
+    monkeypatch.setattr(
+        ollama, "generate", lambda **kwargs: iter({"response": p} for p in parts)
+    )
+
+    with ResponseCache(str(tmp_path / "responses.sqlite")) as cache:
+        stream = llm.call_llm(prompt="p", temperature=0, cache=cache, stream=True)
+        next(stream)
+        stream.close()
+        assert cache.stats().entries == 0
+
+        stream = llm.call_llm(prompt="p", temperature=0, cache=cache, stream=True)
+        assert list(stream) == parts
+        cached = llm.call_llm(prompt="p", temperature=0, cache=cache, stream=True)
+        assert list(cached) == ['{"a": 1}']
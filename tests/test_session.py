@@ -0,0 +1,140 @@
+import pytest
+
+from pptlayout.llm import backends
+from pptlayout.llm import session as session_module
+from pptlayout.llm.session import ModelRegistry, select_device
+
+
+@pytest.fixture
+def configure_qwen2_vl():
+    def configure(model_dir):
+        backends.configure_backends(
+            {"backends": {"qwen2-vl": {"type": "hf", "model_dir": model_dir}}}
+        )
+
+    yield configure
+    backends.configure_backends(None)
+
+
+class FakeLoader:
+    def __init__(self):
+        self.loads = []
+
+    def __call__(self, model_dir, dtype, device):
+        self.loads.append((model_dir, dtype, device))
+        return object(), object()
+
+
+def test_registry_loads_each_model_once(tmp_path):
+    loader = FakeLoader()
+    registry = ModelRegistry(loader, max_sessions=2)
+    model_dir = str(tmp_path / "model")
+
+    first = registry.get(model_dir, device="cpu")
+    assert registry.get(model_dir + "/.") is first
+    assert len(loader.loads) == 1
+
+    registry.get(model_dir, dtype="bfloat16", device="cpu")
+    registry.get(str(tmp_path / "other"), device="cpu")
+    assert len(loader.loads) == 3
+    # The least recently used session was evicted
+    assert (model_dir, "auto") not in registry
+    assert (model_dir, "bfloat16") in registry
+    assert first.model is None
+
+    assert registry.unload(model_dir, dtype="bfloat16")
+    assert not registry.unload(model_dir, dtype="bfloat16")
+    registry.clear()
+    assert len(registry) == 0
+
+
+def test_select_device_falls_back_to_cpu(monkeypatch):
+    monkeypatch.setattr(session_module, "cuda_available", lambda: False)
+    assert select_device() == "cpu"
+    assert select_device("cuda:1") == "cpu"
+    assert select_device("mps") == "mps"
+
+    monkeypatch.setattr(session_module, "cuda_available", lambda: True)
+    assert select_device() == "cuda"
+    assert select_device("cuda:1") == "cuda:1"
+
+
+def test_call_llm_reuses_the_loaded_model(
+    tiny_qwen2_vl_dir, configure_qwen2_vl, monkeypatch
+):
+    from pptlayout.llm import llm
+
+    loads = []
+
+    def loader(model_dir, dtype, device):
+        loads.append(model_dir)
+        return session_module.load_qwen2_vl(model_dir, dtype, device)
+
+    registry = ModelRegistry(loader)
+    monkeypatch.setattr(backends, "get_registry", lambda: registry)
+    configure_qwen2_vl(tiny_qwen2_vl_dir)
+    monkeypatch.setattr(session_module, "cuda_available", lambda: False)
+
+    for _ in range(2):
+        response = llm.call_llm(
+            model_name="Qwen2-VL-7B-Instruct", prompt="layout", max_tokens=2
+        )
+        assert isinstance(response, str)
+    assert loads == [tiny_qwen2_vl_dir]
+    assert registry.get(tiny_qwen2_vl_dir).device == "cpu"
+
+
+def test_call_llm_batch_buckets_requests(
+    tiny_qwen2_vl_dir, configure_qwen2_vl, monkeypatch
+):
+    from pptlayout.llm import llm
+
+    registry = ModelRegistry(session_module.load_qwen2_vl)
+    monkeypatch.setattr(backends, "get_registry", lambda: registry)
+    configure_qwen2_vl(tiny_qwen2_vl_dir)
+    monkeypatch.setattr(session_module, "cuda_available", lambda: False)
+    session = registry.get(tiny_qwen2_vl_dir)
+    batches = []
+    generate_batch = session.generate_batch
+
+    def record_batch(messages_list, **kwargs):
+        batches.append(
+            [messages[0]["content"][-1]["text"] for messages in messages_list]
+        )
+        return [f"reply to {text}" for text in batches[-1]]
+
+    monkeypatch.setattr(session, "generate_batch", record_batch)
+    prompts = ["layout " * n for n in (5, 1, 4, 2, 3)]
+
+    responses = llm.call_llm_batch(
+        [(prompt, None) for prompt in prompts],
+        model_name="Qwen2-VL-7B-Instruct",
+        batch_size=2,
+    )
+
+    assert responses == [f"reply to {prompt}" for prompt in prompts]
+    assert batches == [
+        [prompts[1], prompts[3]],
+        [prompts[4], prompts[2]],
+        [prompts[0]],
+    ]
+    assert len(
+        generate_batch(
+            [llm.generate_qwen2_vl_message(prompt=prompt) for prompt in prompts],
+            max_tokens=2,
+        )
+    ) == len(prompts)
+
+
+def test_generate_stream_matches_generate(tiny_qwen2_vl_dir, monkeypatch):
+    monkeypatch.setattr(session_module, "cuda_available", lambda: False)
+    session = ModelRegistry(session_module.load_qwen2_vl).get(tiny_qwen2_vl_dir)
+    messages = [{"role": "user", "content": [{"type": "text", "text": "slide"}]}]
+
+    streamed = session.generate_stream(messages, max_tokens=8, seed=0)
+    assert "".join(streamed) == session.generate(messages, max_tokens=8, seed=0)
+
+    # Closing early stops the generation thread
+    streamed = session.generate_stream(messages, max_tokens=10_000)
+    next(streamed, None)
+    streamed.close()
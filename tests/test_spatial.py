@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+
+from pptlayout.metrics import (
+    alignment_score,
+    overlap_area,
+    score_slides,
+    validate_layout,
+)
+from pptlayout.spatial import GridIndex
+from pptlayout.visualizers.renderer import place_labels
+
+
+@pytest.fixture
+def boxes():
+    rng = np.random.default_rng(0)
+    return np.concatenate(
+        [
+            np.c_[rng.uniform(0, 700, (400, 2)), rng.uniform(0, 60, (400, 2))],
+            [[0, 0, 720, 540]],  # a background covering the slide
+        ]
+    )
+
+
+def _corners(boxes):
+    return (
+        boxes[:, 0],
+        boxes[:, 1],
+        boxes[:, 0] + boxes[:, 2],
+        boxes[:, 1] + boxes[:, 3],
+    )
+
+
+def test_intersection_and_containment_queries(boxes):
+    index = GridIndex(boxes)
+    x0, y0, x1, y1 = _corners(boxes)
+    query = (100, 200, 150, 80)
+    qx1, qy1 = 250, 280
+
+    expected = np.flatnonzero((x0 <= qx1) & (x1 >= 100) & (y0 <= qy1) & (y1 >= 200))
+    assert index.intersecting(query).tolist() == expected.tolist()
+
+    expected = np.flatnonzero((x0 >= 100) & (x1 <= qx1) & (y0 >= 200) & (y1 <= qy1))
+    assert index.within(query).tolist() == expected.tolist()
+
+    point = (boxes[7, 0] + 1e-3, boxes[7, 1] + 1e-3, 0, 0)
+    containing = index.containing(point).tolist()
+    assert 7 in containing and len(boxes) - 1 in containing
+
+
+def test_nearest_matches_brute_force(boxes):
+    index = GridIndex(boxes[:-1])
+    for query in [(10, 10, 0, 0), (350, 260, 5, 5), (5000, -300, 0, 0)]:
+        distances = index.distances(query)
+        expected = np.lexsort((np.arange(len(distances)), distances))[:5]
+        assert index.nearest(query, k=5).tolist() == expected.tolist()
+
+    nearest = index.nearest(tuple(boxes[3]), k=2, exclude=[3])
+    assert 3 not in nearest and len(nearest) == 2
+    assert len(index.nearest((0, 0, 0, 0), k=10_000)) == len(index)
+
+
+def test_overlapping_pairs_match_brute_force(boxes):
+    index = GridIndex(boxes)
+    x0, y0, x1, y1 = _corners(boxes)
+    overlap = (np.minimum(x1[:, None], x1) > np.maximum(x0[:, None], x0)) & (
+        np.minimum(y1[:, None], y1) > np.maximum(y0[:, None], y0)
+    )
+    expected = np.argwhere(np.triu(overlap, 1))
+    assert index.overlapping_pairs().tolist() == expected.tolist()
+    assert index.overlap_area() == pytest.approx(_dense_overlap(boxes))
+
+
+def _dense_overlap(boxes):
+    x0, y0, x1, y1 = _corners(boxes)
+    widths = np.clip(np.minimum(x1[:, None], x1) - np.maximum(x0[:, None], x0), 0, None)
+    heights = np.clip(
+        np.minimum(y1[:, None], y1) - np.maximum(y0[:, None], y0), 0, None
+    )
+    return np.triu(widths * heights, 1).sum()
+
+
+def test_empty_index():
+    index = GridIndex(np.zeros((0, 4)))
+    assert index.intersecting((0, 0, 1, 1)).tolist() == []
+    assert index.nearest((0, 0, 0, 0)).tolist() == []
+    assert index.overlapping_pairs().shape == (0, 2)
+
+
+def test_metrics_use_the_index_on_dense_slides(boxes):
+    assert overlap_area(boxes) == pytest.approx(_dense_overlap(boxes))
+    slides = [
+        {
+            "shapes": [
+                dict(zip(("left", "top", "width", "height"), box)) for box in boxes
+            ]
+        },
+        {"shapes": [{"left": 0, "top": 0, "width": 10, "height": 10}] * 2},
+    ]
+    scores = score_slides(slides, 720, 540)
+    assert scores["overlap"][0] == pytest.approx(_dense_overlap(boxes) / (720 * 540))
+    assert scores["overlap"][1] == pytest.approx(100 / (720 * 540))
+
+
+def test_alignment_matches_pairwise_definition(boxes):
+    x0, _, x1, _ = _corners(boxes)
+    edges = np.stack([x0, (x0 + x1) / 2, x1], axis=-1)
+    distances = np.abs(edges[:, None] - edges[None])
+    distances[np.arange(len(boxes)), np.arange(len(boxes))] = np.inf
+    expected = (distances <= 2).any(axis=1).mean()
+    assert alignment_score(boxes, 2) == pytest.approx(expected)
+
+
+def test_zero_size_boxes_in_emu_keep_the_grid_small():
+    rng = np.random.default_rng(1)
+    boxes = np.zeros((201, 4))
+    boxes[:200, :2] = rng.uniform(0, 9144000, (200, 2))
+    boxes[200] = [0, 0, 9144000, 6858000]
+    index = GridIndex(boxes)
+    assert index._shape[0] * index._shape[1] <= 4 * len(boxes)
+    assert len(index.containing((100, 100, 0, 0))) >= 1
+    assert overlap_area(boxes) == 0
+
+
+def test_validate_layout_reports_new_problems():
+    def slide(*boxes):
+        return {
+            "shapes": [
+                {"shape_id": shape_id, "shape_type": "AUTO_SHAPE"}
+                | dict(zip(("left", "top", "width", "height"), box))
+                for shape_id, box in enumerate(boxes, 1)
+            ]
+        }
+
+    original = slide((0, 0, 10, 10), (5, 5, 10, 10), (50, 50, 10, 10))
+    revised = slide((0, 0, 10, 10), (5, 5, 10, 10), (8, 0, 10, 10), (95, 0, 10, 10))
+    assert validate_layout(revised, 100, 100) == {
+        "overlaps": [[1, 2], [1, 3], [2, 3]],
+        "out_of_bounds": [4],
+    }
+    assert validate_layout(revised, 100, 100, original)["overlaps"] == [
+        [1, 3],
+        [2, 3],
+    ]
+
+
+def test_place_labels_skips_overlapping_labels():
+    labels = np.array([[0, 0, 10, 2], [5, 1, 10, 2], [20, 0, 10, 2], [12, 0, 6, 2]])
+    assert place_labels(labels).tolist() == [0, 2, 3]
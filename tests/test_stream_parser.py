@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from pptlayout.llm.parser import IncrementalShapeParser, stream_shapes
+
+SHAPES = [
+    {"shape_id": 2, "name": "Title {1}", "left": 10, "text": 'a "quoted" ``` }'},
+    {"shape_id": 3, "name": "Group", "shapes": [{"shape_id": 4}], "top": 5},
+]
+
+REPLY = (
+    "Sure! Here is the layout:\n```json\n"
+    + json.dumps({"slide_id": 256, "shapes": SHAPES}, indent=2).replace(
+        '"left": 10,', '"left": 10, // moved left'
+    )
+    + "\n```\nThe title was moved to align with the body."
+)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 17, len(REPLY)])
+def test_shapes_are_emitted_as_they_close(chunk_size):
+    parser = IncrementalShapeParser()
+    emitted = []
+    for start in range(0, len(REPLY), chunk_size):
+        chunk = REPLY[start : start + chunk_size]
+        for shape in parser.feed(chunk):
+            emitted.append((shape, start + chunk_size))
+        if parser.done:
+            break
+
+    assert [shape for shape, _ in emitted] == SHAPES
+    # The first shape is available long before the reply ends
+    assert emitted[0][1] < REPLY.index('"shape_id": 3') + chunk_size
+    assert parser.done
+    assert parser.errors == 0
+
+
+def test_reply_without_fence_and_invalid_shape():
+    parser = IncrementalShapeParser()
+    shapes = parser.feed(
+        '{"shapes": [{"shape_id": 1}, {"shape_id": }, {"shape_id": 3}]}'
+    )
+
+    assert shapes == [{"shape_id": 1}, {"shape_id": 3}]
+    assert parser.errors == 1
+    assert parser.done
+
+
+def test_stream_shapes_stops_reading_at_the_closing_fence():
+    consumed = []
+    closed = []
+
+    def chunks():
+        try:
+            for start in range(0, len(REPLY), 8):
+                consumed.append(start)
+                yield REPLY[start : start + 8]
+        finally:
+            closed.append(True)
+
+    assert list(stream_shapes(chunks())) == SHAPES
+    assert closed == [True]
+    assert consumed[-1] < REPLY.index("The title")
+
+
+@pytest.mark.parametrize(
+    "prose",
+    [
+        "I kept the {title} in place.\n",
+        'Nothing {"to": "see"} here, and an unclosed { brace.\n',
+        'A stray {"quote\nbefore the layout.\n',
+    ],
+)
+def test_braces_in_prose_before_the_fence(prose):
+    reply = prose + REPLY
+    chunks = (reply[start : start + 5] for start in range(0, len(reply), 5))
+    assert list(stream_shapes(chunks)) == SHAPES
@@ -0,0 +1,32 @@
+import pytest
+
+from pptlayout.extractors.run_extractors import run_extractors
+from pptlayout.utils import convert_ppt, convert_shapes, unit_conversion
+
+
+def test_convert_shapes_matches_unit_conversion():
+    shapes = [
+        {"height": 914400, "width": 12701, "left": 0, "top": -360001},
+        {"begin_x": 1, "begin_y": 2, "end_x": 3, "end_y": 4},
+    ]
+    expected = [
+        {key: unit_conversion(value, "pt") for key, value in shape.items()}
+        for shape in shapes
+    ]
+
+    converted = convert_shapes(shapes, "pt")
+
+    for shape, values in zip(converted, expected):
+        assert shape.pop("measurement_unit") == "pt"
+        assert shape == values
+    with pytest.raises(ValueError):
+        convert_shapes([{"height": None}], "pt")
+    with pytest.raises(ValueError):
+        convert_shapes([], "furlong")
+
+
+@pytest.mark.parametrize("unit", ["pt", "cm", "inches"])
+def test_convert_ppt_matches_direct_extraction(sample_pptx_path, unit):
+    emu = run_extractors(sample_pptx_path, "emu", engine="xml")
+    assert convert_ppt(emu, unit) == run_extractors(sample_pptx_path, unit)
+    assert emu == run_extractors(sample_pptx_path, "emu")
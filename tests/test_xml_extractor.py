@@ -0,0 +1,54 @@
+import pytest
+from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE, PP_PLACEHOLDER_TYPE
+
+from pptlayout.extractors.run_extractors import run_extractors
+from pptlayout.extractors.xml_extractor import (
+    AUTO_SHAPE_TYPE_NAMES,
+    PLACEHOLDER_TYPE_NAMES,
+)
+
+
+@pytest.mark.parametrize("measurement_unit", ["emu", "pt", "cm", "inches"])
+def test_xml_engine_matches_pptx_engine(sample_pptx_path, measurement_unit):
+    """The XML engine must be a drop-in replacement for the python-pptx engine."""
+    expected = run_extractors(sample_pptx_path, measurement_unit, engine="pptx")
+    actual = run_extractors(sample_pptx_path, measurement_unit, engine="xml")
+    assert actual == expected
+
+
+def test_xml_engine_covers_shape_types(sample_pptx_path):
+    """Check that the sample deck exercises the type-specific branches."""
+    info = run_extractors(sample_pptx_path, engine="xml")
+    shape_types = {
+        shape["shape_type"] for slide in info["slides"] for shape in slide["shapes"]
+    }
+    assert {
+        "PLACEHOLDER",
+        "TEXT_BOX",
+        "AUTO_SHAPE",
+        "FREEFORM",
+        "LINE",
+        "PICTURE",
+        "TABLE",
+        "CHART",
+        "GROUP",
+    } <= shape_types
+    assert info["slides"][0]["shapes"][0]["text"] == "Layout\vbenchmark"
+    assert info["slides"][2]["slide_name"] == "Media"
+    # A table or chart inserted into a placeholder is typed by its content
+    table, chart = info["slides"][3]["shapes"][1:]
+    assert (table["shape_type"], table["has_table"]) == ("TABLE", True)
+    assert (chart["shape_type"], chart["has_chart"]) == ("CHART", True)
+    assert "placeholder_type" not in table
+
+
+def test_type_name_tables_match_pptx_enums():
+    for xml_value, name in PLACEHOLDER_TYPE_NAMES.items():
+        assert PP_PLACEHOLDER_TYPE.from_xml(xml_value).name == name
+    for xml_value, name in AUTO_SHAPE_TYPE_NAMES.items():
+        assert MSO_AUTO_SHAPE_TYPE.from_xml(xml_value).name == name
+
+
+def test_run_extractors_rejects_unknown_engine(sample_pptx_path):
+    with pytest.raises(ValueError):
+        run_extractors(sample_pptx_path, engine="unknown")